@@ -0,0 +1 @@
+"""Headless benchmarks for native_ui. Run a suite with `python -m benchmarks.<name>`."""
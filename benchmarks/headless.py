@@ -0,0 +1,166 @@
+"""Headless stand-in for the pywin32 modules used by `native_ui.kit.win`.
+
+`install()` registers fake `win32gui`, `win32api`, `win32con` and `win32.lib.win32con`
+modules and patches `ctypes.windll` so the toolkit can be imported and laid out without
+a display. Every native call is counted in `calls` so benchmarks can report how many
+native calls an operation made.
+
+Text is measured with fixed metrics, `CHAR_WIDTH` pixels per character and
+`LINE_HEIGHT` pixels per line.
+"""
+from __future__ import annotations
+
+import ctypes
+import sys
+from collections import Counter
+from itertools import count
+from types import ModuleType
+from typing import Callable
+
+calls: Counter[str] = Counter()
+"""Number of calls per native function name."""
+
+CHAR_WIDTH = 7
+LINE_HEIGHT = 16
+CW_USEDEFAULT = -2147483648
+
+_bits = count(12)
+_handles = count(0x1000)
+_windows: dict[int, tuple[int, int, int, int]] = {}
+
+
+class _Constants(ModuleType):
+    """Every constant is a unique single bit so flags combine and test like the real
+    ones.
+    """
+
+    def __getattr__(self, name: str) -> int:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = 1 << next(_bits)
+        setattr(self, name, value)
+        return value
+
+
+class _Native(ModuleType):
+    """Any function not defined explicitly is a counted no-op returning 0."""
+
+    def __getattr__(self, name: str) -> Callable:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return self.define(name, lambda *_: 0)
+
+    def define(self, name: str, func: Callable) -> Callable:
+        def native(*args):
+            calls[name] += 1
+            return func(*args)
+
+        native.__name__ = name
+        setattr(self, name, native)
+        return native
+
+
+win32con = _Constants("win32con")
+win32con.CW_USEDEFAULT = CW_USEDEFAULT
+win32gui = _Native("win32gui")
+win32api = _Native("win32api")
+user32 = _Native("user32")
+gdi32 = _Native("gdi32")
+kernel32 = _Native("kernel32")
+
+
+def _create_window(_klass, _title, _style, x, y, width, height, *_) -> int:
+    h_wnd = next(_handles)
+    width = 800 if width == CW_USEDEFAULT else width
+    height = 600 if height == CW_USEDEFAULT else height
+    _windows[h_wnd] = (0, 0, width, height)
+    return h_wnd
+
+
+def _client_rect(h_wnd: int) -> tuple[int, int, int, int]:
+    left, top, right, bottom = _windows.get(h_wnd, (0, 0, 0, 0))
+    return (0, 0, right - left, bottom - top)
+
+
+def _set_window_pos(h_wnd, _after, x, y, width, height, _flags) -> int:
+    _windows[h_wnd] = (x, y, x + width, y + height)
+    return 1
+
+
+def _draw_text(_hdc, text: str, _length, rect, _flags) -> tuple[int, tuple]:
+    lines = text.split("\n")
+    width = max(len(line) for line in lines) * CHAR_WIDTH
+    height = len(lines) * LINE_HEIGHT
+    return height, (rect[0], rect[1], rect[0] + width, rect[1] + height)
+
+
+def _new_handle(*_) -> int:
+    return next(_handles)
+
+
+win32gui.define("CreateWindow", _create_window)
+win32gui.define("GetWindowRect", lambda h_wnd: _windows.get(h_wnd, (0, 0, 0, 0)))
+win32gui.define("GetClientRect", _client_rect)
+win32gui.define("SetWindowPos", _set_window_pos)
+win32gui.define("DrawText", _draw_text)
+win32gui.define("BeginPaint", lambda h_wnd: (next(_handles), (0, 0, _client_rect(h_wnd))))
+for _name in (
+    "GetDC",
+    "CreateSolidBrush",
+    "CreateHatchBrush",
+    "CreatePen",
+    "CreateCompatibleDC",
+    "CreateCompatibleBitmap",
+    "CreateRectRgn",
+    "BeginDeferWindowPos",
+    "DeferWindowPos",
+    "GetStockObject",
+    "SelectObject",
+):
+    win32gui.define(_name, _new_handle)
+
+win32gui.LOWORD = lambda value: value & 0xFFFF
+win32gui.HIWORD = lambda value: (value >> 16) & 0xFFFF
+win32api.GetSystemMetrics = lambda _index: 23
+
+
+class _WNDCLASS:
+    hIcon = 0
+    hbrBackground = 0
+    style = 0
+    lpfnWndProc = None
+    lpszClassName = ""
+
+
+win32gui.WNDCLASS = _WNDCLASS
+
+
+class _WinDLL:
+    user32 = user32
+    gdi32 = gdi32
+    kernel32 = kernel32
+
+
+def install():
+    """Register the stand-in modules. Must be called before importing `native_ui`."""
+    win32 = ModuleType("win32")
+    win32.lib = ModuleType("win32.lib")
+    win32.lib.win32con = win32con
+    sys.modules.update(
+        {
+            "win32": win32,
+            "win32.lib": win32.lib,
+            "win32.lib.win32con": win32con,
+            "win32con": win32con,
+            "win32gui": win32gui,
+            "win32api": win32api,
+        }
+    )
+    ctypes.windll = _WinDLL()
+    ctypes.WinError = lambda code=None: OSError(code)
+    ctypes.GetLastError = lambda: 0
+
+
+def reset():
+    """Reset the native call counters."""
+    calls.clear()
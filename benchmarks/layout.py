@@ -0,0 +1,158 @@
+"""Headless layout benchmarks.
+
+Builds synthetic windows of `Button` and `Text` components, mixing flow and absolute
+(`top`/`left`/`right`/`bottom`) positioning and percent sizes, then reports:
+
+- first layout time per node
+- resize storm throughput and native calls per resize
+- single text change cost
+- peak memory of building and laying out the tree
+
+With `--uniform` every child is an identically styled `Text` row, the case the
+vectorized batch layout handles.
+
+Usage:
+    python -m benchmarks.layout [--sizes 10 100 1000] [--resizes 50] [--uniform]
+        [--json out.json]
+"""
+from __future__ import annotations
+
+import json
+import random
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from time import perf_counter
+
+from benchmarks import headless
+
+headless.install()
+
+from native_ui.kit.win import Window  # noqa: E402
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+
+
+def build(nodes: int, seed: int = 0, uniform: bool = False) -> Window:
+    """Build and init a window with `nodes` children."""
+    rng = random.Random(seed)
+    window = Window(
+        title="bench",
+        style={"width": 1280, "height": 720, "padding": (5, 10), "background": "FFF"},
+    )
+    for i in range(nodes):
+        if uniform:
+            window.Text(f"Row {i}", {"width": 0.5, "margin": (1, 0)})
+            continue
+
+        style = {}
+        kind = rng.random()
+        if kind < 0.1:
+            style["top" if rng.random() < 0.5 else "bottom"] = rng.randrange(0, 300)
+            style["left" if rng.random() < 0.5 else "right"] = rng.randrange(0, 300)
+        if rng.random() < 0.4:
+            style["width"] = rng.choice([0.25, 0.5, 1.0])
+        elif rng.random() < 0.3:
+            style["width"] = rng.randrange(40, 300)
+        if rng.random() < 0.2:
+            style["margin"] = rng.choice([2, (2, 4), 0.01])
+
+        text = f"Item {i} " + "x" * rng.randrange(0, 20)
+        if rng.random() < 0.3:
+            window.Button(text, style)
+        else:
+            window.Text(text, style)
+
+    for child in window.children:
+        child.init()
+    return window
+
+
+def resize(window: Window, width: int, height: int):
+    window.on_resize(window.h_wnd, 0, 0, (height << 16) | width)
+
+
+def run(nodes: int, resizes: int, uniform: bool = False) -> dict:
+    start = perf_counter()
+    window = build(nodes, uniform=uniform)
+    built = perf_counter() - start
+
+    headless.reset()
+    start = perf_counter()
+    window.update()
+    first = perf_counter() - start
+    first_calls = sum(headless.calls.values())
+
+    headless.reset()
+    start = perf_counter()
+    for i in range(resizes):
+        resize(window, 1280 - (i % 20) * 10, 720 - (i % 10) * 5)
+    storm = perf_counter() - start
+    storm_calls = sum(headless.calls.values())
+
+    headless.reset()
+    child = window.children[len(window.children) // 2]
+    start = perf_counter()
+    child.text += " changed"
+    window.update()
+    change = perf_counter() - start
+    change_calls = sum(headless.calls.values())
+
+    tracemalloc.start()
+    build(nodes, uniform=uniform).update()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "nodes": nodes,
+        "build_s": built,
+        "layout_us_per_node": first / nodes * 1e6,
+        "layout_calls": first_calls,
+        "resizes_per_s": resizes / storm if storm > 0 else float("inf"),
+        "calls_per_resize": storm_calls / resizes,
+        "text_change_ms": change * 1e3,
+        "text_change_calls": change_calls,
+        "peak_mib": peak / 2**20,
+    }
+
+
+def main(argv: list[str] | None = None):
+    parser = ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument(
+        "--resizes",
+        type=int,
+        default=None,
+        help="WM_SIZE messages per size, defaults to scaling down with the node count",
+    )
+    parser.add_argument(
+        "--uniform", action="store_true", help="Use identically styled Text rows"
+    )
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args(argv)
+
+    header = (
+        f"{'nodes':>8} {'us/node':>9} {'resize/s':>10} {'calls/resize':>13} "
+        f"{'change ms':>10} {'change calls':>13} {'peak MiB':>9}"
+    )
+    print(header)
+    results = []
+    for nodes in args.sizes:
+        resizes = args.resizes or max(3, min(50, 200_000 // nodes))
+        result = run(nodes, resizes, args.uniform)
+        results.append(result)
+        print(
+            f"{nodes:>8} {result['layout_us_per_node']:>9.2f} "
+            f"{result['resizes_per_s']:>10.1f} {result['calls_per_resize']:>13.1f} "
+            f"{result['text_change_ms']:>10.3f} {result['text_change_calls']:>13} "
+            f"{result['peak_mib']:>9.2f}"
+        )
+        sys.stdout.flush()
+
+    if args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Headless startup benchmarks.
+
+Every run happens in a fresh interpreter so nothing is cached between runs and
+reports:
+
+- package import time, `import native_ui.kit.win`
+- `Window` import time, the first access loading the toolkit
+- window construction time
+- time to first paint: showing the window, creating and laying out its children and
+  painting each of them once
+
+With `--modules` the slowest imports of one run are listed from `-X importtime`.
+
+Usage:
+    python -m benchmarks.startup [--runs 10] [--children 20] [--modules 10]
+        [--json out.json]
+"""
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from argparse import ArgumentParser
+from statistics import median
+
+SCRIPT = """
+import sys
+from time import perf_counter
+
+from benchmarks import headless
+
+headless.install()
+
+start = perf_counter()
+import native_ui.kit.win as win
+package = perf_counter()
+Window = win.Window
+loaded = perf_counter()
+
+import win32con
+from native_ui.kit.win.dispatch import dispatcher
+
+window = Window(title="startup", style={"width": 640, "height": 480})
+for i in range(int(sys.argv[1])):
+    window.Text(f"Row {i}") if i % 2 else window.Button(f"Button {i}")
+built = perf_counter()
+
+win32gui = sys.modules["win32gui"]
+win32gui.ShowWindow(window.h_wnd, win32con.SW_SHOW)
+for child in window.children:
+    child.init()
+window.update()
+for child in window.children:
+    dispatcher.proc(child.handle, win32con.WM_PAINT, 0, 0)
+painted = perf_counter()
+
+import json
+
+print(json.dumps({
+    "package_ms": (package - start) * 1e3,
+    "window_import_ms": (loaded - package) * 1e3,
+    "construct_ms": (built - loaded) * 1e3,
+    "first_paint_ms": (painted - start) * 1e3,
+}))
+"""
+
+
+def run_once(children: int, importtime: bool = False) -> tuple[dict, str]:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", SCRIPT, str(children)]
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def slowest_imports(stderr: str, count: int) -> list[tuple[str, float]]:
+    """Parse `-X importtime` output into (module, cumulative ms), slowest first."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        modules.append((name.strip(), int(cumulative) / 1e3))
+    return sorted(modules, key=lambda item: item[1], reverse=True)[:count]
+
+
+def main(argv: list[str] | None = None):
+    parser = ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--children", type=int, default=20)
+    parser.add_argument(
+        "--modules", type=int, default=0, help="List the N slowest imports of one run"
+    )
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args(argv)
+
+    runs = [run_once(args.children)[0] for _ in range(args.runs)]
+    result = {key: median(run[key] for run in runs) for key in runs[0]}
+    result["runs"] = args.runs
+    result["children"] = args.children
+
+    print(f"{'median of':<18} {args.runs} runs, {args.children} children")
+    print(f"{'package import':<18} {result['package_ms']:>8.2f} ms")
+    print(f"{'Window import':<18} {result['window_import_ms']:>8.2f} ms")
+    print(f"{'construct':<18} {result['construct_ms']:>8.2f} ms")
+    print(f"{'first paint':<18} {result['first_paint_ms']:>8.2f} ms")
+
+    if args.modules > 0:
+        print()
+        for name, ms in slowest_imports(run_once(args.children, True)[1], args.modules):
+            print(f"{name:<48} {ms:>8.2f} ms")
+
+    if args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Headless window creation benchmark.
+
+Creates and destroys many small windows, ex: tool popups, and reports:
+
+- windows created per second
+- native calls per window, the first window and every later one separately
+- number of registered window classes
+
+Usage:
+    python -m benchmarks.windows [--count 2000] [--children 3] [--titles]
+        [--json out.json]
+"""
+from __future__ import annotations
+
+import json
+from argparse import ArgumentParser
+from time import perf_counter
+
+from benchmarks import headless
+
+headless.install()
+
+import win32con  # noqa: E402
+
+from native_ui.kit.win.classes import window_classes  # noqa: E402
+from native_ui.kit.win.dispatch import WM_NCDESTROY, dispatcher  # noqa: E402
+from native_ui.kit.win.window import Window  # noqa: E402
+
+
+def create(index: int, children: int, titles: bool) -> Window:
+    window = Window(
+        title=f"tool {index}" if titles else "tool",
+        style={"width": 320, "height": 200},
+    )
+    for i in range(children):
+        window.Text(f"Label {i}")
+    window.opened = True
+    for child in window.children:
+        child.init()
+    window.update()
+    return window
+
+
+def destroy(window: Window):
+    dispatcher.proc(window.h_wnd, win32con.WM_DESTROY, 0, 0)
+    dispatcher.proc(window.h_wnd, WM_NCDESTROY, 0, 0)
+
+
+def run(count: int, children: int, titles: bool) -> dict:
+    headless.reset()
+    destroy(create(0, children, titles))
+    first_calls = sum(headless.calls.values())
+
+    headless.reset()
+    start = perf_counter()
+    for index in range(1, count + 1):
+        destroy(create(index, children, titles))
+    elapsed = perf_counter() - start
+    calls = headless.calls
+
+    return {
+        "windows": count,
+        "children": children,
+        "windows_per_s": count / elapsed if elapsed > 0 else float("inf"),
+        "us_per_window": elapsed / count * 1e6,
+        "first_window_calls": first_calls,
+        "calls_per_window": sum(calls.values()) / count,
+        "register_class_calls": calls["RegisterClass"],
+        "classes": len(window_classes),
+    }
+
+
+def main(argv: list[str] | None = None):
+    parser = ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--count", type=int, default=2000, help="Windows to create")
+    parser.add_argument(
+        "--children", type=int, default=3, help="Text children per window"
+    )
+    parser.add_argument(
+        "--titles", action="store_true", help="Give every window a different title"
+    )
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args(argv)
+
+    result = run(args.count, args.children, args.titles)
+    print(f"windows/s              {result['windows_per_s']:>10.0f}")
+    print(f"us/window              {result['us_per_window']:>10.1f}")
+    print(f"first window calls     {result['first_window_calls']:>10}")
+    print(f"calls/window           {result['calls_per_window']:>10.1f}")
+    print(f"RegisterClass calls    {result['register_class_calls']:>10}")
+    print(f"classes                {result['classes']:>10}")
+
+    if args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from native_ui.kit.win import Window, run, handler
 from native_ui.kit.win.popup import message_box, ButtonLayout, Icon, MessageReturn
-from native_ui.kit.win.styles import Stylesheet
+from native_ui.kit.win.styles import Cascade
 
 
 @handler(expect=MessageReturn.Ok)
@@ -17,8 +17,8 @@ def prompt_quit(hwnd) -> bool:
 
 # Styling is based on css. The format is the same.
 # This allows for easier and intuitive styling.
-# There will be a custom css based styling language for this library called Native
-# Cascading Style Sheet or (NCSS).
+# Styles can be written in the custom css based styling language for this library
+# called Native Cascading Style Sheet or (NCSS).
 # This language will be used in the outer scoped custom markup langauge that
 # allows for html style creating of windows
 #
@@ -27,22 +27,27 @@ def prompt_quit(hwnd) -> bool:
 #   <button onclick="<some callback>" style="<ncss styles>">Hello World!</button>
 # </window>
 
-stylesheet: Stylesheet = {
-    "window": {
-        "width": 800,
-        "height": 400,
-        "background": ("hatch", "c3c3c3", "tangent"),
-    },
-    "button": {"width": 150, "height": 50, "justify": "center", "align": "center"},
-    ".boxed-centered": {
-        "width": 150,
-        "height": 100,
-        "justify": "end",
-        "align": "end",
-        "border": "single",
-    },
-    ".red-text": {"top": -50, "color": "F00"},
-}
+theme = Cascade(
+    """
+    window {
+      width: 800px;
+      height: 400px;
+      background: hatch #c3c3c3 tangent;
+    }
+
+    button { width: 150px; height: 50px; justify: center; align: center; }
+
+    .boxed-centered {
+      width: 150px;
+      height: 100px;
+      justify: end;
+      align: end;
+      border: single;
+    }
+
+    .red-text { top: -50px; color: #F00; }
+    """
+)
 
 if __name__ == "__main__":
     if (
@@ -53,20 +58,12 @@ if __name__ == "__main__":
         )
         == MessageReturn.Yes
     ):
-        # CSS Equivelant:
-        #
-        # window {
-        #   icon: python.ico;
-        #   width: 800px;
-        #   height: 400px;
-        #   background: hatch #c3c3c3 tangent
-        # }
         win = Window(
             title="Hello World",
             klass="HelloWorld",
             bind={"close": prompt_quit},
             ico="python.ico",
-            style=stylesheet.get("window", {}),
+            style=theme.match("window"),
         )
 
         # CSS Equivelant:
@@ -86,15 +83,10 @@ if __name__ == "__main__":
         klass="HelloWorld2",
         ico="python.ico",
         style={
-            **stylesheet.get("window", {}),
+            **theme.match("window"),
             "z-order": "on-top",
         },
     ) as window:
-        window.Button("Hello World", stylesheet.get("button", {}))
-        window.Text(
-            "Some Text",
-            {**stylesheet.get("text", {}), **stylesheet.get(".boxed-centered", {})},
-        )
-        window.Text(
-            "right", {**stylesheet.get("text", {}), **stylesheet.get(".red-text", {})}
-        )
+        window.Button("Hello World", theme.match("button"))
+        window.Text("Some Text", theme.match("text", ["boxed-centered"]))
+        window.Text("right", theme.match("text", ["red-text"]))
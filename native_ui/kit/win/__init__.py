@@ -2,11 +2,27 @@
 Windows portion of the native API. This module contains wrappers around win32 API's
 using pywin32 and ctypes. The abstractions can be used as is or with the higher level
 parent module that creates an API that can be used with macOs, Windows, and Linux.
+
+The public names are loaded on first access so importing the package doesn't pull in
+pywin32 or the submodules that aren't used.
 """
 __version__ = "0.1.0"
 
-from .window import Window, run, handler
-from .color import HEX, RGB, brush
+from importlib import import_module
+
+_exports_ = {
+    "Window": ".window",
+    "run": ".window",
+    "handler": ".window",
+    "HEX": ".color",
+    "RGB": ".color",
+    "brush": ".color",
+    "VBox": ".container",
+    "HBox": ".container",
+    "VirtualList": ".virtual",
+    "State": ".state",
+    "Computed": ".state",
+}
 
 __all__ = [
     "Window",
@@ -14,5 +30,23 @@ __all__ = [
     "HEX",
     "RGB",
     "brush",
-    "handler"
+    "handler",
+    "VBox",
+    "HBox",
+    "VirtualList",
+    "State",
+    "Computed",
 ]
+
+
+def __getattr__(name: str):
+    module = _exports_.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
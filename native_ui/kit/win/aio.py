@@ -0,0 +1,254 @@
+"""asyncio integration.
+
+The window message pump and an asyncio event loop share the UI thread. `MessageSelector`
+is the selector of a standard `SelectorEventLoop`: when the loop waits for I/O or its
+next timer, the selector waits for window messages instead and dispatches them as soon
+as they arrive, so the loop wakes on either a message or a ready future. Sockets are
+polled every `slice` seconds while waiting since a wait for window messages can't
+include them.
+
+Messages come from a `MessageSource`. `Win32MessageSource` pumps the thread's message
+queue while `SimulatedMessageSource` runs posted callbacks so the scheduling can be
+exercised without a display.
+
+Handlers may be `async def`. The coroutine they return is scheduled on the running loop
+with `spawn`.
+
+`WM_QUIT`, ex: from `PostQuitMessage`, ends `run`: the main coroutine is cancelled and
+`run` returns None.
+"""
+from __future__ import annotations
+
+import asyncio
+import selectors
+from functools import partial
+from time import monotonic, sleep
+from typing import Any, Awaitable, Callable, Coroutine, Protocol
+
+
+class MessageSource(Protocol):
+    quit: bool
+    """Set once a quit message was pumped."""
+
+    def wait(self, timeout: float | None) -> bool:
+        """Block until a message is available or the timeout passed. Returns whether
+        messages are available.
+        """
+        ...
+
+    def pump(self) -> int:
+        """Dispatch every available message. Returns the number of messages."""
+        ...
+
+
+class Win32MessageSource:
+    """Waits on and dispatches the calling thread's window message queue."""
+
+    INFINITE = 0xFFFFFFFF
+    QS_ALLINPUT = 0x04FF
+    MWMO_INPUTAVAILABLE = 0x0004
+    PM_REMOVE = 0x0001
+    WM_QUIT = 0x0012
+
+    def __init__(self):
+        from ctypes import byref, windll
+        from ctypes.wintypes import MSG
+
+        self._user32_ = windll.user32
+        self._message_ = MSG()
+        self._message_p_ = byref(self._message_)
+        self.quit = False
+
+    def wait(self, timeout: float | None) -> bool:
+        ms = self.INFINITE if timeout is None else max(int(timeout * 1000), 0)
+        result = self._user32_.MsgWaitForMultipleObjectsEx(
+            0, None, ms, self.QS_ALLINPUT, self.MWMO_INPUTAVAILABLE
+        )
+        # WAIT_OBJECT_0 + 0 handles means input is available
+        return result == 0
+
+    def pump(self) -> int:
+        user32 = self._user32_
+        count = 0
+        while user32.PeekMessageA(self._message_p_, None, 0, 0, self.PM_REMOVE):
+            if self._message_.message == self.WM_QUIT:
+                # Like GetMessage returning 0, nothing after it is pumped
+                self.quit = True
+                return count + 1
+            user32.TranslateMessage(self._message_p_)
+            user32.DispatchMessageA(self._message_p_)
+            count += 1
+        return count
+
+
+class SimulatedMessageSource:
+    """Message source for running the loop without a display. Messages are callbacks
+    posted with an optional delay. Every wait timeout is recorded in `waits`.
+
+    Args:
+        clock (Callable[[], float]): Monotonic clock in seconds.
+    """
+
+    def __init__(self, clock: Callable[[], float] = monotonic):
+        self.clock = clock
+        self.waits: list[float | None] = []
+        self.dispatched = 0
+        self.quit = False
+        self._queue_: list[tuple[float, int, Callable[[], Any]]] = []
+        self._posted_ = 0
+
+    def post(self, callback: Callable[[], Any], delay: float = 0.0):
+        """Queue a message that is dispatched once `delay` seconds passed."""
+        self._posted_ += 1
+        self._queue_.append((self.clock() + delay, self._posted_, callback))
+        self._queue_.sort()
+
+    def post_quit(self, delay: float = 0.0):
+        """Queue a quit message, the simulated `PostQuitMessage`."""
+        self.post(self._quit_, delay)
+
+    def _quit_(self):
+        self.quit = True
+
+    def wait(self, timeout: float | None) -> bool:
+        self.waits.append(timeout)
+        if self._queue_:
+            until_next = max(self._queue_[0][0] - self.clock(), 0)
+            if timeout is None or until_next <= timeout:
+                sleep(until_next)
+                return True
+        if timeout is None:
+            raise RuntimeError("Waiting forever on a simulated source without messages")
+        sleep(timeout)
+        return False
+
+    def pump(self) -> int:
+        now = self.clock()
+        count = 0
+        while self._queue_ and self._queue_[0][0] <= now and not self.quit:
+            _, _, callback = self._queue_.pop(0)
+            callback()
+            count += 1
+        self.dispatched += count
+        return count
+
+
+class MessageSelector(selectors.BaseSelector):
+    """Selector that dispatches window messages while the event loop waits.
+
+    Args:
+        source (MessageSource): Where messages come from.
+        selector (selectors.BaseSelector | None): Selector used for sockets. Defaults to
+            `selectors.DefaultSelector`.
+        slice (float): Max seconds between socket polls while waiting for messages.
+        on_quit (Callable[[], Any] | None): Called once after the source pumped a quit
+            message.
+    """
+
+    def __init__(
+        self,
+        source: MessageSource,
+        selector: selectors.BaseSelector | None = None,
+        slice: float = 0.01,
+        on_quit: Callable[[], Any] | None = None,
+    ):
+        self.source = source
+        self.slice = slice
+        self.on_quit = on_quit
+        self._selector_ = selector or selectors.DefaultSelector()
+
+    def register(self, fileobj, events, data=None) -> selectors.SelectorKey:
+        return self._selector_.register(fileobj, events, data)
+
+    def unregister(self, fileobj) -> selectors.SelectorKey:
+        return self._selector_.unregister(fileobj)
+
+    def modify(self, fileobj, events, data=None) -> selectors.SelectorKey:
+        return self._selector_.modify(fileobj, events, data)
+
+    def get_map(self):
+        return self._selector_.get_map()
+
+    def close(self):
+        self._selector_.close()
+
+    def select(self, timeout: float | None = None) -> list:
+        # Messages dispatched here may have scheduled callbacks, return so they run
+        if self._pump_():
+            return self._selector_.select(0)
+        ready = self._selector_.select(0)
+        if ready or (timeout is not None and timeout <= 0):
+            return ready
+
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - monotonic(), 0)
+            wait = self.slice if remaining is None else min(remaining, self.slice)
+            if self.source.wait(wait):
+                self._pump_()
+                return self._selector_.select(0)
+            ready = self._selector_.select(0)
+            if ready or (remaining is not None and remaining <= wait):
+                return ready
+
+    def _pump_(self) -> int:
+        count = self.source.pump()
+        if self.source.quit and self.on_quit is not None:
+            on_quit, self.on_quit = self.on_quit, None
+            on_quit()
+        return count
+
+
+def new_event_loop(source: MessageSource | None = None) -> asyncio.AbstractEventLoop:
+    """Create an event loop that pumps window messages while idle.
+
+    Args:
+        source (MessageSource | None): Defaults to the thread's Win32 message queue.
+    """
+    return asyncio.SelectorEventLoop(MessageSelector(source or Win32MessageSource()))
+
+
+def run(main: Awaitable, source: MessageSource | None = None) -> Any:
+    """Run a coroutine to completion on a message pumping event loop. A quit message
+    cancels it and returns None.
+    """
+    selector = MessageSelector(source or Win32MessageSource())
+    loop_factory = partial(asyncio.SelectorEventLoop, selector)
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        return runner.run(_until_quit_(main, selector))
+
+
+async def _until_quit_(main: Awaitable, selector: MessageSelector) -> Any:
+    task = asyncio.ensure_future(main)
+    selector.on_quit = task.cancel
+    try:
+        return await task
+    except asyncio.CancelledError:
+        # Only swallow the cancellation caused by the quit message
+        if selector.source.quit and not asyncio.current_task().cancelling():
+            return None
+        raise
+
+
+_tasks_: set[asyncio.Task] = set()
+
+
+def spawn(coro: Coroutine) -> asyncio.Task:
+    """Schedule the coroutine of an async handler on the running loop.
+
+    Raises:
+        RuntimeError: When no loop is running, ex: the window was opened with the
+            blocking message loop instead of `main=`.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        coro.close()
+        raise RuntimeError(
+            "Async handlers need a running event loop, pass main= to run() or open()"
+        ) from None
+    task = loop.create_task(coro)
+    # Keep a reference until done so the task isn't garbage collected
+    _tasks_.add(task)
+    task.add_done_callback(_tasks_.discard)
+    return task
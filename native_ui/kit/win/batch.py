@@ -0,0 +1,102 @@
+"""Vectorized flow layout for long lists of identically styled components.
+
+Forms and lists with thousands of rows of the same type and style can be laid out with
+cumulative sums instead of a python loop where each row waits on the previous row's
+bottom. The math mirrors `flow_rect`, `size` and `clamp` exactly, anything it can't
+reproduce falls back to the scalar path by returning None.
+
+Requires NumPy, without it `batch_flow` always returns None. NumPy is imported the first
+time a list is long enough to be batched, not when the module loads.
+"""
+from __future__ import annotations
+
+from typing import Sequence
+
+from .component import Button, Component, Text
+from .data import Rect, RectArray
+from .styles import Styled, size
+
+
+def batch_flow(
+    children: Sequence[Component],
+    parent: tuple[Rect, Styled],
+    origin: tuple[Rect, Styled],
+) -> RectArray | None:
+    """Lay out a list of flowing children in one vectorized pass.
+
+    Args:
+        children (Sequence[Component]): Every child of the parent in order.
+        parent (tuple[Rect, Styled]): Rect and style of the parent.
+        origin (tuple[Rect, Styled]): Rect and style the first child flows after.
+
+    Returns:
+        RectArray | None: The bounds of every child or None when the children aren't
+            a homogeneous list of flowing `Button` or `Text` components.
+    """
+    if not children:
+        return None
+    try:
+        import numpy as np
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+
+    kind = type(children[0])
+    styled = children[0].style
+    style = styled.computed
+    if kind not in (Button, Text) or style.top is not None or style.bottom is not None:
+        return None
+    for child in children:
+        if type(child) is not kind or child.style.computed is not style:
+            return None
+
+    prect, pstyle = parent
+    ppad = pstyle.padding(prect)
+    marg = styled.margin(prect)
+    omarg = origin[1].margin(prect)
+
+    sizes = children[0].parent.text_measure.measure_many(child.text for child in children)
+    text = np.array(sizes, dtype=np.int64).reshape(-1, 2)
+    text_w, text_h = text[:, 0], text[:, 1]
+
+    c_width = prect.width - ppad[1] - ppad[3] - marg[3] - marg[1]
+    if style.width is None:
+        width = text_w + 8
+    else:
+        width = np.full(len(children), size(style.width, c_width), dtype=np.int64)
+    if kind is Text and style.overflow in ["none", None]:
+        # clamp(width, text_w + 8, c_width)
+        width = np.maximum(np.minimum(width, c_width), text_w + 8)
+
+    if style.left is not None:
+        left = np.full(len(children), ppad[3] + size(style.left, prect.width) + marg[3])
+    elif style.right is not None:
+        left = prect.right - style.right - ppad[1] - width - marg[1]
+    else:
+        left = np.full(len(children), ppad[3] + marg[3])
+
+    c_height = prect.height - ppad[0] - ppad[2] - marg[0] - marg[2]
+    if style.height is None:
+        height = text_h + 8
+    else:
+        height = np.full(len(children), size(style.height, c_height), dtype=np.int64)
+    # clamp(height, text_h, c_height)
+    height = np.maximum(np.minimum(height, c_height), text_h)
+
+    first = origin[0].bottom + omarg[2] + marg[0]
+    if origin[0].bottom == 0:
+        first += ppad[0]
+    top = np.empty(len(children), dtype=np.int64)
+    top[0] = first
+    np.cumsum(height[:-1] + marg[2] + marg[0], out=top[1:])
+    top[1:] += first
+    bottom = top + height
+
+    # A previous bottom of 0 adds the parent's padding in the scalar path
+    if np.any(bottom[:-1] == 0):
+        return None
+
+    rects = RectArray(len(children))
+    columns = rects.numpy()
+    for column, values in zip(columns, (left, top, left + width, bottom)):
+        column[:] = values
+    return rects
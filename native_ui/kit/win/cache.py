@@ -0,0 +1,67 @@
+"""Small bounded caches shared by the layout and paint paths."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Generic, Hashable, NamedTuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache(Generic[K, V]):
+    """Least recently used cache with a fixed number of entries and hit/miss counters.
+
+    Args:
+        maxsize (int): The max number of entries kept before the least recently used
+            entry is evicted.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        if maxsize <= 0:
+            raise ValueError(f"Expected a positive cache size, was {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data_: OrderedDict[K, V] = OrderedDict()
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Get a cached value and mark it as recently used."""
+        try:
+            value = self._data_[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data_.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key: K, value: V):
+        self._data_[key] = value
+        self._data_.move_to_end(key)
+        if len(self._data_) > self.maxsize:
+            self._data_.popitem(last=False)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._data_
+
+    def __len__(self) -> int:
+        return len(self._data_)
+
+    def pop(self, key: K, default: V | None = None) -> V | None:
+        return self._data_.pop(key, default)
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        self._data_.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data_))
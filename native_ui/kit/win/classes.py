@@ -0,0 +1,121 @@
+"""Shared window classes.
+
+A `WNDCLASS` only has to be registered once per process. `window_classes` registers
+every combination of icon, class style and window procedure the first time a window
+needs it and hands the same class name to every later window, so opening many windows
+doesn't pay for registration each time and windows with the same title don't collide.
+Common controls are initialized and icons are loaded once as well.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import win32api
+import win32con
+import win32gui
+
+ClassKey = tuple[int, int, Callable]
+
+
+class WindowClasses:
+    """Process wide registry of window classes.
+
+    Args:
+        prefix (str): Prefix of generated class names.
+    """
+
+    def __init__(self, prefix: str = "PyNativeUI"):
+        self.prefix = prefix
+        self._classes_: dict[ClassKey, str] = {}
+        self._named_: dict[str, ClassKey] = {}
+        self._icons_: dict[str, int] = {}
+        self._instance_: int | None = None
+        self._controls_ = False
+
+    @property
+    def instance(self) -> int:
+        """Module handle of the process, classes are registered for it."""
+        if self._instance_ is None:
+            self._instance_ = win32api.GetModuleHandle(None)
+        return self._instance_
+
+    def init_controls(self):
+        """Initialize the common controls library once."""
+        if not self._controls_:
+            win32gui.InitCommonControls()
+            self._controls_ = True
+
+    def icon(self, path: str) -> int:
+        """Load an `.ico` file once and return its shared handle."""
+        handle = self._icons_.get(path)
+        if handle is None:
+            handle = self._icons_[path] = win32gui.LoadImage(
+                0,
+                path,
+                win32con.IMAGE_ICON,
+                0,
+                0,
+                win32con.LR_LOADFROMFILE
+                | win32con.LR_SHARED
+                | win32con.LR_LOADTRANSPARENT
+                | win32con.LR_DEFAULTSIZE,
+            )
+        return handle
+
+    def acquire(
+        self,
+        proc: Callable[[int, int, int, int], Any],
+        icon: int = 0,
+        style: int = 0,
+        name: str | None = None,
+    ) -> str:
+        """Get the name of a registered class with these values, registering it first
+        if needed.
+
+        Args:
+            proc (Callable): The class' window procedure.
+            icon (int): Icon handle, 0 for the default icon.
+            style (int): `CS_*` class style.
+            name (str | None): Explicit class name. Generated when None.
+
+        Raises:
+            ValueError: When `name` was already registered with different values.
+        """
+        key = (icon, style, proc)
+        if name is None:
+            name = self._classes_.get(key)
+            if name is not None:
+                return name
+            name = f"{self.prefix}-{len(self._named_)}"
+            while name in self._named_:
+                name += "_"
+        else:
+            registered = self._named_.get(name)
+            if registered is not None:
+                if registered != key:
+                    raise ValueError(
+                        f"Window class {name!r} is already registered with a different icon, style or procedure"
+                    )
+                return name
+
+        wc = win32gui.WNDCLASS()
+        wc.hIcon = icon
+        wc.style = style
+        wc.lpfnWndProc = proc
+        wc.lpszClassName = name
+        wc.hInstance = self.instance
+        win32gui.RegisterClass(wc)
+
+        self._named_[name] = key
+        self._classes_.setdefault(key, name)
+        return name
+
+    def __len__(self) -> int:
+        return len(self._named_)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._named_
+
+
+window_classes = WindowClasses()
+"""Process wide window class registry."""
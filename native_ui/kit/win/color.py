@@ -1,27 +1,306 @@
-from typing import Literal, TypedDict
-from ctypes.wintypes import RGB, HDC, BOOL, RECT, BYTE
+"""Color parsing.
+
+Colors are parsed once into a COLORREF (`0x00BBGGRR`) and interned in a cache so styles
+and paints never parse the same string twice. Supported formats:
+
+- CSS named colors, ex: `"rebeccapurple"`
+- hex with or without `#`: `rgb`, `rgba`, `rrggbb` and `rrggbbaa`. Alpha is ignored
+  since COLORREFs have none.
+- `rgb(r, g, b)` and `rgba(r, g, b, a)`
+- `(r, g, b)` tuples
+
+`colorrefs` converts many colors at once into a NumPy `uint32` array, ex: for charts and
+heatmaps. It requires NumPy, which is imported on first use.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Literal, TypedDict
+from ctypes.wintypes import HDC, BOOL, RECT, BYTE
 from win32con import HS_DIAGCROSS
 
 from win32gui import CreateHatchBrush, CreateSolidBrush
 
+from .cache import LRUCache
+
+if TYPE_CHECKING:
+    import numpy as np
+
 PAINTSTRUCT = tuple[HDC, BOOL, RECT, BOOL, BOOL, BYTE]
 PyGdiHANDLE = tuple[int, PAINTSTRUCT]
+Color = str | tuple[int, int, int]
 
 __all__ = [
     "RGB",
-    "HEX"
+    "HEX",
+    "parse_color",
+    "colorrefs",
 ]
 
+NAMED_COLORS = {
+    "aliceblue": 0xF0F8FF,
+    "antiquewhite": 0xFAEBD7,
+    "aqua": 0x00FFFF,
+    "aquamarine": 0x7FFFD4,
+    "azure": 0xF0FFFF,
+    "beige": 0xF5F5DC,
+    "bisque": 0xFFE4C4,
+    "black": 0x000000,
+    "blanchedalmond": 0xFFEBCD,
+    "blue": 0x0000FF,
+    "blueviolet": 0x8A2BE2,
+    "brown": 0xA52A2A,
+    "burlywood": 0xDEB887,
+    "cadetblue": 0x5F9EA0,
+    "chartreuse": 0x7FFF00,
+    "chocolate": 0xD2691E,
+    "coral": 0xFF7F50,
+    "cornflowerblue": 0x6495ED,
+    "cornsilk": 0xFFF8DC,
+    "crimson": 0xDC143C,
+    "cyan": 0x00FFFF,
+    "darkblue": 0x00008B,
+    "darkcyan": 0x008B8B,
+    "darkgoldenrod": 0xB8860B,
+    "darkgray": 0xA9A9A9,
+    "darkgreen": 0x006400,
+    "darkgrey": 0xA9A9A9,
+    "darkkhaki": 0xBDB76B,
+    "darkmagenta": 0x8B008B,
+    "darkolivegreen": 0x556B2F,
+    "darkorange": 0xFF8C00,
+    "darkorchid": 0x9932CC,
+    "darkred": 0x8B0000,
+    "darksalmon": 0xE9967A,
+    "darkseagreen": 0x8FBC8F,
+    "darkslateblue": 0x483D8B,
+    "darkslategray": 0x2F4F4F,
+    "darkslategrey": 0x2F4F4F,
+    "darkturquoise": 0x00CED1,
+    "darkviolet": 0x9400D3,
+    "deeppink": 0xFF1493,
+    "deepskyblue": 0x00BFFF,
+    "dimgray": 0x696969,
+    "dimgrey": 0x696969,
+    "dodgerblue": 0x1E90FF,
+    "firebrick": 0xB22222,
+    "floralwhite": 0xFFFAF0,
+    "forestgreen": 0x228B22,
+    "fuchsia": 0xFF00FF,
+    "gainsboro": 0xDCDCDC,
+    "ghostwhite": 0xF8F8FF,
+    "gold": 0xFFD700,
+    "goldenrod": 0xDAA520,
+    "gray": 0x808080,
+    "green": 0x008000,
+    "greenyellow": 0xADFF2F,
+    "grey": 0x808080,
+    "honeydew": 0xF0FFF0,
+    "hotpink": 0xFF69B4,
+    "indianred": 0xCD5C5C,
+    "indigo": 0x4B0082,
+    "ivory": 0xFFFFF0,
+    "khaki": 0xF0E68C,
+    "lavender": 0xE6E6FA,
+    "lavenderblush": 0xFFF0F5,
+    "lawngreen": 0x7CFC00,
+    "lemonchiffon": 0xFFFACD,
+    "lightblue": 0xADD8E6,
+    "lightcoral": 0xF08080,
+    "lightcyan": 0xE0FFFF,
+    "lightgoldenrodyellow": 0xFAFAD2,
+    "lightgray": 0xD3D3D3,
+    "lightgreen": 0x90EE90,
+    "lightgrey": 0xD3D3D3,
+    "lightpink": 0xFFB6C1,
+    "lightsalmon": 0xFFA07A,
+    "lightseagreen": 0x20B2AA,
+    "lightskyblue": 0x87CEFA,
+    "lightslategray": 0x778899,
+    "lightslategrey": 0x778899,
+    "lightsteelblue": 0xB0C4DE,
+    "lightyellow": 0xFFFFE0,
+    "lime": 0x00FF00,
+    "limegreen": 0x32CD32,
+    "linen": 0xFAF0E6,
+    "magenta": 0xFF00FF,
+    "maroon": 0x800000,
+    "mediumaquamarine": 0x66CDAA,
+    "mediumblue": 0x0000CD,
+    "mediumorchid": 0xBA55D3,
+    "mediumpurple": 0x9370DB,
+    "mediumseagreen": 0x3CB371,
+    "mediumslateblue": 0x7B68EE,
+    "mediumspringgreen": 0x00FA9A,
+    "mediumturquoise": 0x48D1CC,
+    "mediumvioletred": 0xC71585,
+    "midnightblue": 0x191970,
+    "mintcream": 0xF5FFFA,
+    "mistyrose": 0xFFE4E1,
+    "moccasin": 0xFFE4B5,
+    "navajowhite": 0xFFDEAD,
+    "navy": 0x000080,
+    "oldlace": 0xFDF5E6,
+    "olive": 0x808000,
+    "olivedrab": 0x6B8E23,
+    "orange": 0xFFA500,
+    "orangered": 0xFF4500,
+    "orchid": 0xDA70D6,
+    "palegoldenrod": 0xEEE8AA,
+    "palegreen": 0x98FB98,
+    "paleturquoise": 0xAFEEEE,
+    "palevioletred": 0xDB7093,
+    "papayawhip": 0xFFEFD5,
+    "peachpuff": 0xFFDAB9,
+    "peru": 0xCD853F,
+    "pink": 0xFFC0CB,
+    "plum": 0xDDA0DD,
+    "powderblue": 0xB0E0E6,
+    "purple": 0x800080,
+    "rebeccapurple": 0x663399,
+    "red": 0xFF0000,
+    "rosybrown": 0xBC8F8F,
+    "royalblue": 0x4169E1,
+    "saddlebrown": 0x8B4513,
+    "salmon": 0xFA8072,
+    "sandybrown": 0xF4A460,
+    "seagreen": 0x2E8B57,
+    "seashell": 0xFFF5EE,
+    "sienna": 0xA0522D,
+    "silver": 0xC0C0C0,
+    "skyblue": 0x87CEEB,
+    "slateblue": 0x6A5ACD,
+    "slategray": 0x708090,
+    "slategrey": 0x708090,
+    "snow": 0xFFFAFA,
+    "springgreen": 0x00FF7F,
+    "steelblue": 0x4682B4,
+    "tan": 0xD2B48C,
+    "teal": 0x008080,
+    "thistle": 0xD8BFD8,
+    "tomato": 0xFF6347,
+    "turquoise": 0x40E0D0,
+    "violet": 0xEE82EE,
+    "wheat": 0xF5DEB3,
+    "white": 0xFFFFFF,
+    "whitesmoke": 0xF5F5F5,
+    "yellow": 0xFFFF00,
+    "yellowgreen": 0x9ACD32,
+}
+"""CSS named colors as 0xRRGGBB."""
+
+color_cache: LRUCache[str, int] = LRUCache(maxsize=4096)
+"""Parsed COLORREFs keyed by the color string."""
+
+
+def RGB(red: int, green: int, blue: int) -> int:
+    """Pack channels into a COLORREF."""
+    return red | (green << 8) | (blue << 16)
+
+
+def _swap_(rrggbb: int) -> int:
+    return ((rrggbb >> 16) & 0xFF) | (rrggbb & 0xFF00) | ((rrggbb & 0xFF) << 16)
+
+
+_HEXDIGITS_ = frozenset("0123456789abcdefABCDEF")
+
+
+def _hex_(value: str) -> int:
+    digits = value[1:] if value.startswith("#") else value
+    if not _HEXDIGITS_.issuperset(digits):
+        raise ValueError(f"Invalid color {value!r}")
+    if len(digits) in (3, 4):
+        digits = "".join(digit * 2 for digit in digits[:3])
+    elif len(digits) in (6, 8):
+        digits = digits[:6]
+    else:
+        raise ValueError(f"Invalid hex color {value!r}")
+    return _swap_(int(digits, 16))
+
+
+def _function_(value: str) -> int:
+    name, _, args = value.partition("(")
+    channels = [part.strip() for part in args.rstrip(") ").split(",")]
+    count = {"rgb": 3, "rgba": 4}.get(name.strip())
+    if count is None or len(channels) != count or not args.rstrip().endswith(")"):
+        raise ValueError(f"Invalid color function {value!r}")
+    red, green, blue = (int(channel) for channel in channels[:3])
+    if not all(0 <= channel <= 255 for channel in (red, green, blue)):
+        raise ValueError(f"Color channels must be between 0 and 255, was {value!r}")
+    return RGB(red, green, blue)
+
+
+def _parse_(value: str) -> int:
+    text = value.strip().lower()
+    named = NAMED_COLORS.get(text)
+    if named is not None:
+        return _swap_(named)
+    if "(" in text:
+        return _function_(text)
+    return _hex_(text)
+
+
 def HEX(value: str) -> int:
-    value.lstrip("#") 
-    if len(value) == 3:
-        value = f"{value[0]*2}{value[1]*2}{value[2]*2}"
+    """Get the COLORREF of a hex color like `"#F0F"` or `"FF00FF"`. Same as
+    `parse_color`, so names and `rgb()` work too.
+    """
+    return parse_color(value)
+
+
+def parse_color(value: Color) -> int:
+    """Get the COLORREF of any supported color. Strings are parsed once and cached.
+
+    Raises:
+        ValueError: When the color can't be parsed.
+    """
+    if isinstance(value, tuple):
+        return RGB(*value)
+    color = color_cache.get(value)
+    if color is None:
+        color = _parse_(value)
+        color_cache[value] = color
+    return color
+
+
+def colorrefs(values: Any) -> "np.ndarray":
+    """Convert many colors into a `uint32` array of COLORREFs.
+
+    Args:
+        values: One of
+            - a sequence of color strings, each distinct string is parsed once
+            - an (N, 3) or (N, 4) array of channels, ints in 0-255 or floats in 0-1
+            - a 1-D integer array of packed 0xRRGGBB values
+    """
+    try:
+        import numpy as np
+    except ImportError:  # pragma: no cover - optional dependency
+        raise ImportError("colorrefs requires NumPy, install native_ui[numpy]") from None
+
+    array = np.asarray(values)
+    if array.dtype.kind in "UO":
+        unique, inverse = np.unique(array, return_inverse=True)
+        parsed = np.fromiter(
+            (parse_color(str(value)) for value in unique), dtype=np.uint32, count=len(unique)
+        )
+        return parsed[inverse.reshape(array.shape)]
+
+    if array.ndim == 2 and array.shape[1] in (3, 4):
+        if array.dtype.kind == "f":
+            array = np.rint(np.clip(array, 0, 1) * 255)
+        channels = array[:, :3].astype(np.uint32)
+        return channels[:, 0] | (channels[:, 1] << 8) | (channels[:, 2] << 16)
+
+    if array.ndim == 1 and array.dtype.kind in "iu":
+        packed = array.astype(np.uint32)
+        return ((packed >> 16) & 0xFF) | (packed & 0xFF00) | ((packed & 0xFF) << 16)
+
+    raise ValueError(
+        f"Expected color strings, (N, 3|4) channels or packed ints, got {array.dtype} "
+        f"array of shape {array.shape}"
+    )
 
-    value = f"00{value[4:6]}{value[2:4]}{value[0:2]}" 
-    return int(value, 16) 
 
 class BrushConfig(TypedDict, total=False):
-    hatch: int 
+    hatch: int
 
 class Brush:
     @staticmethod
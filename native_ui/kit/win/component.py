@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import struct
+from typing import Any, Callable
 from win32.lib.win32con import (
     BS_CHECKBOX,
     ODS_DEFAULT,
@@ -20,7 +21,7 @@ from win32con import (
     BS_OWNERDRAW,
     BS_PUSHBUTTON,
     BS_RADIOBUTTON,
-    DT_CALCRECT,
+    COLOR_BTNFACE,
     DT_CENTER,
     DT_SINGLELINE,
     DT_VCENTER,
@@ -33,6 +34,7 @@ from win32con import (
     PS_DASHDOT,
     PS_DOT,
     TRANSPARENT,
+    WM_DESTROY,
     WM_ERASEBKGND,
     WM_NCPAINT,
     WM_PAINT,
@@ -44,17 +46,17 @@ from win32con import (
 )
 from win32gui import (
     BeginPaint,
-    CreatePen,
     CreateSolidBrush,
     CreateWindow,
     DefWindowProc,
+    DestroyWindow,
     DrawText,
     EndPaint,
     FillRect,
     FrameRect,
     GetClientRect,
-    GetDC,
     GetStockObject,
+    GetSysColorBrush,
     GetWindowRect,
     InvalidateRect,
     PyGetMemory,
@@ -66,14 +68,23 @@ from win32gui import (
     SetTextColor,
     SetWindowLong,
     SetWindowPos,
+    SetWindowText,
     UpdateWindow,
     ValidateRect,
 )
 
-from native_ui.kit.win.styles.style import parse_background
-from .styles import StyleDict, to_style, Styled, size, DEFAULT
+from .styles import PAINT_ONLY, StyleDict, to_style, Styled, size, DEFAULT
 from .color import HEX
-from .data import Rect
+from .data import Bounds, Rect
+from .dispatch import dispatcher
+from .gdi import GDIUser, pen_key
+from .layout import Dirty
+from .metrics import metrics
+from .state import Observable
+from .surface import Surface, surface_cache
+
+
+BORDER_PEN = pen_key(PS_DASHDOTDOT, 1, HEX("F0F"))
 
 
 def clamp(value: int | float, _min: int | float, _max: int | float) -> int | float:
@@ -85,18 +96,99 @@ def clamp(value: int | float, _min: int | float, _max: int | float) -> int | flo
     return value
 
 
-class Component:
+class Component(GDIUser):
     def __init__(
         self,
         style: StyleDict | None = None,
         parent=None,
     ):
-        self.style = Styled(style or {})
+        style = style or {}
+        bound = {
+            key: value for key, value in style.items() if isinstance(value, Observable)
+        }
+        if bound:
+            style = {**style, **{key: source.value for key, source in bound.items()}}
+        self._style_ = Styled(style)
         self.parent = parent
+        self._style_.on_change = self.restyle
         self.dimensions = (20, 10)
         self.pos = (0, 0)
         self.rect = Rect(0, 0, 0, 0)
         self.handle = 0
+        self._gdi_ = {}
+        self._intrinsic_ = None
+        self._bindings_: list[Callable[[], None]] = []
+        for key, source in bound.items():
+            self.bind(f"style.{key}", source)
+
+    @property
+    def style(self) -> Styled:
+        return self._style_
+
+    @style.setter
+    def style(self, style: StyleDict | Styled):
+        self._style_.set(style.style if isinstance(style, Styled) else style)
+
+    @property
+    def parent(self):
+        return self._parent_
+
+    @parent.setter
+    def parent(self, parent):
+        self._parent_ = parent
+        self._style_.inherit(None if parent is None else parent.style)
+
+    def bind(self, name: str, source: Observable) -> Callable[[], None]:
+        """Show the value of a `State` or `Computed` in a property, ex: `text`, or in a
+        style property prefixed with `style.`, ex: `style.color`.
+
+        Changes are applied on the UI thread with the parent's `post`, once per drain
+        however often the value changed, so every change made while handling an event
+        is laid out and repainted together.
+
+        Returns:
+            Callable[[], None]: Removes the binding.
+        """
+        queued = False
+
+        def apply():
+            nonlocal queued
+            queued = False
+            self._assign_(name, source.value)
+
+        def changed():
+            nonlocal queued
+            if queued:
+                return
+            if self.parent is None:
+                apply()
+            else:
+                queued = self.parent.post(apply)
+
+        self._assign_(name, source.value)
+        unsubscribe = source.subscribe(changed)
+        self._bindings_.append(unsubscribe)
+        return unsubscribe
+
+    def _assign_(self, name: str, value: Any):
+        if name.startswith("style."):
+            self.style = {**self._style_.style, name[6:]: value}
+        else:
+            setattr(self, name, value)
+
+    def unbind(self):
+        """Remove every binding, ex: when the component is destroyed."""
+        for unsubscribe in self._bindings_:
+            unsubscribe()
+        self._bindings_.clear()
+
+    def restyle(self, changed: frozenset[str]):
+        """Called when the resolved style changed, ex: the color inherited from an
+        ancestor. Only changes to layout properties cause a relayout.
+        """
+        if not changed <= PAINT_ONLY:
+            self.invalidate(Dirty.STYLE)
+        self.repaint()
 
     def init(self):
         if self.parent is None:
@@ -104,33 +196,132 @@ class Component:
                 f"Expected {self.__class__.__name__} parent, but None was provided."
             )
 
-    def update_rect(self, rect: Rect):
-        self.rect.update(rect)
-        if self.handle != 0:
-            SetWindowPos(
-                self.handle,
-                0,
-                rect.left,
-                rect.top,
-                rect.width,
-                rect.height,
-                0,
-            )
+    def invalidate(self, reason: Dirty = Dirty.STYLE):
+        """Notify the parent that this component needs to be laid out again."""
+        self._intrinsic_ = None
+        if self.parent is not None:
+            self.parent.invalidate_child(self, reason)
+
+    def intrinsic_size(self) -> tuple[int, int]:
+        """The preferred (width, height) of the component. Cached until the component
+        is invalidated.
+        """
+        if self._intrinsic_ is None:
+            self._intrinsic_ = self.calc_intrinsic()
+        return self._intrinsic_
+
+    def calc_intrinsic(self) -> tuple[int, int]:
+        raise NotImplementedError(
+            f"Expected component {self.__class__.__name__!r} to implement calc_intrinsic()"
+        )
 
-            InvalidateRect(self.handle, tuple(rect), True)
+    def repaint(self):
+        """Request a repaint of the component's content without moving it. Repaints
+        requested during a batch are merged with the rest of the batch's damage.
+        """
+        if self.handle != 0:
+            self.parent.positions.damage(self.parent.h_wnd, tuple(self.rect))
+
+    def update_rect(self, rect: Rect | Bounds):
+        """Move the component. The native window is only touched when the rect changed,
+        through the parent's `Positions` so moves made during a layout pass are batched.
+        """
+        previous = tuple(self.rect)
+        if self.rect.set(*rect) and self.handle != 0:
+            self.place(previous)
+
+    def place(self, previous: Bounds):
+        """Apply the current rect to the native window and repaint the area it left
+        and the area it now covers.
+        """
+        self.parent.positions.move(
+            self.parent.h_wnd, self.handle, tuple(self.rect), previous
+        )
 
     def update(self):
         raise NotImplementedError(
             f"Expected component {self.__class__.__name__!r} to implement update()"
         )
 
+    def destroy(self):
+        """Destroy the native window, if any, and drop the component's bindings. The
+        area it covered is repainted.
+        """
+        self.unbind()
+        if self.handle != 0:
+            positions = self.parent.positions
+            positions.forget(self.handle)
+            positions.damage(self.parent.h_wnd, tuple(self.rect))
+            DestroyWindow(self.handle)
+            self.handle = 0
+        self.release_gdi()
+
 
 def calc_text_size(text: str, parent) -> tuple[int, int]:
-    rect: tuple[int, int, int, int] = DrawText(
-        GetDC(parent.h_wnd), text, len(text), (0, 0, 0, 0), DT_CALCRECT
-    )[1]
-    #       left      right     top     bottom
-    return rect[2] - rect[0], rect[3] - rect[1]
+    """Get the (width, height) of some text using the parent's cached `TextMeasure`."""
+    return parent.text_measure.measure(text)
+
+
+def flow_rect(
+    styled: Styled,
+    preferred: tuple[int, int],
+    minimum: tuple[int | None, int],
+    previous: tuple[Rect, Styled],
+    parent: tuple[Rect, Styled],
+) -> Bounds:
+    """Calculate the bounds of a component that is either absolutely positioned with
+    left/right/top/bottom or flows after the previous component.
+
+    Args:
+        styled (Styled): The component's style.
+        preferred (tuple[int, int]): Width and height used when the style doesn't set them.
+        minimum (tuple[int | None, int]): Min width, or None for no min, and min height.
+        previous (tuple[Rect, Styled]): Rect and style of the previous component.
+        parent (tuple[Rect, Styled]): Rect and style of the parent.
+    """
+    ppad = parent[1].padding(parent[0])
+    pmarg = previous[1].margin(parent[0])
+    marg = styled.margin(parent[0])
+    style = styled.computed
+
+    c_width = parent[0].width - ppad[1] - ppad[3] - marg[3] - marg[1]
+    width = size(
+        preferred[0] if style.width is None else style.width,
+        # PERF: Subtract font size from width
+        c_width,
+    )
+    if minimum[0] is not None:
+        width = clamp(width, minimum[0], c_width)
+
+    if style.left is not None:
+        left = ppad[3] + size(style.left, parent[0].width) + marg[3]
+    elif style.right is not None:
+        left = parent[0].right - style.right - ppad[1] - width - marg[1]
+    else:
+        left = ppad[3] + marg[3]
+
+    c_height = parent[0].height - ppad[0] - ppad[2] - marg[0] - marg[2]
+    height = size(
+        preferred[1] if style.height is None else style.height,
+        c_height,
+    )
+    height = clamp(height, minimum[1], c_height)
+    if style.top is not None:
+        top = ppad[0] + size(style.top, parent[0].height) + marg[0]
+    elif style.bottom is not None:
+        top = (
+            parent[0].bottom
+            - size(style.bottom, parent[0].height)
+            - ppad[2]
+            - height
+            - marg[2]
+        )
+    else:
+        top = previous[0].bottom + pmarg[2] + marg[0]
+        if previous[0].bottom == 0:
+            top += ppad[0]
+
+    return (left, top, left + width, top + height)
 
 
 class DRAWITEMSTRUCT:
@@ -192,104 +383,92 @@ class DRAWITEMSTRUCT:
 
 
 class Button(Component):
-    def __init__(self, parent, text: str, style: StyleDict | None = None):
+    def __init__(
+        self, parent, text: str | Observable[str], style: StyleDict | None = None
+    ):
         super().__init__(style, parent)
-        self.text = text
+        self._text_ = ""
         self.sub_handle = 0
-
-    def proc(self, hWnd, msg, wParam, lParam):
-        if msg == WM_NOTIFY:
-            print("BUTTON INTERACT")
-            return True
-        elif msg in [WM_PAINT, WM_NCPAINT]:
-            hdc, ps = BeginPaint(hWnd)
-            SetBkMode(hdc, TRANSPARENT)
-            EndPaint(hWnd, ps)
-            return True
+        if isinstance(text, Observable):
+            self.bind("text", text)
         else:
-            return DefWindowProc(hWnd, msg, wParam, lParam)
+            self._text_ = text
+
+    @property
+    def text(self) -> str:
+        return self._text_
+
+    @text.setter
+    def text(self, text: str):
+        if text == self._text_:
+            return
+        self._text_ = text
+        if self.sub_handle != 0:
+            SetWindowText(self.sub_handle, text)
+        self.invalidate(Dirty.TEXT)
+
+    def on_notify(self, hWnd, msg, wParam, lParam):
+        print("BUTTON INTERACT")
+        return True
+
+    def on_paint(self, hWnd, msg, wParam, lParam):
+        hdc, ps = BeginPaint(hWnd)
+        SetBkMode(hdc, TRANSPARENT)
+        EndPaint(hWnd, ps)
+        return True
+
+    def on_destroy(self, hWnd, msg, wParam, lParam):
+        self.unbind()
+        self.release_gdi()
+        return DefWindowProc(hWnd, msg, wParam, lParam)
+
+    messages = {
+        WM_NOTIFY: on_notify,
+        WM_PAINT: on_paint,
+        WM_NCPAINT: on_paint,
+        WM_DESTROY: on_destroy,
+    }
 
     def calc_rect(
         self, previous: tuple[Rect, Styled], parent: tuple[Rect, Styled]
-    ) -> Rect:
-        rect = Rect(0, 0, 0, 0)
-
-        ppad = parent[1].padding(parent[0])
-        pmarg = previous[1].margin(parent[0])
-        marg = self.style.margin(parent[0])
+    ) -> Bounds:
         text_size = calc_text_size(self.text, self.parent)
-
-        c_width = parent[0].width - ppad[1] - ppad[3] - marg[3] - marg[1]
-        width = size(
-            self.style.get("width", text_size[0] + 8),
-            # PERF: Subtract font size from width
-            c_width,
+        return flow_rect(
+            self.style,
+            (text_size[0] + 8, text_size[1] + 8),
+            (None, text_size[1]),
+            previous,
+            parent,
         )
 
-        width = size(self.style.get("width", text_size[0] + 8), c_width)
-        # if self.style.get("overflow", None) in ["none", None] and isinstance(self.style.get("width", 0), float):
-        #     width = clamp(width, text_size[0] + 8, c_width)
-
-        if width >= c_width:
-            rect.left = ppad[3] + marg[3]
-        if "left" in self.style:
-            rect.left = (
-                ppad[3] + size(self.style.get("left", 0), parent[0].width) + marg[3]
-            )
-        elif "right" in self.style:
-            rect.left = (
-                parent[0].right - self.style.get("right", 0) - ppad[1] - width - marg[1]
-            )
-        else:
-            rect.left = ppad[3] + marg[3]
-        rect.right = rect.left + width
-
-        c_height = parent[0].height - ppad[0] - ppad[2] - marg[0] - marg[2]
-        height = size(
-            self.style.get("height", text_size[1] + 8),
-            c_height,
+    def calc_intrinsic(self) -> tuple[int, int]:
+        text_size = calc_text_size(self.text, self.parent)
+        style = self.style.computed
+        return (
+            style.width if isinstance(style.width, int) else text_size[0] + 8,
+            style.height if isinstance(style.height, int) else text_size[1] + 8,
         )
-        height = clamp(height, text_size[1], c_height)
-        if "top" in self.style:
-            rect.top = (
-                ppad[0] + size(self.style.get("top", 0), parent[0].height) + marg[0]
-            )
-        elif "bottom" in self.style:
-            rect.top = (
-                parent[0].bottom
-                - size(self.style.get("bottom", 0), parent[0].height)
-                - ppad[2]
-                - height
-                - marg[2]
-            )
-        else:
-            rect.top = previous[0].bottom + pmarg[2] + marg[0]
-            if previous[0].bottom == 0:
-                rect.top += ppad[0]
-        rect.bottom = rect.top + height
-
-        return rect
 
     def update(self, previous: tuple[Rect, Styled], parent: tuple[Rect, Styled]):
         rect = self.calc_rect(previous, parent)
         self.update_rect(rect)
 
-    def update_rect(self, rect: Rect):
-        super().update_rect(rect)
-        norm_rect = rect.normalized
-        if self.sub_handle != 0:
-            SetWindowPos(
-                self.sub_handle,
-                0,
-                norm_rect.left,
-                norm_rect.top,
-                norm_rect.width,
-                norm_rect.height,
-                0,
+    def place(self, previous: Bounds):
+        super().place(previous)
+        width, height = self.rect.width, self.rect.height
+        if self.sub_handle != 0 and (width, height) != (
+            previous[2] - previous[0],
+            previous[3] - previous[1],
+        ):
+            # Repainted with the wrapper's damage
+            self.parent.positions.move(
+                self.handle, self.sub_handle, (0, 0, width, height)
             )
-            # RedrawWindow(self.sub_handle, tuple(self.rect), None, 0)
-            InvalidateRect(self.sub_handle, tuple(self.rect), False)
-            # UpdateWindow(self.sub_handle)
+
+    def destroy(self):
+        # The button is destroyed with its wrapper
+        self.sub_handle = 0
+        super().destroy()
 
     def init(self):
         super().init()
@@ -322,8 +501,7 @@ class Button(Component):
             None,
         )
 
-        SetWindowLong(wWrapper, GWL_WNDPROC, self.proc)
-        # SetWindowLong(wButton, GWL_WNDPROC, self.button_proc)
+        dispatcher.attach(wWrapper, self)
 
         self.handle = wWrapper
         self.sub_handle = wButton
@@ -333,108 +511,110 @@ class Button(Component):
 
 
 class Text(Component):
-    def __init__(self, parent, text: str, style: StyleDict | None):
+    def __init__(self, parent, text: str | Observable[str], style: StyleDict | None):
         super().__init__(style, parent)
-        self.text = text
-
-    def proc(self, hWnd, msg, wParam, lParam):
-        if msg == WM_PAINT:
-            hdc, ps = BeginPaint(hWnd)
-            old_brush = None
-            rect = Rect(*GetClientRect(hWnd))
-
-            if self.style.get("background", "transparent") != "transparent":
-                old_brush = SelectObject(hdc, parse_background(self.style.get("background")))
-            else:
-                old_brush = SelectObject(hdc, GetStockObject(NULL_BRUSH))
-
-            pen = CreatePen(PS_DASHDOTDOT, 1, HEX("F0F"))
-            old_pen = SelectObject(hdc, pen)
+        self._text_ = ""
+        if isinstance(text, Observable):
+            self.bind("text", text)
+        else:
+            self._text_ = text
+
+    @property
+    def text(self) -> str:
+        return self._text_
+
+    @text.setter
+    def text(self, text: str):
+        if text == self._text_:
+            return
+        self._text_ = text
+        self.invalidate(Dirty.TEXT)
+        self.repaint()
+
+    def on_paint(self, hWnd, msg, wParam, lParam):
+        hdc, ps = BeginPaint(hWnd)
+        rect = Rect(*GetClientRect(hWnd))
+        style = self.style.computed
+
+        # The parent shows through when transparent or around the rounded border
+        backdrop = None
+        if style.background is None or style.border is not None:
+            backdrop = self.parent.backdrop(hdc)
+        shows = None
+        if backdrop is not None:
+            # A solid backdrop looks the same wherever the text is
+            shows = backdrop.key
+            if backdrop.key[0] != "solid":
+                shows = (shows, self.rect.left, self.rect.top)
+        key = (self.text, style, rect.width, rect.height, shows)
+        surface = surface_cache.render(
+            hdc, rect.width, rect.height, key, lambda dc: self.draw(dc, rect, backdrop)
+        )
+        surface.blit(hdc, ps[2])
+        EndPaint(hWnd, ps)
+        return True
+
+    def draw(self, hdc: int, rect: Rect, backdrop: Surface | None):
+        """Draw the text and its background into a DC covering the component."""
+        style = self.style.computed
+        if style.background is not None and style.border is None:
+            FillRect(hdc, tuple(rect), self.gdi("background", style.background))
+        elif backdrop is not None:
+            backdrop.blit(hdc, tuple(rect), (self.rect.left, self.rect.top))
+        else:
+            FillRect(hdc, tuple(rect), GetSysColorBrush(COLOR_BTNFACE))
+
+        if style.border is not None:
+            old_brush = SelectObject(
+                hdc,
+                self.gdi("background", style.background)
+                if style.background is not None
+                else GetStockObject(NULL_BRUSH),
+            )
+            old_pen = SelectObject(hdc, self.gdi("pen", BORDER_PEN))
+            RoundRect(hdc, *tuple(rect), rect.height, rect.height)
+            SelectObject(hdc, old_brush)
+            SelectObject(hdc, old_pen)
 
-            SetBkMode(hdc, TRANSPARENT)
-            if "border" in self.style:
-                print("Draw border")
-                RoundRect(hdc, *tuple(rect), rect.height, rect.height)
-            color = self.style.get("color", "000")
-            SetTextColor(hdc, RGB(*color) if isinstance(color, tuple) else HEX(color))
+        SetBkMode(hdc, TRANSPARENT)
+        SetTextColor(hdc, style.color)
+        DrawText(hdc, self.text, len(self.text), tuple(rect), style.draw_flags)
 
-            style = to_style("justify", self.style.get("justify", DEFAULT))
+    def on_erasebkgnd(self, hWnd, msg, wParam, lParam):
+        # The surface covers the whole window, erasing would only flicker
+        return True
 
-            if "overflow" in self.style:
-                style |= to_style("overflow", self.style.get("overflow"))
-            if "overflow" not in self.style or self.style["overflow"] != "break":
-                style |= to_style("align", self.style.get("align", DEFAULT))
+    def on_destroy(self, hWnd, msg, wParam, lParam):
+        self.unbind()
+        self.release_gdi()
+        return DefWindowProc(hWnd, msg, wParam, lParam)
 
-            DrawText(hdc, self.text, len(self.text), tuple(rect), style)
-            
-            if old_brush is not None:
-                SelectObject(hdc, old_brush)
-            SelectObject(hdc, old_pen)
-            EndPaint(hWnd, ps)
-            return True
-        else:
-            return DefWindowProc(hWnd, msg, wParam, lParam)
+    messages = {
+        WM_PAINT: on_paint,
+        WM_ERASEBKGND: on_erasebkgnd,
+        WM_DESTROY: on_destroy,
+    }
 
     def calc_rect(
         self, previous: tuple[Rect, Styled], parent: tuple[Rect, Styled]
-    ) -> Rect:
-        rect = Rect(0, 0, 0, 0)
-
-        ppad = parent[1].padding(parent[0])
-        pmarg = previous[1].margin(parent[0])
-        marg = self.style.margin(parent[0])
+    ) -> Bounds:
         text_size = calc_text_size(self.text, self.parent)
-
-        c_width = parent[0].width - ppad[1] - ppad[3] - marg[3] - marg[1]
-        width = size(
-            self.style.get("width", text_size[0] + 8),
-            # PERF: Subtract font size from width
-            c_width,
+        fit_text = self.style.computed.overflow in ["none", None]
+        return flow_rect(
+            self.style,
+            (text_size[0] + 8, text_size[1] + 8),
+            (text_size[0] + 8 if fit_text else None, text_size[1]),
+            previous,
+            parent,
         )
 
-        width = size(self.style.get("width", text_size[0] + 8), c_width)
-        if self.style.get("overflow", None) in ["none", None]:
-            width = clamp(width, text_size[0] + 8, c_width)
-
-        if width >= c_width:
-            rect.left = ppad[3] + marg[3]
-        if "left" in self.style:
-            rect.left = (
-                ppad[3] + size(self.style.get("left", 0), parent[0].width) + marg[3]
-            )
-        elif "right" in self.style:
-            rect.left = (
-                parent[0].right - self.style.get("right", 0) - ppad[1] - width - marg[1]
-            )
-        else:
-            rect.left = ppad[3] + marg[3]
-        rect.right = rect.left + width
-
-        c_height = parent[0].height - ppad[0] - ppad[2] - marg[0] - marg[2]
-        height = size(
-            self.style.get("height", text_size[1] + 8),
-            c_height,
+    def calc_intrinsic(self) -> tuple[int, int]:
+        text_size = calc_text_size(self.text, self.parent)
+        style = self.style.computed
+        return (
+            style.width if isinstance(style.width, int) else text_size[0] + 8,
+            style.height if isinstance(style.height, int) else text_size[1] + 8,
         )
-        height = clamp(height, text_size[1], c_height)
-        if "top" in self.style:
-            rect.top = (
-                ppad[0] + size(self.style.get("top", 0), parent[0].height) + marg[0]
-            )
-        elif "bottom" in self.style:
-            rect.top = (
-                parent[0].bottom
-                - size(self.style.get("bottom", 0), parent[0].height)
-                - ppad[2]
-                - height
-                - marg[2]
-            )
-        else:
-            rect.top = previous[0].bottom + pmarg[2] + marg[0]
-            if previous[0].bottom == 0:
-                rect.top += ppad[0]
-        rect.bottom = rect.top + height
-
-        return rect
 
     def update(self, previous: tuple[Rect, Styled], parent: tuple[Rect, Styled]):
         rect = self.calc_rect(previous, parent)
@@ -457,9 +637,13 @@ class Text(Component):
             None,
         )
 
-        SetWindowLong(wText, GWL_WNDPROC, self.proc)
+        dispatcher.attach(wText, self)
         self.handle = wText
 
 
 def center(current: int, parent: int, offset: int = 0):
     return (parent // 2) - (current // 2) + offset
+
+
+metrics.probe(Button, "calc_rect", "layout.calc_rect")
+metrics.probe(Text, "calc_rect", "layout.calc_rect")
@@ -0,0 +1,264 @@
+"""Flex style containers.
+
+`VBox` and `HBox` lay their children out along one axis in a single linear pass using
+`gap`, `justify` (main axis), `align` (cross axis) and each child's `grow`/`shrink`.
+Children's intrinsic sizes are cached and only recomputed when a child changes, so
+nesting containers does not re-measure the whole subtree.
+
+Containers don't create a native window, their children are native children of the
+window the container belongs to.
+"""
+from __future__ import annotations
+
+from .component import Button, Component, Text, flow_rect
+from .data import Bounds, Rect
+from .layout import Dirty
+from .metrics import metrics
+from .state import Observable
+from .styles import StyleDict, Styled, size
+from .view import Render, View
+from .virtual import RowFactory, VirtualList
+
+
+ALIGNMENT = {"start": 0, "center": 0.5, "end": 1}
+"""Share of the free space placed before the children for justify and align."""
+
+
+class Box(Component):
+    """Base for containers laying children out along one axis.
+
+    Args:
+        *children (Component): Initial children of the container.
+        style (StyleDict | None): The container's style.
+        parent: The window or container this container belongs to.
+    """
+
+    vertical: bool = True
+
+    def __init__(
+        self, *children: Component, style: StyleDict | None = None, parent=None
+    ):
+        super().__init__(style, parent)
+        self.children: list[Component] = []
+        self.pending = True
+        for child in children:
+            self.add(child)
+
+    def __enter__(self) -> Box:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    @property
+    def h_wnd(self) -> int:
+        """Handle of the native window children are created in."""
+        return self.parent.h_wnd
+
+    @property
+    def text_measure(self):
+        return self.parent.text_measure
+
+    @property
+    def positions(self):
+        return self.parent.positions
+
+    def backdrop(self, hdc: int):
+        return self.parent.backdrop(hdc)
+
+    def post(self, func, *args) -> bool:
+        return self.parent.post(func, *args)
+
+    @property
+    def opened(self) -> bool:
+        return self.parent is not None and self.parent.opened
+
+    def add(self, child: Component) -> Component:
+        """Append a child to the container."""
+        child.parent = self
+        self.children.append(child)
+        self.invalidate_child(child, Dirty.STYLE | Dirty.TEXT)
+        return child
+
+    def remove(self, child: Component):
+        """Remove a child from the container and destroy it."""
+        self.children.remove(child)
+        child.destroy()
+        self.invalidate_child(child, Dirty.CHILDREN)
+
+    def destroy(self):
+        for child in self.children:
+            child.destroy()
+        super().destroy()
+
+    def Button(
+        self, text: str | Observable[str], style: StyleDict | None = None
+    ) -> Button:
+        return self.add(Button(self, text, style))
+
+    def Text(
+        self, text: str | Observable[str], style: StyleDict | None = None
+    ) -> Text:
+        return self.add(Text(self, text, style))
+
+    def VBox(self, style: StyleDict | None = None) -> VBox:
+        return self.add(VBox(style=style, parent=self))
+
+    def HBox(self, style: StyleDict | None = None) -> HBox:
+        return self.add(HBox(style=style, parent=self))
+
+    def View(self, render: Render) -> View:
+        """Render a tree of elements as the children of the container, see `View`."""
+        return View(self, render)
+
+    def VirtualList(
+        self,
+        count: int,
+        row_factory: RowFactory,
+        style: StyleDict | None = None,
+        row_height: int = 24,
+    ) -> VirtualList:
+        return self.add(VirtualList(self, count, row_factory, style, row_height))
+
+    def init(self):
+        super().init()
+        for child in self.children:
+            child.init()
+
+    def invalidate_child(self, child: Component, reason: Dirty = Dirty.STYLE):
+        """A child changed, the container has to be measured and arranged again."""
+        self.pending = True
+        self.invalidate(Dirty.CHILDREN)
+
+    def calc_intrinsic(self) -> tuple[int, int]:
+        empty = Rect(0, 0, 0, 0)
+        main = 0
+        cross = 0
+        for child in self.children:
+            width, height = child.intrinsic_size()
+            marg = child.style.margin(empty)
+            width += marg[1] + marg[3]
+            height += marg[0] + marg[2]
+            if self.vertical:
+                main += height
+                cross = max(cross, width)
+            else:
+                main += width
+                cross = max(cross, height)
+
+        style = self.style.computed
+        if len(self.children) > 1 and isinstance(style.gap, int):
+            main += style.gap * (len(self.children) - 1)
+
+        pad = self.style.padding(empty)
+        width, height = (cross, main) if self.vertical else (main, cross)
+        return (
+            style.width if isinstance(style.width, int) else width + pad[1] + pad[3],
+            style.height if isinstance(style.height, int) else height + pad[0] + pad[2],
+        )
+
+    def calc_rect(
+        self, previous: tuple[Rect, Styled], parent: tuple[Rect, Styled]
+    ) -> Bounds:
+        return flow_rect(self.style, self.intrinsic_size(), (None, 0), previous, parent)
+
+    def update(self, previous: tuple[Rect, Styled], parent: tuple[Rect, Styled]):
+        self.update_rect(self.calc_rect(previous, parent))
+
+    def arrange(self) -> list[tuple[Component, Bounds]]:
+        """Calculate the rects of the children inside the container's current rect.
+
+        Returns:
+            list[tuple[Component, Bounds]]: Each child with its new bounds in window
+                coordinates.
+        """
+        self.pending = False
+        if not self.children:
+            return []
+
+        style = self.style.computed
+        pad = self.style.padding(self.rect)
+        inner = Rect(
+            0,
+            0,
+            max(self.rect.width - pad[1] - pad[3], 0),
+            max(self.rect.height - pad[0] - pad[2], 0),
+        )
+        vertical = self.vertical
+        main_size, cross_size = (
+            (inner.height, inner.width) if vertical else (inner.width, inner.height)
+        )
+        gap = size(style.gap or 0, main_size)
+
+        # (child, main, cross, margin before, margin after, cross before, cross after)
+        items = []
+        used = gap * (len(self.children) - 1)
+        grow = 0
+        shrink = 0
+        for child in self.children:
+            computed = child.style.computed
+            marg = child.style.margin(inner)
+            width, height = child.intrinsic_size()
+            if computed.width is not None:
+                width = size(computed.width, inner.width)
+            if computed.height is not None:
+                height = size(computed.height, inner.height)
+
+            if vertical:
+                item = [child, height, width, marg[0], marg[2], marg[3], marg[1]]
+            else:
+                item = [child, width, height, marg[3], marg[1], marg[0], marg[2]]
+            items.append(item)
+            used += item[1] + item[3] + item[4]
+            grow += computed.grow
+            shrink += computed.shrink * item[1]
+
+        free = main_size - used
+        if free > 0 and grow > 0:
+            for item in items:
+                item[1] += free * item[0].style.computed.grow / grow
+            free = 0
+        elif free < 0 and shrink > 0:
+            for item in items:
+                share = item[0].style.computed.shrink * item[1] / shrink
+                item[1] = max(item[1] + free * share, 0)
+            free = 0
+
+        cursor = max(free * ALIGNMENT.get(style.justify, 0), 0)
+        cursor += pad[0] if vertical else pad[3]
+        cross_start = pad[3] if vertical else pad[0]
+
+        rects = []
+        for child, main, cross, before, after, cross_before, cross_after in items:
+            room = cross_size - cross_before - cross_after
+            cross = min(cross, max(room, 0))
+            offset = (room - cross) * ALIGNMENT.get(style.align, 0)
+            cross_pos = cross_start + cross_before + max(round(offset), 0)
+
+            start = round(cursor + before)
+            end = round(cursor + before + main)
+            cursor += before + main + after + gap
+
+            left, top = self.rect.left, self.rect.top
+            if vertical:
+                bounds = (left + cross_pos, top + start, left + cross_pos + cross, top + end)
+            else:
+                bounds = (left + start, top + cross_pos, left + end, top + cross_pos + cross)
+            rects.append((child, bounds))
+        return rects
+
+
+class VBox(Box):
+    """Lays children out top to bottom."""
+
+    vertical = True
+
+
+class HBox(Box):
+    """Lays children out left to right."""
+
+    vertical = False
+
+
+metrics.probe(Box, "calc_rect", "layout.calc_rect")
+metrics.probe(Box, "arrange", "layout.arrange")
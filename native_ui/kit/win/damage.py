@@ -0,0 +1,87 @@
+"""Damage tracking.
+
+`Damage` accumulates the rects that need repainting, ex: the old and new rect of every
+component that moved, and merges them into a few rects so a relayout invalidates a
+small region instead of every child.
+"""
+from __future__ import annotations
+
+from typing import Iterator
+
+from .data import Bounds, Rect
+
+
+def area(rect: Bounds) -> int:
+    return max(rect[2] - rect[0], 0) * max(rect[3] - rect[1], 0)
+
+
+def union(a: Bounds, b: Bounds) -> Bounds:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def intersection(a: Bounds, b: Bounds) -> Bounds | None:
+    """The overlapping part of two rects or None if they don't overlap."""
+    left, top = max(a[0], b[0]), max(a[1], b[1])
+    right, bottom = min(a[2], b[2]), min(a[3], b[3])
+    if left >= right or top >= bottom:
+        return None
+    return (left, top, right, bottom)
+
+
+class Damage:
+    """Accumulated damaged area kept as a short list of rects.
+
+    A new rect is merged with an existing one when their bounding box wastes at most
+    `slack` of its area on undamaged pixels. Past `max_rects` everything collapses into
+    one bounding box.
+
+    Args:
+        slack (float): Max share of a merged rect that may be undamaged.
+        max_rects (int): Max number of separate rects.
+    """
+
+    def __init__(self, slack: float = 0.25, max_rects: int = 16):
+        self.slack = slack
+        self.max_rects = max_rects
+        self._rects_: list[Bounds] = []
+
+    def add(self, rect: Rect | Bounds):
+        """Mark a rect as damaged. Empty rects are ignored."""
+        rect = tuple(rect)
+        if area(rect) == 0:
+            return
+
+        merged = True
+        while merged:
+            merged = False
+            for i, other in enumerate(self._rects_):
+                if self._mergeable_(rect, other):
+                    rect = union(rect, other)
+                    del self._rects_[i]
+                    merged = True
+                    break
+        self._rects_.append(rect)
+
+        if len(self._rects_) > self.max_rects:
+            bounds = self._rects_[0]
+            for other in self._rects_[1:]:
+                bounds = union(bounds, other)
+            self._rects_ = [bounds]
+
+    def _mergeable_(self, a: Bounds, b: Bounds) -> bool:
+        merged = area(union(a, b))
+        overlap = intersection(a, b)
+        damaged = area(a) + area(b) - (area(overlap) if overlap is not None else 0)
+        return merged - damaged <= self.slack * merged
+
+    def __iter__(self) -> Iterator[Bounds]:
+        return iter(self._rects_)
+
+    def __len__(self) -> int:
+        return len(self._rects_)
+
+    def __bool__(self) -> bool:
+        return len(self._rects_) > 0
+
+    def clear(self):
+        self._rects_.clear()
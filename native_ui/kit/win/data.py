@@ -1,31 +1,63 @@
 from __future__ import annotations
-from typing import Iterator
-from functools import cached_property
+from array import array
+from typing import Iterable, Iterator
+
+Bounds = tuple[int, int, int, int]
+"""Plain (left, top, right, bottom) tuple. Used to pass rects around without
+allocating `Rect` objects.
+"""
+
 
 class Rect:
+    __slots__ = ("left", "top", "right", "bottom")
+
     def __init__(self, left: int, top: int, right: int, bottom: int):
         self.left = left
         self.top = top
         self.right = right
         self.bottom = bottom
 
-    @cached_property
+    @property
     def normalized(self) -> Rect:
         return Rect(0, 0, self.right - self.left, self.bottom - self.top)
 
-    @cached_property
+    @property
     def width(self) -> int:
         return self.right - self.left
 
-    @cached_property
+    @property
     def height(self) -> int:
         return self.bottom - self.top
 
-    def update(self, rect: Rect):
-        self.left = rect.left
-        self.top = rect.top
-        self.right = rect.right
-        self.bottom = rect.bottom
+    def update(self, rect: Rect | Bounds):
+        self.left, self.top, self.right, self.bottom = rect
+
+    def set(self, left: int, top: int, right: int, bottom: int) -> bool:
+        """Move the rect's edges in place.
+
+        Returns:
+            bool: Whether any edge changed.
+        """
+        if (
+            left == self.left
+            and top == self.top
+            and right == self.right
+            and bottom == self.bottom
+        ):
+            return False
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+        return True
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (Rect, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    # Rects are mutable
+    __hash__ = None
 
     def __iter__(self) -> Iterator[int]:
         yield self.left
@@ -36,3 +68,91 @@ class Rect:
     def __repr__(self) -> str:
         return f"({self.left}, {self.top}, {self.right}, {self.bottom})"
 
+
+class RectArray:
+    """Many rects stored contiguously as four `array('i')` columns. The vectorized
+    layout pass writes every child's bounds into one through its NumPy views.
+
+    Args:
+        size (int): Number of rects, all starting as (0, 0, 0, 0).
+    """
+
+    __slots__ = ("left", "top", "right", "bottom")
+
+    def __init__(self, size: int = 0):
+        zeros = bytes(size * array("i").itemsize)
+        self.left = array("i", zeros)
+        self.top = array("i", zeros)
+        self.right = array("i", zeros)
+        self.bottom = array("i", zeros)
+
+    @classmethod
+    def from_rects(cls, rects: Iterable[Rect | Bounds]) -> RectArray:
+        result = cls()
+        for rect in rects:
+            result.append(rect)
+        return result
+
+    def __len__(self) -> int:
+        return len(self.left)
+
+    def __getitem__(self, index: int) -> Bounds:
+        return (self.left[index], self.top[index], self.right[index], self.bottom[index])
+
+    def __setitem__(self, index: int, rect: Rect | Bounds):
+        left, top, right, bottom = rect
+        self.left[index] = left
+        self.top[index] = top
+        self.right[index] = right
+        self.bottom[index] = bottom
+
+    def __iter__(self) -> Iterator[Bounds]:
+        return zip(self.left, self.top, self.right, self.bottom)
+
+    def append(self, rect: Rect | Bounds):
+        left, top, right, bottom = rect
+        self.left.append(left)
+        self.top.append(top)
+        self.right.append(right)
+        self.bottom.append(bottom)
+
+    def set(self, index: int, left: int, top: int, right: int, bottom: int) -> bool:
+        """Move a rect's edges in place.
+
+        Returns:
+            bool: Whether any edge changed.
+        """
+        if (
+            self.left[index] == left
+            and self.top[index] == top
+            and self.right[index] == right
+            and self.bottom[index] == bottom
+        ):
+            return False
+        self.left[index] = left
+        self.top[index] = top
+        self.right[index] = right
+        self.bottom[index] = bottom
+        return True
+
+    def rect(self, index: int) -> Rect:
+        return Rect(*self[index])
+
+    def widths(self) -> array:
+        return array("i", (r - l for l, r in zip(self.left, self.right)))
+
+    def heights(self) -> array:
+        return array("i", (b - t for t, b in zip(self.top, self.bottom)))
+
+    def numpy(self):
+        """Zero copy NumPy views of the (left, top, right, bottom) columns.
+
+        Raises:
+            ImportError: When NumPy is not installed.
+        """
+        import numpy as np
+
+        return tuple(
+            np.frombuffer(column, dtype=np.intc)
+            for column in (self.left, self.top, self.right, self.bottom)
+        )
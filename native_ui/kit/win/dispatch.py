@@ -0,0 +1,220 @@
+"""Central window message dispatch.
+
+Every window created by the toolkit shares `dispatcher.proc` as its window procedure.
+Handlers are looked up in one flat `(h_wnd, message) -> handler` table and called with
+the component registered for the window, which is only referenced weakly so the table
+never keeps a destroyed component alive.
+
+Handlers are declared per class in a `messages` dict of message to plain function,
+ex: `messages = {WM_PAINT: on_paint}`, and are called as
+`handler(component, h_wnd, message, wparam, lparam)`. Unhandled messages go to
+`DefWindowProc`. Async handlers are scheduled on the running event loop and the message
+returns 0.
+
+While `timing` is on, by default while metrics are enabled, the number of calls and the
+time spent is accumulated per message type and per window, see `Dispatcher.stats` and
+`message_name`. A window's stats are dropped when it is unregistered.
+"""
+from __future__ import annotations
+
+from time import perf_counter_ns
+from types import CoroutineType
+from typing import Any, Callable
+from weakref import WeakValueDictionary
+
+from .metrics import metrics
+
+MessageHandler = Callable[[Any, int, int, int, int], Any]
+DefaultProc = Callable[[int, int, int, int], Any]
+
+WM_NCDESTROY = 0x0082
+"""Last message a window receives, its handlers are unregistered after it."""
+
+
+_names_: dict[int, str] = {}
+
+
+def message_name(message: int) -> str:
+    """Get the `WM_*` name of a message, or its hex value if it has none."""
+    if not _names_:
+        import win32con
+
+        for name, value in vars(win32con).items():
+            if name.startswith("WM_") and isinstance(value, int):
+                _names_.setdefault(value, name)
+    return _names_.get(message, f"0x{message:04X}")
+
+
+class MessageStats:
+    """Call count and cumulative time of one message type or window."""
+
+    __slots__ = ("calls", "ns")
+
+    def __init__(self):
+        self.calls = 0
+        self.ns = 0
+
+    @property
+    def seconds(self) -> float:
+        return self.ns / 1e9
+
+    @property
+    def average(self) -> float:
+        """Average seconds per call."""
+        return self.ns / self.calls / 1e9 if self.calls else 0.0
+
+    def __repr__(self) -> str:
+        return f"MessageStats(calls={self.calls}, seconds={self.seconds:.6f})"
+
+
+class Dispatcher:
+    """Routes window messages to the handlers of the component owning each window.
+
+    Args:
+        default (DefaultProc | None): Called for messages without a handler. Defaults to
+            `win32gui.DefWindowProc`, resolved on first use.
+        timing (bool | None): Whether to record per message and per window latency.
+            None follows `metrics.enabled`.
+    """
+
+    def __init__(self, default: DefaultProc | None = None, timing: bool | None = None):
+        self._default_ = default
+        self._timing_ = timing
+        self._table_: dict[tuple[int, int], MessageHandler] = {}
+        self._messages_: dict[int, tuple[int, ...]] = {}
+        self._components_: WeakValueDictionary[int, Any] = WeakValueDictionary()
+        self._by_message_: dict[int, MessageStats] = {}
+        self._by_window_: dict[int, MessageStats] = {}
+
+    @property
+    def default(self) -> DefaultProc:
+        if self._default_ is None:
+            from win32gui import DefWindowProc
+
+            self._default_ = DefWindowProc
+        return self._default_
+
+    @property
+    def timing(self) -> bool:
+        return metrics.enabled if self._timing_ is None else self._timing_
+
+    @timing.setter
+    def timing(self, timing: bool | None):
+        self._timing_ = timing
+
+    def register(
+        self,
+        h_wnd: int,
+        component: Any,
+        messages: dict[int, MessageHandler] | None = None,
+    ):
+        """Route the messages of a window to a component.
+
+        Args:
+            h_wnd (int): The window handle.
+            component (Any): Object passed as the first argument to the handlers.
+            messages (dict[int, MessageHandler] | None): Handlers per message. Defaults
+                to the component's `messages`.
+        """
+        if messages is None:
+            messages = getattr(component, "messages", {})
+        self._forget_(h_wnd)
+        self._components_[h_wnd] = component
+        self._messages_[h_wnd] = tuple(messages)
+        for message, handler in messages.items():
+            self._table_[(h_wnd, message)] = handler
+
+    def unregister(self, h_wnd: int):
+        """Forget a window's handlers and stats, ex: after it was destroyed."""
+        self._forget_(h_wnd)
+        # Handles are reused, a new window must not inherit these
+        self._by_window_.pop(h_wnd, None)
+
+    def _forget_(self, h_wnd: int):
+        for message in self._messages_.pop(h_wnd, ()):
+            self._table_.pop((h_wnd, message), None)
+        self._components_.pop(h_wnd, None)
+
+    def attach(self, h_wnd: int, component: Any):
+        """Register a component and subclass its native window to use `proc`."""
+        from win32con import GWL_WNDPROC
+        from win32gui import SetWindowLong
+
+        self.register(h_wnd, component)
+        SetWindowLong(h_wnd, GWL_WNDPROC, self.proc)
+
+    def __len__(self) -> int:
+        """Number of live registered windows."""
+        return len(self._components_)
+
+    def component(self, h_wnd: int) -> Any | None:
+        """The component registered for a window, if it is still alive."""
+        return self._components_.get(h_wnd)
+
+    def proc(self, h_wnd: int, message: int, wparam: int, lparam: int) -> Any:
+        """Window procedure shared by every registered window."""
+        if message == WM_NCDESTROY:
+            try:
+                return self._dispatch_(h_wnd, message, wparam, lparam)
+            finally:
+                self.unregister(h_wnd)
+        return self._dispatch_(h_wnd, message, wparam, lparam)
+
+    def _dispatch_(self, h_wnd: int, message: int, wparam: int, lparam: int) -> Any:
+        handler = self._table_.get((h_wnd, message))
+        component = self._components_.get(h_wnd) if handler is not None else None
+        if component is None:
+            return self.default(h_wnd, message, wparam, lparam)
+        if not self.timing:
+            result = handler(component, h_wnd, message, wparam, lparam)
+        else:
+            start = perf_counter_ns()
+            try:
+                result = handler(component, h_wnd, message, wparam, lparam)
+            finally:
+                self._record_(h_wnd, message, perf_counter_ns() - start)
+        if type(result) is CoroutineType:
+            from .aio import spawn
+
+            spawn(result)
+            return 0
+        return result
+
+    def _record_(self, h_wnd: int, message: int, elapsed: int):
+        stats = self._by_message_.get(message)
+        if stats is None:
+            stats = self._by_message_[message] = MessageStats()
+        stats.calls += 1
+        stats.ns += elapsed
+        stats = self._by_window_.get(h_wnd)
+        if stats is None:
+            stats = self._by_window_[h_wnd] = MessageStats()
+        stats.calls += 1
+        stats.ns += elapsed
+
+    def stats(self) -> dict[int, MessageStats]:
+        """Handled calls and time per message type."""
+        return dict(self._by_message_)
+
+    def window_stats(self, h_wnd: int) -> MessageStats:
+        """Handled calls and time for one window."""
+        return self._by_window_.get(h_wnd) or MessageStats()
+
+    def reset_stats(self):
+        self._by_message_.clear()
+        self._by_window_.clear()
+
+
+dispatcher = Dispatcher()
+"""Process wide message dispatcher."""
+
+
+def _message_samples_():
+    for message, stats in dispatcher.stats().items():
+        labels = {"message": message_name(message)}
+        yield "dispatch.calls", labels, stats.calls
+        yield "dispatch.seconds", labels, stats.seconds
+
+
+metrics.gauge("windows.native", dispatcher.__len__)
+metrics.collector(_message_samples_)
@@ -0,0 +1,139 @@
+"""Shared, reference counted GDI objects.
+
+Brushes and pens are interned by key, ex: `("solid", color)`, `("hatch", color, pattern)`
+or `("pen", style, width, color)`. Every `acquire` of a key returns the same handle and
+the object is deleted as soon as the last reference is released.
+"""
+from __future__ import annotations
+
+from typing import Protocol
+
+from .metrics import metrics
+
+GDIKey = tuple
+
+
+def solid_key(color: int) -> GDIKey:
+    return ("solid", color)
+
+
+def hatch_key(color: int, pattern: int) -> GDIKey:
+    return ("hatch", color, pattern)
+
+
+def pen_key(style: int, width: int, color: int) -> GDIKey:
+    return ("pen", style, width, color)
+
+
+class GDIBackend(Protocol):
+    def create(self, key: GDIKey) -> int:
+        ...
+
+    def delete(self, handle: int):
+        ...
+
+
+class Win32GDI:
+    """Creates and deletes GDI objects through win32gui."""
+
+    def __init__(self):
+        import win32gui
+
+        self._gui_ = win32gui
+
+    def create(self, key: GDIKey) -> int:
+        if key[0] == "solid":
+            return self._gui_.CreateSolidBrush(key[1])
+        if key[0] == "hatch":
+            return self._gui_.CreateHatchBrush(key[2], key[1])
+        if key[0] == "pen":
+            return self._gui_.CreatePen(key[1], key[2], key[3])
+        raise ValueError(f"Unknown GDI object type {key[0]!r}")
+
+    def delete(self, handle: int):
+        self._gui_.DeleteObject(handle)
+
+
+class GDICache:
+    """Interns GDI objects by key and deletes them when no longer referenced.
+
+    Args:
+        backend (GDIBackend | None): Object creating and deleting the native objects.
+            Defaults to `Win32GDI`, created on first use.
+    """
+
+    def __init__(self, backend: GDIBackend | None = None):
+        self._backend_ = backend
+        self._handles_: dict[GDIKey, int] = {}
+        self._refs_: dict[GDIKey, int] = {}
+
+    @property
+    def backend(self) -> GDIBackend:
+        if self._backend_ is None:
+            self._backend_ = Win32GDI()
+        return self._backend_
+
+    def acquire(self, key: GDIKey) -> int:
+        """Get the shared handle for a key, creating it if needed, and add a reference."""
+        handle = self._handles_.get(key)
+        if handle is None:
+            handle = self.backend.create(key)
+            self._handles_[key] = handle
+            self._refs_[key] = 0
+        self._refs_[key] += 1
+        return handle
+
+    def release(self, key: GDIKey):
+        """Drop a reference to a key. The object is deleted with the last reference."""
+        refs = self._refs_.get(key)
+        if refs is None:
+            raise KeyError(f"GDI object {key!r} is not acquired")
+        if refs > 1:
+            self._refs_[key] = refs - 1
+            return
+        del self._refs_[key]
+        self.backend.delete(self._handles_.pop(key))
+
+    def refs(self, key: GDIKey) -> int:
+        return self._refs_.get(key, 0)
+
+    def __len__(self) -> int:
+        return len(self._handles_)
+
+    def clear(self):
+        """Delete every object regardless of references."""
+        for handle in self._handles_.values():
+            self.backend.delete(handle)
+        self._handles_.clear()
+        self._refs_.clear()
+
+
+gdi_cache = GDICache()
+"""Process wide GDI object cache."""
+
+metrics.gauge("gdi.objects", gdi_cache.__len__)
+
+
+class GDIUser:
+    """Mixin for objects holding shared GDI objects in named slots."""
+
+    _gdi_: dict[str, tuple[GDIKey, int]]
+
+    def gdi(self, slot: str, key: GDIKey) -> int:
+        """Get the handle for a key held in a slot. The previously held key, if
+        different, is released.
+        """
+        held = self._gdi_.get(slot)
+        if held is not None:
+            if held[0] == key:
+                return held[1]
+            gdi_cache.release(held[0])
+        handle = gdi_cache.acquire(key)
+        self._gdi_[slot] = (key, handle)
+        return handle
+
+    def release_gdi(self):
+        """Release every GDI object held by this object."""
+        for key, _ in self._gdi_.values():
+            gdi_cache.release(key)
+        self._gdi_.clear()
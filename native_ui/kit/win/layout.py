@@ -0,0 +1,177 @@
+"""Incremental layout engine.
+
+Components are only recomputed when something they depend on changed: their own
+style or text, the size of their parent, the geometry of the sibling they flow after,
+or for containers one of their children. Native repositioning only happens for
+components whose rect actually moved.
+
+The engine is pure python and only relies on the component protocol (`rect`, `style`,
+`calc_rect` and `update_rect`), so it can be driven by any backend.
+"""
+from __future__ import annotations
+
+from enum import IntFlag, auto
+from typing import Any, Callable, Iterable, Protocol, Sequence
+
+from .data import Bounds, Rect, RectArray
+
+
+class Dirty(IntFlag):
+    """Reasons a component needs to be laid out again."""
+
+    NONE = 0
+    STYLE = auto()
+    TEXT = auto()
+    PARENT = auto()
+    PREVIOUS = auto()
+    CHILDREN = auto()
+
+
+class Layoutable(Protocol):
+    rect: Rect
+    style: Any
+
+    def calc_rect(self, previous: tuple[Rect, Any], parent: tuple[Rect, Any]) -> Bounds:
+        ...
+
+    def update_rect(self, rect: Rect | Bounds):
+        ...
+
+
+class Container(Layoutable, Protocol):
+    children: list
+    pending: bool
+
+    def arrange(self) -> Iterable[tuple[Layoutable, Bounds]]:
+        ...
+
+
+BatchLayout = Callable[
+    [Sequence[Layoutable], tuple[Rect, Any], tuple[Rect, Any]], "RectArray | None"
+]
+
+
+class LayoutRoot(Protocol):
+    rect: Rect
+    style: Any
+    children: list
+
+
+class LayoutEngine:
+    """Tracks dirty components of a root and lays out only what is affected.
+
+    Args:
+        root (LayoutRoot): The object owning the children. Must have `rect`, `style`
+            and `children`.
+        origin (tuple[Rect, Styled]): The (rect, style) pair the first child flows after.
+        batch (BatchLayout | None): Optional vectorized layout used when every child of
+            the root is dirty, ex: after a resize. It returns the bounds of every child
+            in a `RectArray` or None to fall back to laying out one child at a time.
+        batch_threshold (int): Min number of children before `batch` is tried.
+    """
+
+    def __init__(
+        self,
+        root: LayoutRoot,
+        origin: tuple[Rect, Any],
+        batch: BatchLayout | None = None,
+        batch_threshold: int = 256,
+    ):
+        self.root = root
+        self.origin = origin
+        self.batch = batch
+        self.batch_threshold = batch_threshold
+        self._dirty_: dict[Layoutable, Dirty] = {}
+
+    @property
+    def dirty(self) -> bool:
+        """Whether there are pending changes to lay out."""
+        return len(self._dirty_) > 0
+
+    def mark(self, component: Layoutable, reason: Dirty = Dirty.STYLE):
+        """Flag a component as needing layout for the given reason."""
+        self._dirty_[component] = self._dirty_.get(component, Dirty.NONE) | reason
+
+    def mark_all(self, reason: Dirty = Dirty.PARENT):
+        """Flag every child of the root, ex: when the root was resized."""
+        for child in self.root.children:
+            self.mark(child, reason)
+
+    def discard(self, component: Layoutable):
+        """Forget any pending changes for a component, ex: when it is removed."""
+        self._dirty_.pop(component, None)
+
+    def flush(self) -> list[Layoutable]:
+        """Lay out every dirty component and the siblings that flow after them.
+
+        Returns:
+            list[Layoutable]: The components whose rect changed.
+        """
+        if not self._dirty_:
+            return []
+
+        children = self.root.children
+        parent = (self.root.rect, self.root.style)
+        moved = None
+        if (
+            self.batch is not None
+            and len(children) >= self.batch_threshold
+            and len(self._dirty_) == len(children)
+        ):
+            moved = self._batch_(children, parent)
+        if moved is None:
+            moved = self._flow_(children, parent)
+        self._dirty_.clear()
+        return moved
+
+    def _batch_(
+        self, children: list[Layoutable], parent: tuple[Rect, Any]
+    ) -> list[Layoutable] | None:
+        bounds = self.batch(children, parent, self.origin)
+        if bounds is None:
+            return None
+
+        moved = []
+        for child, child_bounds in zip(children, bounds):
+            if child.rect != child_bounds:
+                child.update_rect(child_bounds)
+                moved.append(child)
+        return moved
+
+    def _flow_(
+        self, children: Iterable[Layoutable], parent: tuple[Rect, Any]
+    ) -> list[Layoutable]:
+        moved = []
+        previous = self.origin
+        carry = Dirty.NONE
+        for child in children:
+            reason = self._dirty_.pop(child, Dirty.NONE) | carry
+            carry = Dirty.NONE
+
+            if reason:
+                bounds = child.calc_rect(previous, parent)
+                if child.rect != bounds:
+                    child.update_rect(bounds)
+                    moved.append(child)
+                    carry = Dirty.PREVIOUS
+                elif reason & Dirty.STYLE:
+                    # Margins may have changed without moving this component
+                    carry = Dirty.PREVIOUS
+
+                if hasattr(child, "arrange"):
+                    self._arrange_(child, moved)
+
+            previous = (child.rect, child.style)
+        return moved
+
+    def _arrange_(self, container: Container, moved: list[Layoutable]):
+        """Position a container's children and descend into the nested containers that
+        moved or have pending changes.
+        """
+        for child, bounds in container.arrange():
+            changed = child.rect != bounds
+            if changed:
+                child.update_rect(bounds)
+                moved.append(child)
+            if hasattr(child, "arrange") and (changed or child.pending):
+                self._arrange_(child, moved)
@@ -0,0 +1,151 @@
+"""Text measurement with a shared LRU cache.
+
+`TextMeasure` caches sizes keyed by (text, font, format flags, width constraint) and
+delegates misses to a pluggable measurer. `GDIMeasurer` measures with `DrawText` on a
+single device context per window while `FixedMeasurer` uses deterministic metrics so
+layout can be measured without a display.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Protocol
+
+from .cache import LRUCache
+from .metrics import metrics
+
+Size = tuple[int, int]
+MeasureKey = tuple[str, int, int, int]
+
+
+class Measurer(Protocol):
+    def measure(self, text: str, font: int, flags: int, width: int) -> Size:
+        ...
+
+    def close(self):
+        ...
+
+
+class GDIMeasurer:
+    """Measure text with `DrawText(..., DT_CALCRECT)` on one reused window DC.
+
+    Args:
+        h_wnd (int): The window handle whose DC is used for measuring.
+    """
+
+    def __init__(self, h_wnd: int):
+        from win32con import DT_CALCRECT
+        from win32gui import DrawText, GetDC, ReleaseDC, SelectObject
+
+        self._draw_text_ = DrawText
+        self._release_dc_ = ReleaseDC
+        self._select_object_ = SelectObject
+        self._calc_rect_ = DT_CALCRECT
+
+        self.h_wnd = h_wnd
+        self.hdc = GetDC(h_wnd)
+
+    def measure(self, text: str, font: int, flags: int, width: int) -> Size:
+        return self.measure_many((text,), font, flags, width)[0]
+
+    def measure_many(
+        self, texts: Iterable[str], font: int, flags: int, width: int
+    ) -> list[Size]:
+        old_font = self._select_object_(self.hdc, font) if font else None
+        flags |= self._calc_rect_
+        sizes = []
+        for text in texts:
+            #       left top right bottom
+            rect = self._draw_text_(self.hdc, text, len(text), (0, 0, width, 0), flags)[1]
+            sizes.append((rect[2] - rect[0], rect[3] - rect[1]))
+        if old_font is not None:
+            self._select_object_(self.hdc, old_font)
+        return sizes
+
+    def close(self):
+        if self.hdc:
+            self._release_dc_(self.h_wnd, self.hdc)
+            self.hdc = 0
+
+
+class FixedMeasurer:
+    """Deterministic font metrics. Every character has the same width and text wraps
+    on whole characters when a width constraint is given.
+
+    Args:
+        char_width (int): Width of every character in pixels.
+        line_height (int): Height of every line in pixels.
+    """
+
+    def __init__(self, char_width: int = 7, line_height: int = 16):
+        self.char_width = char_width
+        self.line_height = line_height
+        self.calls = 0
+
+    def measure(self, text: str, font: int, flags: int, width: int) -> Size:
+        self.calls += 1
+        lines = text.split("\n")
+        columns = max(len(line) for line in lines)
+        rows = len(lines)
+        if width > 0:
+            per_line = max(width // self.char_width, 1)
+            rows = sum(max(-(-len(line) // per_line), 1) for line in lines)
+            columns = min(columns, per_line)
+        return columns * self.char_width, rows * self.line_height
+
+    def close(self):
+        pass
+
+
+class TextMeasure:
+    """Cached text measurement service.
+
+    Args:
+        measurer (Measurer): Object that does the actual measuring on a cache miss.
+        maxsize (int): Max number of cached measurements.
+    """
+
+    def __init__(self, measurer: Measurer, maxsize: int = 4096):
+        self.measurer = measurer
+        self.cache: LRUCache[MeasureKey, Size] = LRUCache(maxsize)
+
+    def measure(self, text: str, font: int = 0, flags: int = 0, width: int = 0) -> Size:
+        """Get the (width, height) of some text."""
+        key = (text, font, flags, width)
+        size = self.cache.get(key)
+        if size is None:
+            size = self.measurer.measure(text, font, flags, width)
+            self.cache[key] = size
+        return size
+
+    def measure_many(
+        self, texts: Iterable[str], font: int = 0, flags: int = 0, width: int = 0
+    ) -> list[Size]:
+        """Measure many strings sharing the same font, flags and width constraint.
+        Each distinct uncached string is measured once, in a single batch when the
+        measurer supports it.
+        """
+        texts = list(texts)
+        sizes: list[Size | None] = [
+            self.cache.get((text, font, flags, width)) for text in texts
+        ]
+        missing = list(dict.fromkeys(t for t, s in zip(texts, sizes) if s is None))
+        if missing:
+            if hasattr(self.measurer, "measure_many"):
+                measured = self.measurer.measure_many(missing, font, flags, width)
+            else:
+                measured = [
+                    self.measurer.measure(text, font, flags, width) for text in missing
+                ]
+            found = dict(zip(missing, measured))
+            for text, size in found.items():
+                self.cache[(text, font, flags, width)] = size
+            sizes = [found[t] if s is None else s for t, s in zip(texts, sizes)]
+        return sizes
+
+    def close(self):
+        """Release the measurer's native resources and drop cached sizes."""
+        self.measurer.close()
+        self.cache.clear()
+
+
+metrics.probe(TextMeasure, "measure", "layout.text_size")
+metrics.probe(TextMeasure, "measure_many", "layout.text_size_many")
@@ -0,0 +1,320 @@
+"""Runtime metrics for the layout, paint and event paths.
+
+`metrics` is the process wide `Registry` of counters, histograms and gauges. It is off
+by default and costs at most a check of `metrics.enabled` while off: hot functions are
+registered as probes with `probe` and only replaced by timed wrappers while metrics are
+enabled, the originals are restored on `disable`, and counters are only incremented
+while enabled.
+
+Gauges are read when exporting, ex: the number of live GDI objects and native windows
+or the message latencies recorded by the dispatcher. Everything can be exported as JSON
+or Prometheus text, written to a file or sent to a socket.
+
+Usage:
+    metrics.enable()
+    ...
+    metrics.write("metrics.prom", "prometheus")
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter_ns
+from typing import Any, Callable, Iterable, Literal
+
+Labels = tuple[tuple[str, str], ...]
+Sample = tuple[str, dict[str, str], float]
+Collector = Callable[[], Iterable[Sample]]
+Format = Literal["json", "prometheus"]
+
+BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    1.0,
+)
+"""Default histogram bucket upper bounds in seconds."""
+
+
+class Counter:
+    """Monotonically increasing count."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+
+class Histogram:
+    """Distribution of observed values over fixed buckets.
+
+    Args:
+        buckets (tuple[float, ...]): Sorted upper bounds of the buckets.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        # Last slot counts values above every bound
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def observe_ns(self, ns: int):
+        self.observe(ns / 1e9)
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """(upper bound, number of values <= bound) pairs, ending with infinity."""
+        total = 0
+        result = []
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class Probe:
+    """A function timed into a histogram while metrics are enabled."""
+
+    __slots__ = ("owner", "attribute", "name", "original")
+
+    def __init__(self, owner: Any, attribute: str, name: str):
+        self.owner = owner
+        self.attribute = attribute
+        self.name = name
+        self.original = None
+
+
+def _escape_(value: Any) -> str:
+    # Label values escape backslash, double quote and newline in the text format
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _key_(name: str, labels: dict[str, str] | None) -> tuple[str, Labels]:
+    return name, tuple(sorted((labels or {}).items()))
+
+
+class Registry:
+    """Named counters, histograms and gauges.
+
+    Args:
+        prefix (str): Prepended to metric names in the Prometheus export.
+    """
+
+    def __init__(self, prefix: str = "native_ui"):
+        self.prefix = prefix
+        self.enabled = False
+        self._counters_: dict[tuple[str, Labels], Counter] = {}
+        self._histograms_: dict[tuple[str, Labels], Histogram] = {}
+        self._gauges_: dict[tuple[str, Labels], Callable[[], float]] = {}
+        self._collectors_: list[Collector] = []
+        self._probes_: list[Probe] = []
+
+    def counter(self, name: str, labels: dict[str, str] | None = None) -> Counter:
+        key = _key_(name, labels)
+        counter = self._counters_.get(key)
+        if counter is None:
+            counter = self._counters_[key] = Counter()
+        return counter
+
+    def histogram(
+        self,
+        name: str,
+        labels: dict[str, str] | None = None,
+        buckets: tuple[float, ...] = BUCKETS,
+    ) -> Histogram:
+        key = _key_(name, labels)
+        histogram = self._histograms_.get(key)
+        if histogram is None:
+            histogram = self._histograms_[key] = Histogram(buckets)
+        return histogram
+
+    def gauge(
+        self,
+        name: str,
+        read: Callable[[], float],
+        labels: dict[str, str] | None = None,
+    ):
+        """Register a value that is read when exporting."""
+        self._gauges_[_key_(name, labels)] = read
+
+    def collector(self, collect: Collector):
+        """Register a callable returning (name, labels, value) gauge samples when
+        exporting.
+        """
+        self._collectors_.append(collect)
+
+    def probe(self, owner: Any, attribute: str, name: str):
+        """Time calls of `owner.attribute` into the histogram `name` while enabled.
+        The owner can be a class or a module and must define the attribute itself.
+        """
+        probe = Probe(owner, attribute, name)
+        self._probes_.append(probe)
+        if self.enabled:
+            self._install_(probe)
+
+    def enable(self):
+        """Start recording. Installs the timed wrappers of every probe."""
+        if self.enabled:
+            return
+        self.enabled = True
+        for probe in self._probes_:
+            self._install_(probe)
+
+    def disable(self):
+        """Stop recording and restore every probed function."""
+        if not self.enabled:
+            return
+        self.enabled = False
+        for probe in self._probes_:
+            setattr(probe.owner, probe.attribute, probe.original)
+            probe.original = None
+
+    def _install_(self, probe: Probe):
+        # Looked up in the owner itself so restoring never shadows an inherited value
+        original = vars(probe.owner)[probe.attribute]
+        probe.original = original
+        histogram = self.histogram(probe.name)
+
+        @wraps(original)
+        def timed(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                histogram.observe_ns(perf_counter_ns() - start)
+
+        setattr(probe.owner, probe.attribute, timed)
+
+    def reset(self):
+        """Zero every counter and histogram."""
+        for counter in self._counters_.values():
+            counter.value = 0
+        for histogram in self._histograms_.values():
+            histogram.counts = [0] * len(histogram.counts)
+            histogram.count = 0
+            histogram.sum = 0.0
+
+    def _gauge_samples_(self) -> list[tuple[str, Labels, float]]:
+        samples = [(name, labels, read()) for (name, labels), read in self._gauges_.items()]
+        for collect in self._collectors_:
+            for name, labels, value in collect():
+                samples.append((*_key_(name, labels), value))
+        return samples
+
+    def snapshot(self) -> dict:
+        """Every metric as plain data."""
+
+        def entry(name: str, labels: Labels, **values) -> dict:
+            return {"name": name, "labels": dict(labels), **values}
+
+        return {
+            "counters": [
+                entry(name, labels, value=counter.value)
+                for (name, labels), counter in self._counters_.items()
+            ],
+            "histograms": [
+                entry(
+                    name,
+                    labels,
+                    count=histogram.count,
+                    sum=histogram.sum,
+                    buckets=[
+                        ["+Inf" if bound == float("inf") else bound, count]
+                        for bound, count in histogram.cumulative()
+                    ],
+                )
+                for (name, labels), histogram in self._histograms_.items()
+            ],
+            "gauges": [
+                entry(name, labels, value=value)
+                for name, labels, value in self._gauge_samples_()
+            ],
+        }
+
+    def to_json(self) -> str:
+        import json
+
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        lines = []
+
+        def metric(name: str) -> str:
+            return f"{self.prefix}_{name}".replace(".", "_").replace("-", "_")
+
+        def labelled(name: str, labels: Labels) -> str:
+            if not labels:
+                return name
+            pairs = ",".join(f'{key}="{_escape_(value)}"' for key, value in labels)
+            return f"{name}{{{pairs}}}"
+
+        typed = set()
+
+        def header(name: str, kind: str):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), counter in self._counters_.items():
+            name = metric(name) + "_total"
+            header(name, "counter")
+            lines.append(f"{labelled(name, labels)} {counter.value}")
+
+        for (name, labels), histogram in self._histograms_.items():
+            name = metric(name) + "_seconds"
+            header(name, "histogram")
+            for bound, count in histogram.cumulative():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{labelled(name + '_bucket', (*labels, ('le', le)))} {count}")
+            lines.append(f"{labelled(name + '_sum', labels)} {histogram.sum}")
+            lines.append(f"{labelled(name + '_count', labels)} {histogram.count}")
+
+        for name, labels, value in self._gauge_samples_():
+            name = metric(name)
+            header(name, "gauge")
+            lines.append(f"{labelled(name, labels)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, format: Format = "json") -> str:
+        if format == "json":
+            return self.to_json()
+        if format == "prometheus":
+            return self.to_prometheus()
+        raise ValueError(f"Unknown metrics format {format!r}")
+
+    def write(self, path: str, format: Format = "json"):
+        """Write the metrics to a file."""
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.export(format))
+
+    def send(self, address: tuple[str, int], format: Format = "json"):
+        """Send the metrics over a TCP connection, ex: to a local collector."""
+        import socket
+
+        with socket.create_connection(address) as connection:
+            connection.sendall(self.export(format).encode("utf-8"))
+
+
+metrics = Registry()
+"""Process wide metrics registry."""
@@ -0,0 +1,220 @@
+"""Batched native window positioning.
+
+Layout only decides where components go, `Positions` applies the result. Inside a
+`batch()` every move is collected and committed at the end with one
+`BeginDeferWindowPos`/`DeferWindowPos`/`EndDeferWindowPos` sequence per parent window,
+so a relayout moves all the windows at once instead of one `SetWindowPos` per child.
+Moves don't repaint anything by themselves. The old and new rects of every moved window
+are collected as `Damage` of its parent and only that merged region is invalidated once
+the batch is committed.
+
+The native calls go through a `PositionBackend`. `Win32Positioner` talks to win32gui
+while `RecordingPositioner` only records calls so batching can be checked without a
+display.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, Protocol
+
+from .damage import Damage
+from .data import Bounds
+
+
+class PositionBackend(Protocol):
+    def move(self, handle: int, bounds: Bounds):
+        ...
+
+    def begin(self, count: int) -> int:
+        ...
+
+    def defer(self, batch: int, handle: int, bounds: Bounds) -> int:
+        ...
+
+    def end(self, batch: int):
+        ...
+
+    def invalidate(self, handle: int, bounds: Bounds):
+        ...
+
+
+class Win32Positioner:
+    """Moves and repaints windows through win32gui."""
+
+    def __init__(self):
+        import win32con
+        import win32gui
+
+        self._gui_ = win32gui
+        self._flags_ = (
+            win32con.SWP_NOZORDER | win32con.SWP_NOACTIVATE | win32con.SWP_NOREDRAW
+        )
+        self._redraw_ = (
+            win32con.RDW_INVALIDATE | win32con.RDW_ERASE | win32con.RDW_ALLCHILDREN
+        )
+
+    def move(self, handle: int, bounds: Bounds):
+        left, top, right, bottom = bounds
+        self._gui_.SetWindowPos(
+            handle, 0, left, top, right - left, bottom - top, self._flags_
+        )
+
+    def begin(self, count: int) -> int:
+        return self._gui_.BeginDeferWindowPos(count)
+
+    def defer(self, batch: int, handle: int, bounds: Bounds) -> int:
+        left, top, right, bottom = bounds
+        return self._gui_.DeferWindowPos(
+            batch, handle, 0, left, top, right - left, bottom - top, self._flags_
+        )
+
+    def end(self, batch: int):
+        self._gui_.EndDeferWindowPos(batch)
+
+    def invalidate(self, handle: int, bounds: Bounds):
+        self._gui_.RedrawWindow(handle, bounds, None, self._redraw_)
+
+
+class RecordingPositioner:
+    """Records every call instead of touching native windows.
+
+    `log` holds `(call, *args)` tuples in order and `calls` the number of calls per
+    method name.
+    """
+
+    def __init__(self):
+        self.log: list[tuple] = []
+        self.calls: Counter[str] = Counter()
+        self._batches_ = 0
+
+    def _record_(self, *call):
+        self.log.append(call)
+        self.calls[call[0]] += 1
+
+    def move(self, handle: int, bounds: Bounds):
+        self._record_("move", handle, bounds)
+
+    def begin(self, count: int) -> int:
+        self._batches_ += 1
+        self._record_("begin", count)
+        return self._batches_
+
+    def defer(self, batch: int, handle: int, bounds: Bounds) -> int:
+        self._record_("defer", batch, handle, bounds)
+        return batch
+
+    def end(self, batch: int):
+        self._record_("end", batch)
+
+    def invalidate(self, handle: int, bounds: Bounds):
+        self._record_("invalidate", handle, bounds)
+
+    def reset(self):
+        self.log.clear()
+        self.calls.clear()
+
+
+class Positions:
+    """Applies window geometry and repaints the damage it causes, immediately or
+    collected in batches.
+
+    Args:
+        backend (PositionBackend | None): Object doing the native calls. Defaults to
+            `Win32Positioner`, created on first use.
+    """
+
+    def __init__(self, backend: PositionBackend | None = None):
+        self._backend_ = backend
+        self._depth_ = 0
+        self._pending_: dict[int, dict[int, Bounds]] = {}
+        self._damage_: dict[int, Damage] = {}
+
+    @property
+    def backend(self) -> PositionBackend:
+        if self._backend_ is None:
+            self._backend_ = Win32Positioner()
+        return self._backend_
+
+    @property
+    def batching(self) -> bool:
+        """Whether moves are currently being collected."""
+        return self._depth_ > 0
+
+    def move(
+        self,
+        parent: int,
+        handle: int,
+        bounds: Bounds,
+        previous: Bounds | None = None,
+    ):
+        """Move a window, or queue the move while batching. Moving the same window
+        again in a batch replaces its queued bounds.
+
+        Args:
+            parent (int): Handle of the window's parent. Windows in one deferred batch
+                must share a parent.
+            handle (int): Handle of the window to move.
+            bounds (Bounds): New bounds in the parent's client coordinates.
+            previous (Bounds | None): Bounds the window had. When given both the old
+                and new bounds are repainted, otherwise the move is only repainted as
+                part of damage to its parent.
+        """
+        if self._depth_ == 0:
+            self.backend.move(handle, bounds)
+        else:
+            self._pending_.setdefault(parent, {})[handle] = bounds
+        if previous is not None:
+            self.damage(parent, previous, bounds)
+
+    def damage(self, parent: int, *rects: Bounds):
+        """Mark rects of a window as needing a repaint, along with the children
+        overlapping them. Outside a batch they are invalidated right away.
+        """
+        damage = self._damage_.get(parent)
+        if damage is None:
+            damage = self._damage_[parent] = Damage()
+        for rect in rects:
+            damage.add(rect)
+        if self._depth_ == 0:
+            self._repaint_()
+
+    def forget(self, handle: int):
+        """Drop the queued moves of a window and of its children, ex: before it is
+        destroyed. A deferred batch fails as a whole if one of its windows is gone.
+        """
+        self._pending_.pop(handle, None)
+        self._damage_.pop(handle, None)
+        for moves in self._pending_.values():
+            moves.pop(handle, None)
+
+    @contextmanager
+    def batch(self) -> Iterator[Positions]:
+        """Collect moves until the outermost batch exits, then commit them."""
+        self._depth_ += 1
+        try:
+            yield self
+        finally:
+            self._depth_ -= 1
+            if self._depth_ == 0:
+                self.commit()
+
+    def commit(self):
+        """Apply every queued move and repaint the damaged regions."""
+        pending, self._pending_ = self._pending_, {}
+        backend = self.backend
+        for moves in pending.values():
+            if len(moves) == 1:
+                backend.move(*next(iter(moves.items())))
+                continue
+            batch = backend.begin(len(moves))
+            for handle, bounds in moves.items():
+                batch = backend.defer(batch, handle, bounds)
+            backend.end(batch)
+        self._repaint_()
+
+    def _repaint_(self):
+        damaged, self._damage_ = self._damage_, {}
+        for parent, damage in damaged.items():
+            for rect in damage:
+                self.backend.invalidate(parent, rect)
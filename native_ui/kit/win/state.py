@@ -0,0 +1,151 @@
+"""Observable state.
+
+`State` holds a value and notifies its listeners when it changes. `Computed` derives a
+value from other cells: the cells it reads are tracked every time it is evaluated, and
+it is only evaluated again, lazily on the next read, after one of them changed.
+
+Components show cells with `Component.bind`, or by passing a cell as their text or as a
+style value, ex: `window.Text(name, {"color": accent})`. A change doesn't touch the
+component right away. The binding is queued on the window's work queue once, so every
+change made while handling an event, or posted from another thread, is applied in the
+next drain followed by a single layout pass and repaint of the affected components.
+
+Usage:
+    count = State(0)
+    label = Computed(lambda: f"Clicked {count.value} times")
+    window.Text(label)
+    count.value += 1
+"""
+from __future__ import annotations
+
+from itertools import count
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+Listener = Callable[[], Any]
+
+_tracking_: list[set[Observable]] = []
+"""Cells read by each `Computed` currently being evaluated, innermost last."""
+
+_tokens_ = count()
+
+
+class Observable(Generic[T]):
+    """A value that can be watched for changes."""
+
+    def __init__(self):
+        self._listeners_: dict[int, Listener] = {}
+
+    @property
+    def value(self) -> T:
+        raise NotImplementedError(
+            f"Expected {self.__class__.__name__!r} to implement value"
+        )
+
+    def subscribe(self, listener: Listener) -> Callable[[], None]:
+        """Call `listener()` after the value changes.
+
+        Returns:
+            Callable[[], None]: Removes the listener.
+        """
+        token = next(_tokens_)
+        self._listeners_[token] = listener
+        return lambda: self._listeners_.pop(token, None)
+
+    def _track_(self):
+        if _tracking_:
+            _tracking_[-1].add(self)
+
+    def _notify_(self):
+        for listener in list(self._listeners_.values()):
+            listener()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.value!r})"
+
+
+class State(Observable[T]):
+    """A mutable value. Setting an equal value doesn't notify."""
+
+    def __init__(self, value: T):
+        super().__init__()
+        self._value_ = value
+
+    @property
+    def value(self) -> T:
+        self._track_()
+        return self._value_
+
+    @value.setter
+    def value(self, value: T):
+        if value == self._value_:
+            return
+        self._value_ = value
+        self._notify_()
+
+    def update(self, func: Callable[[T], T]):
+        """Set the value to `func(value)`."""
+        self.value = func(self._value_)
+
+
+class Computed(Observable[T]):
+    """A value derived from other cells with `func`.
+
+    Listeners are notified when a cell it depends on changed. The new value is only
+    computed when read, and listeners aren't notified again until it was. When `func`
+    raises, reading the value raises the same error until a cell it read changes.
+
+    Args:
+        func (Callable[[], T]): Computes the value from the `value` of other cells.
+    """
+
+    def __init__(self, func: Callable[[], T]):
+        super().__init__()
+        self.func = func
+        self._value_: T | None = None
+        self._error_: Exception | None = None
+        self._stale_ = True
+        self._sources_: dict[Observable, Callable[[], None]] = {}
+
+    @property
+    def value(self) -> T:
+        self._track_()
+        if self._stale_:
+            self._evaluate_()
+        if self._error_ is not None:
+            raise self._error_
+        return self._value_
+
+    def _evaluate_(self):
+        read: set[Observable] = set()
+        value, error = None, None
+        _tracking_.append(read)
+        try:
+            value = self.func()
+        except Exception as exc:
+            # Keep listening so a change to what it read retries the computation
+            error = exc
+        finally:
+            _tracking_.pop()
+
+        # Dependencies may differ between evaluations, ex: behind a condition
+        for source in self._sources_.keys() - read:
+            self._sources_.pop(source)()
+        for source in read - self._sources_.keys():
+            self._sources_[source] = source.subscribe(self._invalidate_)
+        self._value_ = value
+        self._error_ = error
+        self._stale_ = False
+
+    def _invalidate_(self):
+        if not self._stale_:
+            self._stale_ = True
+            self._notify_()
+
+    def dispose(self):
+        """Stop listening to the cells it depends on."""
+        for unsubscribe in self._sources_.values():
+            unsubscribe()
+        self._sources_.clear()
+        self._error_ = None
+        self._stale_ = True
@@ -1,4 +1,27 @@
-from dataclasses import dataclass
-from win32con import HS_BDIAGONAL, HS_CROSS, HS_FDIAGONAL, HS_HORIZONTAL, HS_VERTICAL, HS_DIAGCROSS
+from .style import (
+    StyleDict,
+    to_style,
+    parse_background,
+    background_key,
+    DEFAULT,
+    Stylesheet,
+    Styled,
+    INHERIT,
+    INHERITED,
+    PAINT_ONLY,
+    size,
+    box_cache,
+    resolve_box,
+)
+from .computed import ComputedStyle, compile_style, style_key
 
-from .style import StyleDict, to_style, parse_background, DEFAULT, Stylesheet, Styled, size
+_ncss_ = ("Cascade", "NCSSError", "parse_ncss", "load_ncss")
+
+
+def __getattr__(name: str):
+    # The NCSS parser is only loaded when stylesheets are used
+    if name in _ncss_:
+        from . import ncss
+
+        return getattr(ncss, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
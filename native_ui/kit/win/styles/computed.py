@@ -0,0 +1,185 @@
+"""Compiled styles.
+
+`compile_style` validates a `StyleDict` once and resolves it into an immutable
+`ComputedStyle` of plain attributes: `DT_*` draw flags, COLORREF values, brush keys and
+box model specs. Identical style dicts share one compiled instance.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from ..cache import LRUCache
+from ..gdi import GDIKey
+from .style import BoxSpec, StyleDict, background_key, box_spec, str_to_style
+
+_NUMERIC = ("width", "height", "left", "right", "top", "bottom", "gap", "grow", "shrink")
+_KEYWORDS = ("justify", "align", "overflow", "border", "z-order")
+
+
+class ComputedStyle:
+    """Immutable, resolved version of a `StyleDict`.
+
+    Attributes:
+        draw_flags (int): `DT_*` flags for drawing text from justify, align and overflow.
+        color (int): COLORREF of the text color.
+        background (GDIKey | None): `gdi_cache` key of the background brush or None when
+            transparent.
+        border (str | None): The border style if one was given.
+        padding (BoxSpec | None): Padding box spec, see `resolve_box`.
+        margin (BoxSpec | None): Margin box spec, see `resolve_box`.
+        width, height, left, right, top, bottom, gap (int | float | None): Sizes
+            and positions as given. Floats are percentages of the parent.
+        grow (int | float): Share of a container's free space given to the component.
+        shrink (int | float): Weight for taking space when a container overflows.
+        justify (str): Main axis alignment, `start`, `center` or `end`.
+        align (str): Cross axis alignment, `start`, `center` or `end`.
+        overflow (str | None): The overflow style if one was given.
+        z_order (int): `HWND_*` insert after value.
+    """
+
+    __slots__ = (
+        "draw_flags",
+        "color",
+        "background",
+        "border",
+        "padding",
+        "margin",
+        "width",
+        "height",
+        "left",
+        "right",
+        "top",
+        "bottom",
+        "gap",
+        "grow",
+        "shrink",
+        "justify",
+        "align",
+        "overflow",
+        "z_order",
+    )
+
+    draw_flags: int
+    color: int
+    background: GDIKey | None
+    border: str | None
+    padding: BoxSpec | None
+    margin: BoxSpec | None
+    width: int | float | None
+    height: int | float | None
+    left: int | float | None
+    right: int | float | None
+    top: int | float | None
+    bottom: int | float | None
+    gap: int | float | None
+    grow: int | float
+    shrink: int | float
+    justify: str
+    align: str
+    overflow: str | None
+    z_order: int
+
+    def __init__(self, **values: Any):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{self.__class__.__name__}({values})"
+
+
+compiled_styles: LRUCache[tuple, ComputedStyle] = LRUCache(maxsize=1024)
+"""Compiled styles keyed by the style dict's items and their types."""
+
+
+def _typed_(value: Any) -> tuple:
+    # 1 == 1.0 but a float is a percentage, so the type is part of the key
+    if isinstance(value, tuple):
+        return (tuple, tuple(_typed_(item) for item in value))
+    return (type(value), value)
+
+
+def style_key(style: StyleDict) -> tuple:
+    """Hashable key of a style dict that tells `1` and `1.0` apart."""
+    return tuple(sorted((name, _typed_(value)) for name, value in style.items()))
+
+
+def compile_style(style: StyleDict) -> ComputedStyle:
+    """Validate and compile a style dict. Equal style dicts return the same instance.
+
+    Raises:
+        ValueError: When a style value is not valid for its key.
+    """
+    key = style_key(style)
+    try:
+        computed = compiled_styles.get(key)
+    except TypeError as error:
+        raise ValueError(f"Style values must be hashable: {error}") from error
+
+    if computed is None:
+        computed = _compile_(style)
+        compiled_styles[key] = computed
+    return computed
+
+
+def _compile_(style: StyleDict) -> ComputedStyle:
+    from native_ui.kit.win.color import parse_color
+
+    for name in _KEYWORDS:
+        if name in style and style[name] not in str_to_style[name]:
+            raise ValueError(
+                f"Invalid {name!r} style {style[name]!r}, expected one of "
+                + ", ".join(repr(value) for value in str_to_style[name])
+            )
+    for name in _NUMERIC:
+        if name in style and not isinstance(style[name], int | float):
+            raise ValueError(f"Expected {name!r} to be an int or float, was {style[name]!r}")
+
+    padding = box_spec(style.get("padding"))
+    if "padding" in style and padding is None:
+        raise ValueError(f"Invalid padding {style['padding']!r}")
+    margin = box_spec(style.get("margin"))
+    if "margin" in style and margin is None:
+        raise ValueError(f"Invalid margin {style['margin']!r}")
+
+    draw_flags = str_to_style["justify"][style.get("justify", "default")]
+    if "overflow" in style:
+        draw_flags |= str_to_style["overflow"][style["overflow"]]
+    if style.get("overflow") != "break":
+        draw_flags |= str_to_style["align"][style.get("align", "default")]
+
+    try:
+        color = parse_color(style.get("color", "000"))
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"Invalid color {style.get('color')!r}") from error
+
+    background = style.get("background", "transparent")
+    try:
+        background = None if background == "transparent" else background_key(background)
+    except (TypeError, ValueError, KeyError, IndexError) as error:
+        raise ValueError(f"Invalid background {style.get('background')!r}") from error
+
+    return ComputedStyle(
+        draw_flags=draw_flags,
+        color=color,
+        background=background,
+        border=style.get("border"),
+        padding=padding,
+        margin=margin,
+        width=style.get("width"),
+        height=style.get("height"),
+        left=style.get("left"),
+        right=style.get("right"),
+        top=style.get("top"),
+        bottom=style.get("bottom"),
+        gap=style.get("gap"),
+        grow=style.get("grow", 0),
+        shrink=style.get("shrink", 1),
+        justify=style.get("justify", "start"),
+        align=style.get("align", "start"),
+        overflow=style.get("overflow"),
+        z_order=str_to_style["z-order"][style.get("z-order", "default")],
+    )
@@ -0,0 +1,318 @@
+"""Native Cascading Style Sheets (NCSS).
+
+A css based style language that produces the same `StyleDict` values used everywhere
+else, ex:
+
+```css
+/* Comments are allowed */
+window {
+  width: 800px;
+  height: 400px;
+  background: hatch #c3c3c3 tangent
+}
+
+button, .boxed-centered { justify: center; width: 50%; padding: 5 10; }
+```
+
+Selectors are compound simple selectors: a type, any number of `.classes` and an
+optional `#id`, ex: `button.primary#ok`. `Cascade` indexes rules by id, class and type so
+matching a component only looks at rules that could apply to it.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+from ..cache import LRUCache
+from .style import StyleDict, Stylesheet
+
+
+class NCSSError(ValueError):
+    """Invalid NCSS source."""
+
+    def __init__(self, message: str, line: int):
+        super().__init__(f"{message} (line {line})")
+        self.line = line
+
+
+class Selector(NamedTuple):
+    type: str | None
+    classes: frozenset[str]
+    id: str | None
+
+    @property
+    def specificity(self) -> tuple[int, int, int]:
+        return (self.id is not None, len(self.classes), self.type is not None)
+
+    def matches(self, _type: str, classes: frozenset[str], _id: str | None) -> bool:
+        return (
+            (self.type is None or self.type == _type)
+            and (self.id is None or self.id == _id)
+            and self.classes <= classes
+        )
+
+
+class Rule(NamedTuple):
+    selector: Selector
+    style: StyleDict
+    order: int
+
+
+_SELECTOR_ = re.compile(r"([a-zA-Z_][\w-]*|\*)?((?:[.#][a-zA-Z_][\w-]*)*)")
+_PART_ = re.compile(r"([.#])([a-zA-Z_][\w-]*)")
+_NUMBER_ = re.compile(r"^(-?\d+(?:\.\d+)?)(px|%)?$")
+_FACTOR_ = re.compile(r"^\d+(?:\.\d+)?$")
+_RGB_ = re.compile(r"^rgb\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)$")
+_COMMENT_ = re.compile(r"/\*.*?\*/", re.DOTALL)
+
+_NUMERIC = {"width", "height", "left", "right", "top", "bottom", "gap"}
+_FACTORS = {"grow", "shrink"}
+_BOX = {"padding", "margin"}
+_COLORS = {"color"}
+
+
+def parse_selector(source: str, line: int = 0) -> Selector:
+    """Parse a compound selector like `button.primary#ok`."""
+    source = source.strip()
+    match = _SELECTOR_.fullmatch(source)
+    if source == "" or match is None:
+        raise NCSSError(f"Unsupported selector {source!r}", line)
+
+    _type = match.group(1)
+    classes = set()
+    _id = None
+    for kind, name in _PART_.findall(match.group(2)):
+        if kind == ".":
+            classes.add(name)
+        elif _id is not None and _id != name:
+            raise NCSSError(f"Selector {source!r} has more than one id", line)
+        else:
+            _id = name
+    return Selector(None if _type in (None, "*") else _type, frozenset(classes), _id)
+
+
+def _number_(value: str, line: int) -> int | float:
+    match = _NUMBER_.match(value)
+    if match is None:
+        raise NCSSError(f"Expected a number, px or % value, was {value!r}", line)
+    number, unit = match.groups()
+    if unit == "%":
+        return float(number) / 100
+    if "." in number:
+        raise NCSSError(f"Pixel values must be whole numbers, was {value!r}", line)
+    return int(number)
+
+
+def _factor_(value: str, line: int) -> int | float:
+    # Flex weights are unitless, a fraction is a weight and not a percentage
+    if _FACTOR_.match(value) is None:
+        raise NCSSError(f"Expected a unitless positive number, was {value!r}", line)
+    return float(value) if "." in value else int(value)
+
+
+def _color_(value: str, line: int) -> str | tuple[int, int, int]:
+    match = _RGB_.match(value)
+    if match is not None:
+        return tuple(int(channel) for channel in match.groups())
+    if value.startswith("rgb("):
+        raise NCSSError(f"Invalid rgb color {value!r}", line)
+    return value.lstrip("#")
+
+
+def parse_value(name: str, value: str, line: int = 0):
+    """Convert the text of a declaration into its `StyleDict` value."""
+    if name in _NUMERIC:
+        return _number_(value, line)
+    if name in _FACTORS:
+        return _factor_(value, line)
+    if name in _BOX:
+        parts = [_number_(part, line) for part in value.split()]
+        if not 1 <= len(parts) <= 4:
+            raise NCSSError(f"Expected 1 to 4 {name} values, was {value!r}", line)
+        return parts[0] if len(parts) == 1 else tuple(parts)
+    if name in _COLORS:
+        return _color_(value, line)
+    if name == "background":
+        if value == "transparent":
+            return value
+        if value.startswith("rgb("):
+            return _color_(value, line)
+        parts = value.split()
+        if parts[0] in ("solid", "hatch"):
+            if len(parts) not in (2, 3) or (parts[0] == "solid" and len(parts) != 2):
+                raise NCSSError(f"Invalid background {value!r}", line)
+            return (parts[0], _color_(parts[1], line), *parts[2:])
+        if len(parts) != 1:
+            raise NCSSError(f"Invalid background {value!r}", line)
+        return _color_(value, line)
+    return value
+
+
+def _parse_(source: str) -> tuple[Rule, ...]:
+    rules = []
+    text = _COMMENT_.sub(lambda m: "\n" * m.group(0).count("\n"), source)
+    position = 0
+    while True:
+        start = text.find("{", position)
+        if start == -1:
+            if text[position:].strip() != "":
+                line = text.count("\n", 0, position) + 1
+                raise NCSSError("Expected '{' after selector", line)
+            break
+        end = text.find("}", start)
+        line = text.count("\n", 0, start) + 1
+        if end == -1:
+            raise NCSSError("Missing closing '}'", line)
+        if "}" in text[position:start]:
+            raise NCSSError("Unexpected '}'", line)
+
+        selectors = [
+            parse_selector(selector, line) for selector in text[position:start].split(",")
+        ]
+
+        style = {}
+        offset = start
+        for declaration in text[start + 1 : end].split(";"):
+            decl_line = text.count("\n", 0, offset) + 1
+            offset += len(declaration) + 1
+            if declaration.strip() == "":
+                continue
+            name, colon, value = declaration.partition(":")
+            name, value = name.strip(), value.strip()
+            if colon == "" or name == "" or value == "":
+                raise NCSSError(f"Invalid declaration {declaration.strip()!r}", decl_line)
+            style[name] = parse_value(name, value, decl_line)
+
+        for selector in selectors:
+            rules.append(Rule(selector, style, len(rules)))
+        position = end + 1
+    return tuple(rules)
+
+
+_parsed_: LRUCache[bytes, tuple[Rule, ...]] = LRUCache(maxsize=64)
+
+
+def parse_rules(source: str) -> tuple[Rule, ...]:
+    """Parse NCSS source into rules. Results are cached by the source's content hash
+    so a shared theme is only parsed once per process.
+
+    Raises:
+        NCSSError: When the source is not valid NCSS.
+    """
+    key = hashlib.blake2b(source.encode(), digest_size=16).digest()
+    rules = _parsed_.get(key)
+    if rules is None:
+        rules = _parse_(source)
+        _parsed_[key] = rules
+    return rules
+
+
+def parse_ncss(source: str) -> Stylesheet:
+    """Parse NCSS source into a `Stylesheet` of selector to `StyleDict`. Repeated
+    selectors are merged in source order.
+    """
+    sheet: Stylesheet = {}
+    for rule in parse_rules(source):
+        key = _selector_text_(rule.selector)
+        sheet[key] = {**sheet.get(key, {}), **rule.style}
+    return sheet
+
+
+def load_ncss(path: str | Path) -> Stylesheet:
+    """Parse a `.ncss` file into a `Stylesheet`."""
+    return parse_ncss(Path(path).read_text(encoding="utf-8"))
+
+
+def _selector_text_(selector: Selector) -> str:
+    text = selector.type or ("" if selector.classes or selector.id else "*")
+    text += "".join(f".{name}" for name in sorted(selector.classes))
+    if selector.id is not None:
+        text += f"#{selector.id}"
+    return text
+
+
+class Cascade:
+    """Matches components against stylesheets.
+
+    Rules are indexed under their most specific part (id, then a class, then type) so
+    a match only checks the rules that could apply. Later sheets and rules win over
+    earlier ones of the same specificity.
+
+    Args:
+        *sheets (str | Stylesheet): NCSS source or `Stylesheet` dicts in cascade order.
+    """
+
+    def __init__(self, *sheets: str | Stylesheet):
+        self._ids_: dict[str, list[Rule]] = {}
+        self._classes_: dict[str, list[Rule]] = {}
+        self._types_: dict[str, list[Rule]] = {}
+        self._universal_: list[Rule] = []
+        self._matches_: LRUCache[tuple, StyleDict] = LRUCache(maxsize=1024)
+        self._count_ = 0
+        for sheet in sheets:
+            self.add(sheet)
+
+    def __len__(self) -> int:
+        return self._count_
+
+    def add(self, sheet: str | Stylesheet):
+        """Add a sheet after every sheet already in the cascade."""
+        if isinstance(sheet, str):
+            rules = [(rule.selector, rule.style) for rule in parse_rules(sheet)]
+        else:
+            rules = [(parse_selector(key), style) for key, style in sheet.items()]
+
+        for selector, style in rules:
+            rule = Rule(selector, style, self._count_)
+            self._count_ += 1
+            if selector.id is not None:
+                self._ids_.setdefault(selector.id, []).append(rule)
+            elif selector.classes:
+                name = min(selector.classes)
+                self._classes_.setdefault(name, []).append(rule)
+            elif selector.type is not None:
+                self._types_.setdefault(selector.type, []).append(rule)
+            else:
+                self._universal_.append(rule)
+        self._matches_.clear()
+
+    def rules(
+        self, _type: str, classes: Iterable[str] = (), _id: str | None = None
+    ) -> list[Rule]:
+        """Get the rules matching a component in cascade order."""
+        classes = frozenset(classes)
+        candidates = [*self._universal_, *self._types_.get(_type, ())]
+        for name in classes:
+            candidates.extend(self._classes_.get(name, ()))
+        if _id is not None:
+            candidates.extend(self._ids_.get(_id, ()))
+
+        matched = [
+            rule for rule in candidates if rule.selector.matches(_type, classes, _id)
+        ]
+        matched.sort(key=lambda rule: (rule.selector.specificity, rule.order))
+        return matched
+
+    def match(
+        self, _type: str, classes: Iterable[str] = (), _id: str | None = None
+    ) -> StyleDict:
+        """Get the cascaded style for a component of a type with classes and an id.
+
+        Args:
+            _type (str): The component type, ex: `button`, `text` or `window`.
+            classes (Iterable[str]): The component's classes.
+            _id (str | None): The component's id.
+
+        Returns:
+            StyleDict: A new dict of the merged declarations.
+        """
+        key = (_type, frozenset(classes), _id)
+        style = self._matches_.get(key)
+        if style is None:
+            style = {}
+            for rule in self.rules(*key):
+                style.update(rule.style)
+            self._matches_[key] = style
+        return dict(style)
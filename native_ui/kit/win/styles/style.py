@@ -1,7 +1,11 @@
-from functools import cache
-from typing import Any, Literal, TypeAlias, TypedDict
+from __future__ import annotations
 
+from typing import Any, Callable, Literal, TypeAlias, TypedDict
+from weakref import WeakSet
+
+from ..cache import LRUCache
 from ..data import Rect
+from ..gdi import GDIKey, hatch_key, solid_key
 
 from win32con import (
     DT_BOTTOM,
@@ -29,6 +33,7 @@ from win32con import (
 
 BrushType: TypeAlias = Literal["solid", "hatch"]
 BrushColor: TypeAlias = tuple[int, int, int] | str
+"""A (r, g, b) tuple, hex string, CSS color name or `rgb()`."""
 BrushPattern: TypeAlias = Literal[
     "dcross", "cross", "vertical", "horizontal", "tangent", "diagnol"
 ]
@@ -53,7 +58,7 @@ class Default:
 DEFAULT = Default()
 
 str_to_style = {
-    "border": {"single": WS_BORDER, "thick": WS_THICKFRAME, "default": 0},
+    "border": {"none": 0, "single": WS_BORDER, "thick": WS_THICKFRAME, "default": 0},
     "justify": {
         "start": DT_LEFT,
         "center": DT_CENTER,
@@ -90,32 +95,41 @@ def to_style(key, value):
         if value == DEFAULT:
             return str_to_style[key]["default"]
         return str_to_style[key][value]
-    except:
+    except (KeyError, TypeError):
         return 0
 
 
-def parse_background(bkg: Brush):
-    from native_ui.kit.win.color import brush, RGB, HEX
+def background_key(bkg: Brush) -> GDIKey:
+    """Get the `gdi_cache` key for a background brush style."""
+    from native_ui.kit.win.color import parse_color
 
     if bkg == DEFAULT:
-        return brush("solid", HEX("FFF"))
+        return solid_key(parse_color("FFF"))
 
     if isinstance(bkg, str):
-        return brush("solid", HEX(bkg))
+        return solid_key(parse_color(bkg))
     elif isinstance(bkg[0], int):
-        return brush("solid", RGB(*bkg))
+        return solid_key(parse_color(bkg))
     else:
         # type color pattern
         _type, color = bkg[:2]
+        color = parse_color(color)
+        if _type == "solid":
+            return solid_key(color)
+
         pattern = "dcross"
         if len(bkg) > 2:
             pattern = bkg[2]
+        return hatch_key(color, hatch_pattern[pattern])
 
-        return brush(
-            _type,
-            HEX(color) if isinstance(color, str) else RGB(*color),
-            hatch_pattern[pattern],
-        )
+
+def parse_background(bkg: Brush):
+    """Create a new brush from a background style. The caller owns the brush, use
+    `background_key` with `gdi_cache` for a shared brush.
+    """
+    from native_ui.kit.win.color import brush
+
+    return brush(*background_key(bkg))
 
 
 StyleDict = TypedDict(
@@ -124,6 +138,8 @@ StyleDict = TypedDict(
         "align": Literal["start", "center", "end"],
         "justify": Literal["start", "center", "end"],
         "gap": int,
+        "grow": int | float,
+        "shrink": int | float,
         "padding": int
         | tuple[int, int]
         | tuple[int, int, int]
@@ -154,101 +170,195 @@ left = int
 right = int
 bottom = int
 
+BoxSpec: TypeAlias = tuple[int | float, int | float, int | float, int | float, int]
+"""Expanded padding or margin: (top, right, bottom, left, float_mask). The mask keeps
+`1` and `1.0` from sharing resolved results since they compare equal.
+"""
+
+box_cache: LRUCache[tuple[BoxSpec, int, int], tuple[int, int, int, int]] = LRUCache(
+    maxsize=1024
+)
+"""Resolved padding and margin boxes keyed by box spec and parent (width, height)."""
+
+
+def box_spec(value) -> BoxSpec | None:
+    """Expand a css style padding or margin value into a hashable box spec."""
+    if value is None:
+        return None
+
+    if isinstance(value, tuple):
+        # top right bottom left
+        if len(value) == 2:
+            spec = (value[0], value[1], value[0], value[1])
+        elif len(value) == 3:
+            spec = (value[0], value[1], value[2], value[1])
+        elif len(value) == 4:
+            spec = tuple(value)
+        else:
+            return None
+    else:
+        spec = (value, value, value, value)
+
+    mask = 0
+    for i, side in enumerate(spec):
+        if isinstance(side, float):
+            mask |= 1 << i
+    return (*spec, mask)
+
+
+def resolve_box(spec: BoxSpec | None, parent: Rect) -> tuple[top, right, bottom, left]:
+    """Resolve a box spec against the parent's size using the shared `box_cache`."""
+    if spec is None:
+        return (0, 0, 0, 0)
+
+    key = (spec, parent.width, parent.height)
+    box = box_cache.get(key)
+    if box is None:
+        box = (
+            size(spec[0], parent.height),
+            size(spec[1], parent.width),
+            size(spec[2], parent.height),
+            size(spec[3], parent.width),
+        )
+        box_cache[key] = box
+    return box
+
+
+INHERITED = frozenset({"color"})
+"""Properties taken from the parent's style unless set locally. Layout properties are
+never inherited implicitly, ex: `justify` is also a container's main axis alignment and
+would move the children of every nested container.
+"""
+
+INHERIT = "inherit"
+"""Style value taking any property from the parent, ex: `{"background": "inherit"}`."""
+
+PAINT_ONLY = frozenset({"color", "background"})
+"""Properties that change how a component is drawn but not its layout."""
+
+_MISSING_ = object()
+
 
 class Styled:
-    def __init__(self, style: StyleDict):
+    """A style dict with its validated `ComputedStyle`.
+
+    Styles form a tree following the components. A node resolves its own declarations
+    with the values it inherits from its parent once, the result is kept in `resolved`
+    and `computed` until the node or an ancestor changes. A change only walks into the
+    children inheriting one of the changed properties and `on_change` is called for
+    every node whose resolved style actually changed.
+
+    Args:
+        style (StyleDict): The node's own declarations.
+        parent (Styled | None): Style to inherit from.
+
+    Raises:
+        ValueError: When a style value is not valid for its key.
+    """
+
+    def __init__(self, style: StyleDict, parent: Styled | None = None):
+        from .computed import compile_style
+
         self.style = style
+        self.parent: Styled | None = None
+        self.on_change: Callable[[frozenset[str]], Any] | None = None
+        self._children_: WeakSet[Styled] | None = None
+        self.resolved = self._resolve_()
+        self.computed = compile_style(self.resolved)
+        if parent is not None:
+            self.inherit(parent)
+
+    def _resolve_(self) -> StyleDict:
+        own = self.style
+        parent = self.parent.resolved if self.parent is not None else {}
+        if not parent and INHERIT not in own.values():
+            return own
+
+        resolved = {}
+        for key, value in own.items():
+            if value == INHERIT:
+                if key in parent:
+                    resolved[key] = parent[key]
+            else:
+                resolved[key] = value
+        for key in INHERITED:
+            if key not in own and key in parent:
+                resolved[key] = parent[key]
+        return resolved
+
+    def inherits(self, changed: frozenset[str]) -> bool:
+        """Whether a change of these properties in the parent affects this node."""
+        for key in changed:
+            value = self.style.get(key, _MISSING_)
+            if value == INHERIT or (value is _MISSING_ and key in INHERITED):
+                return True
+        return False
+
+    def inherit(self, parent: Styled | None):
+        """Move the node under another parent style, or detach it with None."""
+        if parent is self.parent:
+            return
+        if self.parent is not None:
+            self.parent._children_.discard(self)
+        self.parent = parent
+        if parent is not None:
+            if parent._children_ is None:
+                parent._children_ = WeakSet()
+            parent._children_.add(self)
+        self._refresh_()
+
+    def set(self, style: StyleDict):
+        """Replace the node's own declarations and update the nodes inheriting them.
+
+        Raises:
+            ValueError: When a style value is not valid for its key. Nothing is changed.
+        """
+        previous = self.style
+        self.style = style
+        try:
+            self._refresh_()
+        except ValueError:
+            self.style = previous
+            raise
+
+    def _refresh_(self):
+        from .computed import _typed_, compile_style
+
+        resolved = self._resolve_()
+        old = self.resolved
+        changed = frozenset(
+            key
+            for key in old.keys() | resolved.keys()
+            if _typed_(old.get(key, _MISSING_)) != _typed_(resolved.get(key, _MISSING_))
+        )
+        if not changed:
+            return
+
+        self.computed = compile_style(resolved)
+        self.resolved = resolved
+        if self.on_change is not None:
+            self.on_change(changed)
+        if self._children_:
+            for child in list(self._children_):
+                if child.inherits(changed):
+                    child._refresh_()
 
     def __getitem__(self, key: str):
-        return self.style[key]
+        return self.resolved[key]
 
     def __contains__(self, key: str) -> bool:
-        return key in self.style
+        return key in self.resolved
 
     def get(self, key, default: Any = ...):
         if default == ...:
-            return self.style.get(key)
-        return self.style.get(key, default)
+            return self.resolved.get(key)
+        return self.resolved.get(key, default)
 
-    @cache
     def padding(self, parent: Rect) -> tuple[top, right, bottom, left]:
-        if "padding" not in self.style:
-            return (0, 0, 0, 0)
-
-        if isinstance(self.style["padding"], tuple):
-            # top right bottom left
-            p = self.style["padding"]
-            if len(p) == 2:
-                return (
-                    size(p[0] or 0, parent.height),
-                    size(p[1] or 0, parent.width),
-                    size(p[0], parent.height),
-                    size(p[1], parent.width),
-                )
-            if len(p) == 3:
-                return (
-                    size(p[0], parent.height),
-                    size(p[1], parent.width),
-                    size(p[2], parent.height),
-                    size(p[1], parent.width),
-                )
-            if len(p) == 4:
-                return (
-                    size(p[0], parent.height),
-                    size(p[1], parent.width),
-                    size(p[2], parent.height),
-                    size(p[3], parent.width),
-                )
-        else:
-            p = self.style["padding"]
-            return (
-                size(p, parent.height),
-                size(p, parent.width),
-                size(p, parent.height),
-                size(p, parent.width),
-            )
+        return resolve_box(self.computed.padding, parent)
 
-        return (0, 0, 0, 0)
-
-    @cache
     def margin(self, parent: Rect) -> tuple[top, right, bottom, left]:
-        if "margin" not in self.style:
-            return (0, 0, 0, 0)
-
-        if isinstance(self.style["margin"], tuple):
-            # top right bottom left
-            p = self.style["margin"]
-            if len(p) == 2:
-                return (
-                    size(p[0], parent.height),
-                    size(p[1], parent.width),
-                    size(p[0], parent.height),
-                    size(p[1], parent.width),
-                )
-            if len(p) == 3:
-                return (
-                    size(p[0], parent.height),
-                    size(p[1], parent.width),
-                    size(p[2], parent.height),
-                    size(p[1], parent.width),
-                )
-            if len(p) == 4:
-                return (
-                    size(p[0], parent.height),
-                    size(p[1], parent.width),
-                    size(p[2], parent.height),
-                    size(p[3], parent.width),
-                )
-        else:
-            p = self.style["margin"]
-            return (
-                size(p, parent.height),
-                size(p, parent.width),
-                size(p, parent.height),
-                size(p, parent.width),
-            )
-
-        return (0, 0, 0, 0)
+        return resolve_box(self.computed.margin, parent)
 
 
 def size(value, parent: int) -> int:
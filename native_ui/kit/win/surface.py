@@ -0,0 +1,263 @@
+"""Off-screen surfaces.
+
+Painting straight to a window DC shows every step on screen, ex: the background being
+erased before the content is drawn over it, which flickers while resizing. Windows and
+components draw into a `Surface` instead, a bitmap selected into a memory DC, and copy
+the finished result to the screen with one `BitBlt`.
+
+A surface remembers the key of the inputs it was last rendered from, ex: the text,
+compiled style and size of a component. Painting again with the same key skips drawing
+and only copies, so windows uncovered or invalidated by a neighbour's damage cost a
+single blit. Bitmaps are allocated in steps of `GROWTH` pixels and only reallocated
+when they have to grow, so resizing doesn't recreate them for every new size.
+
+`SurfaceCache` shares rendered surfaces between components by key, ex: rows of a list
+showing the same text, within a memory budget. `surface_cache` is the process wide
+instance used for text.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple
+
+from win32con import SRCCOPY
+from win32gui import (
+    BitBlt,
+    CreateCompatibleBitmap,
+    CreateCompatibleDC,
+    DeleteDC,
+    DeleteObject,
+    SelectObject,
+)
+
+from .data import Bounds
+from .metrics import metrics
+
+GROWTH = 64
+"""Surfaces are allocated in multiples of this many pixels."""
+
+BYTES_PER_PIXEL = 4
+"""Assumed depth of surfaces compatible with the screen when estimating memory."""
+
+_rendered_ = metrics.counter("surface.rendered")
+_reused_ = metrics.counter("surface.reused")
+
+
+def _round_up_(value: int, growth: int) -> int:
+    return -(-max(value, 1) // growth) * growth
+
+
+class Surface:
+    """Bitmap in a memory DC holding what was last rendered into it.
+
+    Attributes:
+        hdc (int): The memory DC, 0 until the surface is first rendered.
+        size (tuple[int, int]): Allocated width and height, may be larger than what was
+            requested.
+        key (Hashable | None): Key of the rendered content, None when it is stale.
+
+    Args:
+        growth (int): Allocated sizes are rounded up to multiples of this many pixels.
+    """
+
+    def __init__(self, growth: int = GROWTH):
+        self.growth = growth
+        self.hdc = 0
+        self.size = (0, 0)
+        self.key: Hashable | None = None
+        self._bitmap_ = 0
+        self._old_ = 0
+
+    def reserve(self, reference: int, width: int, height: int) -> bool:
+        """Make sure the surface is at least `width` x `height`.
+
+        Args:
+            reference (int): DC the surface has to be compatible with, ex: the DC
+                returned by `BeginPaint`.
+
+        Returns:
+            bool: Whether the bitmap was reallocated, which discards its content.
+        """
+        if self.hdc != 0 and width <= self.size[0] and height <= self.size[1]:
+            return False
+        size = (
+            _round_up_(max(width, self.size[0]), self.growth),
+            _round_up_(max(height, self.size[1]), self.growth),
+        )
+        self.release()
+        self.hdc = CreateCompatibleDC(reference)
+        self._bitmap_ = CreateCompatibleBitmap(reference, *size)
+        self._old_ = SelectObject(self.hdc, self._bitmap_)
+        self.size = size
+        return True
+
+    def render(
+        self,
+        reference: int,
+        width: int,
+        height: int,
+        key: Hashable,
+        draw: Callable[[int], Any],
+    ) -> bool:
+        """Draw into the surface unless it already holds the content for `key`.
+
+        Args:
+            reference (int): DC the surface has to be compatible with.
+            width (int): Min width needed.
+            height (int): Min height needed.
+            key (Hashable): Identifies every input of `draw`.
+            draw (Callable[[int], Any]): Called with the memory DC to draw the content.
+
+        Returns:
+            bool: Whether `draw` was called.
+        """
+        if not self.reserve(reference, width, height) and key == self.key:
+            if metrics.enabled:
+                _reused_.inc()
+            return False
+        # Left stale if drawing fails
+        self.key = None
+        draw(self.hdc)
+        self.key = key
+        if metrics.enabled:
+            _rendered_.inc()
+        return True
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated memory held by the bitmap."""
+        return self.size[0] * self.size[1] * BYTES_PER_PIXEL
+
+    def blit(self, hdc: int, dest: Bounds, source: tuple[int, int] | None = None):
+        """Copy part of the surface to a DC.
+
+        Args:
+            hdc (int): DC to copy to.
+            dest (Bounds): Area of the DC to fill.
+            source (tuple[int, int] | None): Top left corner of the copied area in the
+                surface. Defaults to the top left of `dest`.
+        """
+        left, top, right, bottom = dest
+        x, y = (left, top) if source is None else source
+        BitBlt(hdc, left, top, right - left, bottom - top, self.hdc, x, y, SRCCOPY)
+
+    def invalidate(self):
+        """Forget the rendered key so the next `render` draws again."""
+        self.key = None
+
+    def release(self):
+        """Delete the native bitmap and DC."""
+        if self.hdc != 0:
+            SelectObject(self.hdc, self._old_)
+            DeleteObject(self._bitmap_)
+            DeleteDC(self.hdc)
+        self.hdc = 0
+        self._bitmap_ = 0
+        self._old_ = 0
+        self.size = (0, 0)
+        self.key = None
+
+
+class SurfaceCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    entries: int
+    bytes: int
+    budget: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class SurfaceCache:
+    """Rendered surfaces shared by key. Least recently used surfaces are released once
+    the cache holds more than `budget` bytes or `max_entries` surfaces.
+
+    Args:
+        budget (int): Max estimated bytes held by the cached bitmaps.
+        max_entries (int): Max number of surfaces. Every surface holds a DC and a
+            bitmap, which count towards the process' GDI object limit.
+    """
+
+    def __init__(self, budget: int = 16 * 1024 * 1024, max_entries: int = 1024):
+        self.budget = budget
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._entries_: OrderedDict[Hashable, Surface] = OrderedDict()
+
+    def render(
+        self,
+        reference: int,
+        width: int,
+        height: int,
+        key: Hashable,
+        draw: Callable[[int], Any],
+    ) -> Surface:
+        """Get the surface rendered for `key`, drawing a new one with `draw` if it isn't
+        cached. The surface may be released by a later call, blit it right away.
+
+        Args:
+            reference (int): DC the surface has to be compatible with.
+            width (int): Width of the rendered content.
+            height (int): Height of the rendered content.
+            key (Hashable): Identifies every input of `draw`, including the size.
+            draw (Callable[[int], Any]): Called with the memory DC to draw the content.
+        """
+        surface = self._entries_.get(key)
+        if surface is not None:
+            self._entries_.move_to_end(key)
+            self.hits += 1
+            if metrics.enabled:
+                _reused_.inc()
+            return surface
+
+        self.misses += 1
+        surface = Surface(growth=1)
+        try:
+            surface.render(reference, width, height, key, draw)
+        except BaseException:
+            surface.release()
+            raise
+        self._entries_[key] = surface
+        self.bytes += surface.nbytes
+        # Keep the new surface even if it alone is over budget
+        while len(self._entries_) > 1 and (
+            self.bytes > self.budget or len(self._entries_) > self.max_entries
+        ):
+            self._evict_()
+        return surface
+
+    def _evict_(self):
+        _, surface = self._entries_.popitem(last=False)
+        self.bytes -= surface.nbytes
+        surface.release()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries_
+
+    def __len__(self) -> int:
+        return len(self._entries_)
+
+    def clear(self):
+        """Release every surface and reset the counters."""
+        while self._entries_:
+            self._evict_()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> SurfaceCacheInfo:
+        return SurfaceCacheInfo(
+            self.hits, self.misses, len(self._entries_), self.bytes, self.budget
+        )
+
+
+surface_cache = SurfaceCache()
+"""Process wide cache of rendered text surfaces."""
+
+metrics.gauge("surface_cache.bytes", lambda: surface_cache.bytes)
+metrics.gauge("surface_cache.entries", surface_cache.__len__)
+metrics.gauge("surface_cache.hit_rate", lambda: surface_cache.info().hit_rate)
@@ -0,0 +1,294 @@
+"""Declarative component trees.
+
+A render function describes what a window or container should contain with lightweight
+elements, ex:
+
+```python
+def render():
+    return [
+        Text(title.value, key="title"),
+        VBox(*(Text(row.name, key=row.id) for row in rows.value), key="rows"),
+    ]
+
+window.View(render)
+```
+
+`View` owns the children of its host and reconciles every new tree against the previous
+one. Children are matched by `key`, or by position when they have none, and only the
+differences reach the native windows: new elements are created, missing ones destroyed,
+changed text and styles are assigned to the existing component, and siblings that flow
+after a different component than before are laid out again. Refreshing a long list
+after a data change therefore costs native calls for the rows that changed only.
+
+Render functions can read `State` and `Computed` cells, the view refreshes once per
+drain after any of them changed.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Callable, Hashable, Iterable, Sequence
+
+from .component import Button as ButtonComponent
+from .component import Component
+from .component import Text as TextComponent
+from .layout import Dirty
+from .state import Computed
+from .styles import StyleDict, style_key
+
+Children = Iterable["Element | Iterable | None"]
+Render = Callable[[], "Element | Children"]
+
+
+class Element:
+    """Description of a component. Create them with `Text`, `Button`, `VBox` and
+    `HBox`.
+    """
+
+    __slots__ = ("kind", "text", "style", "key", "children")
+
+    def __init__(
+        self,
+        kind: str,
+        text: str | None = None,
+        style: StyleDict | None = None,
+        key: Hashable | None = None,
+        children: tuple[Element, ...] = (),
+    ):
+        self.kind = kind
+        self.text = text
+        self.style = style or {}
+        self.key = key
+        self.children = children
+
+    def __repr__(self) -> str:
+        key = "" if self.key is None else f", key={self.key!r}"
+        if self.text is not None:
+            return f"{self.kind}({self.text!r}{key})"
+        return f"{self.kind}({len(self.children)} children{key})"
+
+
+def flatten(children: Children) -> tuple[Element, ...]:
+    """Flatten nested lists of elements, skipping None, ex: from conditional parts."""
+    result = []
+    for child in children:
+        if child is None:
+            continue
+        if isinstance(child, Element):
+            result.append(child)
+        else:
+            result.extend(flatten(child))
+    return tuple(result)
+
+
+def Text(text: str, style: StyleDict | None = None, key: Hashable | None = None) -> Element:
+    return Element("text", text, style, key)
+
+
+def Button(
+    text: str, style: StyleDict | None = None, key: Hashable | None = None
+) -> Element:
+    return Element("button", text, style, key)
+
+
+def VBox(
+    *children: Element | Iterable | None,
+    style: StyleDict | None = None,
+    key: Hashable | None = None,
+) -> Element:
+    return Element("vbox", None, style, key, flatten(children))
+
+
+def HBox(
+    *children: Element | Iterable | None,
+    style: StyleDict | None = None,
+    key: Hashable | None = None,
+) -> Element:
+    return Element("hbox", None, style, key, flatten(children))
+
+
+class Mounted:
+    """An element and the component created for it."""
+
+    __slots__ = ("element", "component", "children")
+
+    def __init__(self, element: Element, component: Component):
+        self.element = element
+        self.component = component
+        self.children: list[Mounted] = []
+
+
+def _create_component_(host, element: Element) -> Component:
+    if element.kind == "text":
+        return TextComponent(host, element.text, element.style)
+    if element.kind == "button":
+        return ButtonComponent(host, element.text, element.style)
+
+    from .container import HBox, VBox
+
+    if element.kind == "vbox":
+        return VBox(style=element.style, parent=host)
+    if element.kind == "hbox":
+        return HBox(style=element.style, parent=host)
+    raise ValueError(f"Unknown element kind {element.kind!r}")
+
+
+def _check_keys_(elements: Sequence[Element]):
+    """Raise for duplicate keys among siblings anywhere in the tree."""
+    seen = set()
+    for element in elements:
+        if element.key is not None:
+            if element.key in seen:
+                raise ValueError(f"Duplicate element key {element.key!r}")
+            seen.add(element.key)
+        if element.children:
+            _check_keys_(element.children)
+
+
+def _key_(element: Element, index: int) -> tuple:
+    if element.key is None:
+        return (False, index)
+    return (True, element.key)
+
+
+def _window_(host):
+    while isinstance(host, Component):
+        host = host.parent
+    return host
+
+
+class View:
+    """Keeps the children of a window or container in sync with a render function.
+
+    The view owns every child of its host. `operations` counts what the last refresh
+    did: `create`, `destroy`, `retext`, `restyle` and `move`, the kept components
+    that flow after a different sibling than before, ex: the row after a deleted one.
+
+    Args:
+        host: The window or container to render into.
+        render (Render): Returns the elements to show, a single element or an
+            iterable of them.
+    """
+
+    def __init__(self, host, render: Render):
+        self.host = host
+        self.render = render
+        self.mounted: list[Mounted] = []
+        self.operations: Counter[str] = Counter()
+        self._tree_ = Computed(render)
+        self._queued_ = False
+        self._unsubscribe_ = self._tree_.subscribe(self._changed_)
+        self.refresh()
+
+    def _changed_(self):
+        if not self._queued_:
+            self._queued_ = self.host.post(self.refresh)
+
+    def refresh(self):
+        """Render again and apply the differences to the host's children.
+
+        Raises:
+            ValueError: When siblings share a key. The children are left unchanged and
+                the view refreshes again after the next change.
+        """
+        self._queued_ = False
+        tree = self._tree_.value
+        elements = (tree,) if isinstance(tree, Element) else flatten(tree)
+        # Validate the whole tree first so a bad key can't leave half created children
+        _check_keys_(elements)
+
+        self.operations.clear()
+        window = _window_(self.host)
+        with window.positions.batch():
+            self.mounted = self._reconcile_(
+                self.host, self.mounted, elements, self.host.opened
+            )
+            window.update()
+
+    def close(self):
+        """Stop refreshing and destroy every child created by the view."""
+        self._unsubscribe_()
+        self._tree_.dispose()
+        for mounted in self.mounted:
+            self.host.remove(mounted.component)
+        self.mounted = []
+
+    def _reconcile_(
+        self,
+        host,
+        old: list[Mounted],
+        elements: Sequence[Element],
+        live: bool,
+    ) -> list[Mounted]:
+        """Match the elements with the previously mounted ones and patch, create or
+        destroy components so `host.children` matches the elements.
+
+        Args:
+            live (bool): Whether new components need their native windows right away.
+                False for the children of a new container, which creates them itself.
+        """
+        previous = {}
+        for index, mounted in enumerate(old):
+            previous[_key_(mounted.element, index)] = mounted
+        # Destroying a child removes it from the host, keep the order from before
+        before = list(host.children)
+
+        result = []
+        for index, element in enumerate(elements):
+            key = _key_(element, index)
+            mounted = previous.pop(key, None)
+            if mounted is not None and mounted.element.kind == element.kind:
+                self._patch_(mounted, element)
+            else:
+                if mounted is not None:
+                    self._destroy_(host, mounted)
+                mounted = self._create_(host, element, live)
+            result.append(mounted)
+
+        for mounted in previous.values():
+            self._destroy_(host, mounted)
+
+        children = [mounted.component for mounted in result]
+        if children != before:
+            flowed_after = {}
+            for index, child in enumerate(before):
+                flowed_after[child] = before[index - 1] if index > 0 else None
+            host.children[:] = children
+            for index, child in enumerate(children):
+                flows_after = children[index - 1] if index > 0 else None
+                if child not in flowed_after:
+                    host.invalidate_child(child, Dirty.STYLE | Dirty.TEXT)
+                elif flowed_after[child] is not flows_after:
+                    self.operations["move"] += 1
+                    host.invalidate_child(child, Dirty.PREVIOUS)
+        return result
+
+    def _patch_(self, mounted: Mounted, element: Element):
+        old = mounted.element
+        component = mounted.component
+        if element.text != old.text:
+            self.operations["retext"] += 1
+            component.text = element.text
+        if style_key(element.style) != style_key(old.style):
+            self.operations["restyle"] += 1
+            component.style = element.style
+        if element.children or old.children:
+            mounted.children = self._reconcile_(
+                component, mounted.children, element.children, True
+            )
+        mounted.element = element
+
+    def _create_(self, host, element: Element, live: bool) -> Mounted:
+        self.operations["create"] += 1
+        mounted = Mounted(element, _create_component_(host, element))
+        if element.children:
+            mounted.children = self._reconcile_(
+                mounted.component, [], element.children, False
+            )
+        if live:
+            # Containers create the native windows of their children
+            mounted.component.init()
+        return mounted
+
+    def _destroy_(self, host, mounted: Mounted):
+        self.operations["destroy"] += 1
+        host.remove(mounted.component)
@@ -0,0 +1,324 @@
+"""Virtualized list.
+
+`VirtualList` only creates native rows for what is visible in its viewport plus a small
+overscan. Rows scrolled out of view are recycled for the rows scrolled into view, so
+memory and native window count depend on the viewport height instead of the row count.
+"""
+from __future__ import annotations
+
+from typing import Callable
+
+from win32api import GetWindowLong
+from win32con import (
+    GWL_HINSTANCE,
+    SB_BOTTOM,
+    SB_LINEDOWN,
+    SB_LINEUP,
+    SB_PAGEDOWN,
+    SB_PAGEUP,
+    SB_THUMBPOSITION,
+    SB_THUMBTRACK,
+    SB_TOP,
+    SB_VERT,
+    SIF_PAGE,
+    SIF_POS,
+    SIF_RANGE,
+    SIF_TRACKPOS,
+    SW_HIDE,
+    SW_SHOW,
+    WM_DESTROY,
+    WM_MOUSEWHEEL,
+    WM_VSCROLL,
+    WS_CHILD,
+    WS_CLIPCHILDREN,
+    WS_VISIBLE,
+    WS_VSCROLL,
+)
+from win32gui import (
+    CreateWindow,
+    DefWindowProc,
+    GetScrollInfo,
+    HIWORD,
+    LOWORD,
+    SetScrollInfo,
+    ShowWindow,
+)
+
+from .component import Component, flow_rect
+from .data import Bounds, Rect
+from .dispatch import dispatcher
+from .layout import Dirty
+from .metrics import metrics
+from .styles import StyleDict, Styled
+
+RowFactory = Callable[["VirtualList", int, "Component | None"], Component]
+"""Creates the row for an index, or when passed a recycled row, updates and returns it."""
+
+WHEEL_DELTA = 120
+
+
+def visible_rows(
+    offset: int, height: int, row_height: int, count: int, overscan: int = 0
+) -> range:
+    """Get the indexes of the rows visible in a viewport.
+
+    Args:
+        offset (int): Scroll offset of the viewport in pixels.
+        height (int): Height of the viewport in pixels.
+        row_height (int): Height of every row in pixels.
+        count (int): Total number of rows.
+        overscan (int): Extra rows to include above and below the viewport.
+    """
+    if count <= 0 or height <= 0 or row_height <= 0:
+        return range(0)
+    first = max(offset // row_height - overscan, 0)
+    last = min(-(-(offset + height) // row_height) + overscan, count)
+    return range(first, max(first, last))
+
+
+class VirtualList(Component):
+    """A scrollable list that only materializes the rows in view.
+
+    Args:
+        parent: The window or container the list belongs to.
+        count (int): Number of rows.
+        row_factory (RowFactory): Called with the list, the row index and a recycled row
+            or None. Must return the row component for that index. New rows must use the
+            list as their parent.
+        style (StyleDict | None): Style of the list.
+        row_height (int): Height of every row in pixels.
+        overscan (int): Rows kept materialized above and below the viewport.
+    """
+
+    def __init__(
+        self,
+        parent,
+        count: int,
+        row_factory: RowFactory,
+        style: StyleDict | None = None,
+        row_height: int = 24,
+        overscan: int = 4,
+    ):
+        super().__init__(style, parent)
+        self._count_ = count
+        self.row_factory = row_factory
+        self.row_height = row_height
+        self.overscan = overscan
+        self.offset = 0
+        self.rows: dict[int, Component] = {}
+        self._free_: list[Component] = []
+
+    @property
+    def h_wnd(self) -> int:
+        """Handle of the native window rows are created in."""
+        return self.handle
+
+    @property
+    def text_measure(self):
+        return self.parent.text_measure
+
+    @property
+    def positions(self):
+        return self.parent.positions
+
+    def post(self, func, *args) -> bool:
+        return self.parent.post(func, *args)
+
+    def backdrop(self, hdc: int) -> None:
+        # Rows are children of the list's own window, which has no cached background
+        return None
+
+    @property
+    def count(self) -> int:
+        return self._count_
+
+    @count.setter
+    def count(self, count: int):
+        self._count_ = count
+        for index in [index for index in self.rows if index >= count]:
+            self._recycle_(index)
+        self.scroll_to(self.offset)
+
+    @property
+    def content_height(self) -> int:
+        return self._count_ * self.row_height
+
+    def init(self):
+        super().init()
+
+        self.handle = CreateWindow(
+            "STATIC",
+            "",
+            WS_VISIBLE | WS_CHILD | WS_VSCROLL | WS_CLIPCHILDREN,
+            0,
+            0,
+            0,
+            0,
+            self.parent.h_wnd,
+            0,
+            GetWindowLong(self.parent.h_wnd, GWL_HINSTANCE),
+            None,
+        )
+        dispatcher.attach(self.handle, self)
+
+    def destroy(self):
+        """Destroy every materialized and recycled row, then the list itself."""
+        with self.positions.batch():
+            for row in [*self.rows.values(), *self._free_]:
+                row.destroy()
+            self.rows.clear()
+            self._free_.clear()
+            super().destroy()
+
+    def on_vscroll(self, hWnd, msg, wParam, lParam):
+        self.on_scroll(LOWORD(wParam))
+        return 0
+
+    def on_mousewheel(self, hWnd, msg, wParam, lParam):
+        delta = HIWORD(wParam)
+        if delta >= 0x8000:
+            delta -= 0x10000
+        self.scroll_to(self.offset - delta * 3 * self.row_height // WHEEL_DELTA)
+        return 0
+
+    def on_destroy(self, hWnd, msg, wParam, lParam):
+        self.release_gdi()
+        return DefWindowProc(hWnd, msg, wParam, lParam)
+
+    messages = {
+        WM_VSCROLL: on_vscroll,
+        WM_MOUSEWHEEL: on_mousewheel,
+        WM_DESTROY: on_destroy,
+    }
+
+    def on_scroll(self, request: int):
+        page = self.rect.height
+        offsets = {
+            SB_LINEUP: self.offset - self.row_height,
+            SB_LINEDOWN: self.offset + self.row_height,
+            SB_PAGEUP: self.offset - page,
+            SB_PAGEDOWN: self.offset + page,
+            SB_TOP: 0,
+            SB_BOTTOM: self.content_height,
+        }
+        if request in (SB_THUMBTRACK, SB_THUMBPOSITION):
+            self.scroll_to(GetScrollInfo(self.handle, SB_VERT, SIF_TRACKPOS)[5])
+        elif request in offsets:
+            self.scroll_to(offsets[request])
+
+    def scroll_to(self, offset: int):
+        """Scroll so the viewport starts `offset` pixels into the content."""
+        offset = max(min(offset, self.content_height - self.rect.height), 0)
+        self.offset = offset
+        if self.handle != 0:
+            SetScrollInfo(
+                self.handle,
+                SB_VERT,
+                (
+                    SIF_RANGE | SIF_PAGE | SIF_POS,
+                    0,
+                    max(self.content_height - 1, 0),
+                    self.rect.height,
+                    offset,
+                    0,
+                ),
+                True,
+            )
+        self.refresh()
+
+    def scroll_into_view(self, index: int):
+        """Scroll the least amount needed for a row to be fully visible."""
+        top = index * self.row_height
+        if top < self.offset:
+            self.scroll_to(top)
+        elif top + self.row_height > self.offset + self.rect.height:
+            self.scroll_to(top + self.row_height - self.rect.height)
+
+    def refresh(self):
+        """Materialize the rows in view, recycling the ones that left it, and position
+        them for the current scroll offset.
+        """
+        visible = visible_rows(
+            self.offset, self.rect.height, self.row_height, self._count_, self.overscan
+        )
+        for index in [index for index in self.rows if index not in visible]:
+            self._recycle_(index)
+
+        width = self.rect.width
+        with self.positions.batch():
+            for index in visible:
+                row = self.rows.get(index)
+                if row is None:
+                    row = self._materialize_(index)
+                top = index * self.row_height - self.offset
+                row.update_rect((0, top, width, top + self.row_height))
+
+    def rebind(self, index: int | None = None):
+        """Call the row factory again for one materialized row, or all of them, ex: after
+        the underlying data changed.
+        """
+        indexes = list(self.rows) if index is None else [index]
+        width = self.rect.width
+        with self.positions.batch():
+            for i in indexes:
+                old = self.rows.get(i)
+                if old is None:
+                    continue
+                row = self._bind_(i, old)
+                if row is not old:
+                    top = i * self.row_height - self.offset
+                    row.update_rect((0, top, width, top + self.row_height))
+
+    def _materialize_(self, index: int) -> Component:
+        recycled = self._free_.pop() if self._free_ else None
+        row = self._bind_(index, recycled)
+        if row is recycled and row.handle != 0:
+            ShowWindow(row.handle, SW_SHOW)
+        return row
+
+    def _bind_(self, index: int, old: Component | None) -> Component:
+        """Let the row factory update `old` for a row. When it returns a new row instead,
+        `old` is destroyed and the new row's native window is created.
+        """
+        row = self.row_factory(self, index, old)
+        if row is not old:
+            if old is not None:
+                old.destroy()
+            row.parent = self
+            row.init()
+        self.rows[index] = row
+        return row
+
+    def _recycle_(self, index: int):
+        row = self.rows.pop(index)
+        if row.handle != 0:
+            ShowWindow(row.handle, SW_HIDE)
+        self._free_.append(row)
+
+    def invalidate_child(self, child: Component, reason: Dirty = Dirty.STYLE):
+        """Rows have a fixed size so changes to them never affect layout."""
+
+    def calc_intrinsic(self) -> tuple[int, int]:
+        style = self.style.computed
+        return (
+            style.width if isinstance(style.width, int) else 200,
+            style.height
+            if isinstance(style.height, int)
+            else self.row_height * min(self._count_, 10),
+        )
+
+    def calc_rect(
+        self, previous: tuple[Rect, Styled], parent: tuple[Rect, Styled]
+    ) -> Bounds:
+        return flow_rect(self.style, self.intrinsic_size(), (None, 0), previous, parent)
+
+    def update(self, previous: tuple[Rect, Styled], parent: tuple[Rect, Styled]):
+        self.update_rect(self.calc_rect(previous, parent))
+
+    def update_rect(self, rect: Rect | Bounds):
+        super().update_rect(rect)
+        self.scroll_to(self.offset)
+
+
+metrics.probe(VirtualList, "calc_rect", "layout.calc_rect")
+metrics.probe(VirtualList, "refresh", "layout.virtual_refresh")
@@ -1,30 +1,63 @@
 from __future__ import annotations
+from concurrent import futures
 from contextlib import contextmanager
-from pathlib import Path
+from inspect import iscoroutinefunction
+from os.path import exists, splitext
 from traceback import print_stack
 from types import FunctionType
-from typing import Any, Iterator, Literal, TypeAlias, Callable, TypedDict
-from badges import wraps
-from win32.lib.win32con import CS_HREDRAW, CS_VREDRAW, CW_USEDEFAULT
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Iterator,
+    Literal,
+    TypeAlias,
+    Callable,
+    TypedDict,
+)
+from functools import wraps
+from time import perf_counter_ns
+from win32.lib.win32con import CW_USEDEFAULT
 import win32api
 import win32gui
 import win32con
 
+from native_ui.kit.win.classes import window_classes
 from native_ui.kit.win.component import Component, Button, Text
+from native_ui.kit.win.container import VBox, HBox
+from native_ui.kit.win.view import Render, View
+from native_ui.kit.win.virtual import RowFactory, VirtualList
 from native_ui.kit.win.styles import (
     StyleDict,
     to_style,
-    parse_background,
+    background_key,
     DEFAULT,
+    PAINT_ONLY,
     Styled,
 )
 from native_ui.kit.win.data import Rect
+from native_ui.kit.win.dispatch import dispatcher
+from native_ui.kit.win.gdi import GDIUser
+from native_ui.kit.win.batch import batch_flow
+from native_ui.kit.win.layout import Dirty, LayoutEngine
+from native_ui.kit.win.measure import GDIMeasurer, TextMeasure
+from native_ui.kit.win.metrics import metrics
+from native_ui.kit.win.position import Positions
+from native_ui.kit.win.state import Observable
+from native_ui.kit.win.surface import Surface
+from native_ui.kit.win.work import WorkQueue
 
 from ctypes import GetLastError, WinError, windll, pointer
 from ctypes.wintypes import HICON, MSG, HWND
 
+if TYPE_CHECKING:
+    from asyncio import Future
+
 user32 = windll.user32
 
+WM_DRAIN = win32con.WM_APP + 1
+"""Posted to a window when other threads queued work for it."""
+
 # from .color import HEX, Brush, PyGdiHANDLE
 
 Handler: TypeAlias = Callable[[HWND], bool]
@@ -50,21 +83,11 @@ class WindowHandlerDict(TypedDict, total=False):
 
 
 def icon(path: str) -> HICON:
-    """Helper to load an image as an ico."""
-    return win32gui.LoadImage(
-        0,
-        path,
-        win32con.IMAGE_ICON,
-        0,
-        0,
-        win32con.LR_LOADFROMFILE
-        | win32con.LR_SHARED
-        | win32con.LR_LOADTRANSPARENT
-        | win32con.LR_DEFAULTSIZE,
-    )
-
-
-class Window:
+    """Helper to load an image as an ico. Each file is only loaded once."""
+    return window_classes.icon(path)
+
+
+class Window(GDIUser):
     """Window context object. Creates a WNDCLASS with the passed in values.
 
     Args:
@@ -73,7 +96,8 @@ class Window:
         size (tuple[int, int]): Initial size of the window. Packed tuple of (width, height).
         background (PyGdiHandle): The brush to paint the background with. Use
             `brush` or `Brush.create`
-        klass (str): Window class (Label)
+        klass (str | None): Name of the window class. By default windows with the same
+            icon share one registered class.
         bind (WindowHandlerDict): Dict of event bindings. The keys are defined events while
             the value is a method that returns true or false and is passed the
             current windows handle.
@@ -94,72 +118,80 @@ class Window:
         on_open: Literal["minimize", "maximize"] = DEFAULT,
         style: StyleDict | None = None,
     ):
-        win32gui.InitCommonControls()
-        message_map = {
-            win32con.WM_DESTROY: self.on_destroy,
-            win32con.WM_ERASEBKGND: self.on_erasebkgnd,
-            win32con.WM_CLOSE: self.on_close,
-            win32con.WM_SIZE: self.on_resize,
-        }
+        window_classes.init_controls()
         self.children = []
-        self.h_inst = win32api.GetModuleHandle(None)
-        self.style = Styled(style or {})
+        self._gdi_ = {}
+        self.rect = Rect(0, 0, 0, 0)
+        self.layout_engine = LayoutEngine(
+            self, (Rect(0, 0, 0, 0), Styled({})), batch=batch_flow
+        )
+        self.positions = Positions()
+        self._backdrop_ = Surface()
+        self.work = WorkQueue(
+            lambda: win32gui.PostMessage(self.h_wnd, WM_DRAIN, 0, 0)
+        )
+        self.h_inst = window_classes.instance
+        self._style_ = Styled(style or {})
         self.handlers = WindowHandlers()
         if bind is not None:
             for key, value in bind.items():
                 self.bind_event(key, value)
 
-        ico_path = Path(ico)
-        if ico != "" and (not ico_path.exists() or ico_path.suffix != ".ico"):
+        suffix = splitext(ico)[1]
+        if ico != "" and (not exists(ico) or suffix != ".ico"):
             raise ValueError(
-                f"Can only apply '.ico' files as icons in window, was {ico_path.suffix!r}"
+                f"Can only apply '.ico' files as icons in window, was {suffix!r}"
             )
 
         self.icon = icon(ico) if ico != "" else 0
-        self.background = parse_background(self.style["background"])
-        self.always_on_top = to_style("z-order", self.style.get("z-order", DEFAULT))
+        self.background = self.gdi(
+            "background", background_key(self.style.get("background", DEFAULT))
+        )
+        self.always_on_top = self.style.computed.z_order
         self.init_size = (
             self.style.get("width", None) or CW_USEDEFAULT,
             self.style.get("height", None) or CW_USEDEFAULT,
         )
 
-        wc = win32gui.WNDCLASS()
-        wc.hIcon = self.icon
-        # wc.style = win32con.CS_HREDRAW | win32con.CS_VREDRAW
-        wc.lpfnWndProc = message_map
-        wc.lpszClassName = klass or f"PyNativeUI-{title}"
-        wc.style = CS_VREDRAW | CS_HREDRAW
-        
-        win32gui.RegisterClass(wc)
+        # No CS_HREDRAW | CS_VREDRAW, moved children report their own damage and the
+        # background doesn't depend on the size so resizes only paint what changed
+        self.klass = window_classes.acquire(dispatcher.proc, self.icon, 0, klass)
 
-        w_style = win32con.WS_TILEDWINDOW
+        # Children paint themselves, the background is never drawn under them
+        w_style = win32con.WS_TILEDWINDOW | win32con.WS_CLIPCHILDREN
         w_style |= to_style("on-open", on_open)
 
         self.h_wnd = win32gui.CreateWindow(
-            wc.lpszClassName,
+            self.klass,
             title,
             w_style,
             win32con.CW_USEDEFAULT,
             win32con.CW_USEDEFAULT,
-            self.style["width"] or CW_USEDEFAULT,
-            self.style["height"] or CW_USEDEFAULT,
+            *self.init_size,
             0,
             0,
             self.h_inst,
             None,
         )
+        dispatcher.register(self.h_wnd, self)
+        self.text_measure = TextMeasure(GDIMeasurer(self.h_wnd))
+
+        if self.always_on_top != win32con.HWND_NOTOPMOST:
+            # New windows already aren't topmost
+            win32gui.SetWindowPos(
+                self.h_wnd,
+                self.always_on_top,
+                0,
+                0,
+                0,
+                0,
+                win32con.SWP_NOMOVE | win32con.SWP_NOSIZE,
+            )
 
-        win32gui.SetWindowPos(
-            self.h_wnd,
-            self.always_on_top,
-            0,
-            0,
-            0,
-            0,
-            win32con.SWP_NOMOVE | win32con.SWP_NOSIZE,
-        )
-
+        self._style_.on_change = self.restyle
         self._is_alive_ = True
+        self.opened = False
+        self._closed_: list[Future] = []
         # left top right bottom
         rect = win32gui.GetWindowRect(self.h_wnd)
         self.caption_height = win32api.GetSystemMetrics(4)
@@ -170,11 +202,39 @@ class Window:
             self.style.get("height", rect[3] - rect[1]),
         )
 
+    @property
+    def style(self) -> Styled:
+        """The window's style. Setting it only restyles the children inheriting a
+        changed property.
+        """
+        return self._style_
+
+    @style.setter
+    def style(self, style: StyleDict | Styled):
+        self._style_.set(style.style if isinstance(style, Styled) else style)
+
+    def restyle(self, changed: frozenset[str]):
+        """Called when the window's style changed."""
+        if "background" in changed:
+            self.background = self.gdi(
+                "background", background_key(self.style.get("background", DEFAULT))
+            )
+            self.positions.damage(self.h_wnd, tuple(self.rect))
+        if not changed <= PAINT_ONLY:
+            # Padding and sizes of the window affect every child
+            self.layout_engine.mark_all(Dirty.PARENT)
+            self.update()
+
     def update(self):
-        previous = (Rect(0, 0, 0, 0), Styled({}))
-        for child in self.children:
-            child.update(previous=previous, parent=(self.rect, self.style))
-            previous = (child.rect, child.style)
+        """Lay out the children that changed since the last update and move their native
+        windows in one batch.
+        """
+        with self.positions.batch():
+            self.layout_engine.flush()
+
+    def invalidate_child(self, child: Component, reason: Dirty = Dirty.STYLE):
+        """Mark a child as needing layout on the next `update`."""
+        self.layout_engine.mark(child, reason)
 
     def __enter__(self) -> Window:
         return self
@@ -182,16 +242,74 @@ class Window:
     def __exit__(self, exc_type, exc_value, traceback):
         self.open()
 
-    def Button(self, text: str, style: StyleDict|None = None)-> Button:
+    def Button(
+        self, text: str | Observable[str], style: StyleDict | None = None
+    ) -> Button:
         cbutton = Button(self, text, style)
         self.children.append(cbutton)
+        self.layout_engine.mark(cbutton, Dirty.STYLE | Dirty.TEXT)
         return cbutton
 
-    def Text(self, text: str, style: StyleDict | None = None) -> Text:
+    def Text(
+        self, text: str | Observable[str], style: StyleDict | None = None
+    ) -> Text:
         ctext = Text(self, text, style)
         self.children.append(ctext)
+        self.layout_engine.mark(ctext, Dirty.STYLE | Dirty.TEXT)
         return ctext
 
+    def VBox(self, style: StyleDict | None = None) -> VBox:
+        cbox = VBox(style=style, parent=self)
+        self.children.append(cbox)
+        self.layout_engine.mark(cbox, Dirty.STYLE | Dirty.CHILDREN)
+        return cbox
+
+    def HBox(self, style: StyleDict | None = None) -> HBox:
+        cbox = HBox(style=style, parent=self)
+        self.children.append(cbox)
+        self.layout_engine.mark(cbox, Dirty.STYLE | Dirty.CHILDREN)
+        return cbox
+
+    def View(self, render: Render) -> View:
+        """Render a tree of elements as the children of the window, see `View`."""
+        return View(self, render)
+
+    def remove(self, child: Component):
+        """Remove a child from the window and destroy it."""
+        index = self.children.index(child)
+        del self.children[index]
+        self.layout_engine.discard(child)
+        child.destroy()
+        if index < len(self.children):
+            # The next child now flows after a different sibling
+            self.layout_engine.mark(self.children[index], Dirty.PREVIOUS)
+
+    def VirtualList(
+        self,
+        count: int,
+        row_factory: RowFactory,
+        style: StyleDict | None = None,
+        row_height: int = 24,
+    ) -> VirtualList:
+        clist = VirtualList(self, count, row_factory, style, row_height)
+        self.children.append(clist)
+        self.layout_engine.mark(clist, Dirty.STYLE)
+        return clist
+
+    def post(self, func: Callable, *args) -> bool:
+        """Run `func(*args)` on the UI thread. Safe to call from any thread.
+
+        Returns:
+            bool: False if the call was dropped because too much work is queued.
+        """
+        return self.work.post(func, *args)
+
+    def invoke(self, func: Callable, *args) -> futures.Future:
+        """Run `func(*args)` on the UI thread and get its result as a future. Safe to
+        call from any thread.
+        """
+        return self.work.invoke(func, *args)
+
     def is_alive(self) -> bool:
         return self._is_alive_
 
@@ -199,13 +317,42 @@ class Window:
         """Add an event handler to the window instance."""
         self.handlers[event] = handler
 
-    def open(self, translate: bool = False, errors: bool = False):
-        """Open and run the current window."""
+    async def closed(self):
+        """Wait until the window is destroyed."""
+        if not self._is_alive_:
+            return
+        from asyncio import get_running_loop
+
+        future = get_running_loop().create_future()
+        self._closed_.append(future)
+        await future
+
+    def open(
+        self,
+        translate: bool = False,
+        errors: bool = False,
+        main: Awaitable | None = None,
+    ):
+        """Open and run the current window.
+
+        Args:
+            translate (bool): Whether to translate key messages.
+            errors (bool): Raise when getting a message fails.
+            main (Awaitable | None): Run the window on an asyncio event loop, running
+                this alongside it until the window is closed. Enables async handlers.
+        """
         win32gui.ShowWindow(self.h_wnd, win32con.SW_SHOW)
+        self.opened = True
         for child in self.children:
             child.init()
         self.update()
 
+        if main is not None:
+            from native_ui.kit.win import aio
+
+            aio.run(serve(self, main=main))
+            return
+
         with msg() as message:
             while self.is_alive():
                 mr = user32.GetMessageA(message, self.h_wnd, 0, 0)
@@ -220,18 +367,47 @@ class Window:
         for child in children:
             child.parent = self
             child.init()
+            self.layout_engine.mark(child, Dirty.STYLE | Dirty.TEXT)
+
+    def backdrop(self, hdc: int) -> Surface:
+        """The window background rendered off-screen and covering the client area. It
+        is only drawn again when the window grows past the surface.
+
+        Args:
+            hdc (int): DC the surface has to be compatible with.
+        """
+        surface = self._backdrop_
+        surface.render(
+            hdc,
+            self.rect.right,
+            self.rect.bottom,
+            self._gdi_["background"][0],
+            self._fill_backdrop_,
+        )
+        return surface
 
-    def on_erasebkgnd(self, h_wnd, *_):
-        # Draw defined background
-        hdc, ps = win32gui.BeginPaint(h_wnd)
-        win32gui.FillRect(hdc, ps[2], self.background)
-        hdc = win32gui.EndPaint(h_wnd, ps)
+    def _fill_backdrop_(self, hdc: int):
+        win32gui.FillRect(hdc, (0, 0, *self._backdrop_.size), self.background)
 
+    def on_erasebkgnd(self, h_wnd, *_):
+        # The background is copied with the rest of the frame in on_paint
         return True
 
+    def on_paint(self, h_wnd, *_):
+        """Copy the damaged area from the back buffer in one blit."""
+        hdc, ps = win32gui.BeginPaint(h_wnd)
+        self.backdrop(hdc).blit(hdc, ps[2])
+        win32gui.EndPaint(h_wnd, ps)
+        return 0
+
     def on_close(self, h_wnd, *_):
         if self.handlers.close is not None:
-            if self.handlers.close(h_wnd) == True:
+            result = self.handlers.close(h_wnd)
+            if isinstance(result, Awaitable):
+                from native_ui.kit.win.aio import spawn
+
+                spawn(self._close_when_(h_wnd, result))
+            elif result == True:
                 win32gui.DestroyWindow(h_wnd)
         else:
             win32gui.DestroyWindow(h_wnd)
@@ -242,12 +418,8 @@ class Window:
         height = win32gui.HIWORD(lparam)
 
         self.caption_height = win32api.GetSystemMetrics(4)
-        self.rect = Rect(
-            0,
-            0,
-            win32gui.LOWORD(lparam),
-            win32gui.HIWORD(lparam),
-        )
+        if self.rect.set(0, 0, width, height):
+            self.layout_engine.mark_all(Dirty.PARENT)
 
         self.update()
         return win32gui.DefWindowProc(h_wnd, message, wparam, lparam)
@@ -256,20 +428,64 @@ class Window:
         """What happend when a window is destroyed"""
 
         if self.handlers.destroy is not None:
-            self.handlers.destroy(h_wnd)
+            result = self.handlers.destroy(h_wnd)
+            if isinstance(result, Awaitable):
+                from native_ui.kit.win.aio import spawn
+
+                spawn(result)
+        self.text_measure.close()
+        self._backdrop_.release()
+        self.release_gdi()
+        self.work.close()
         self._is_alive_ = False
+        for future in self._closed_:
+            if not future.done():
+                future.set_result(None)
+        self._closed_.clear()
         return True
 
+    async def _close_when_(self, h_wnd, result: Awaitable):
+        if await result == True and self._is_alive_:
+            win32gui.DestroyWindow(h_wnd)
+
+    def on_drain(self, h_wnd, *_):
+        """Run the work posted from other threads, then lay out once for all of it."""
+        with self.positions.batch():
+            self.work.drain()
+            self.update()
+        return 0
+
+    messages = {
+        WM_DRAIN: on_drain,
+        win32con.WM_DESTROY: on_destroy,
+        win32con.WM_ERASEBKGND: on_erasebkgnd,
+        win32con.WM_PAINT: on_paint,
+        win32con.WM_CLOSE: on_close,
+        win32con.WM_SIZE: on_resize,
+    }
+
+
+metrics.probe(Window, "update", "layout.update")
+
 
-def run(*windows: Window, errors: bool = False):
+def run(*windows: Window, errors: bool = False, main: Awaitable | None = None):
     """Run a given window. This will also create a loop watching for messages and
     dispatching messages to the window.
+
+    With `main` the messages are pumped by an asyncio event loop running `main`
+    alongside the windows until they are all closed. This enables async handlers.
     """
 
     for window in windows:
         if window is not None:
             win32gui.ShowWindow(window.h_wnd, win32con.SW_SHOW)
 
+    if main is not None:
+        from native_ui.kit.win import aio
+
+        aio.run(serve(*windows, main=main))
+        return
+
     with msg() as message:
         while any(window.is_alive() for window in windows):
             mr = user32.GetMessageA(message, None, 0, 0)
@@ -279,6 +495,20 @@ def run(*windows: Window, errors: bool = False):
             user32.DispatchMessageA(message)
 
 
+async def serve(*windows: Window, main: Awaitable | None = None):
+    """Wait until every window is closed while running `main`. `main` is cancelled if
+    it is still running when the last window closes.
+    """
+    from native_ui.kit.win.aio import spawn
+
+    task = spawn(main) if main is not None else None
+    for window in windows:
+        if window is not None:
+            await window.closed()
+    if task is not None and not task.done():
+        task.cancel()
+
+
 class Missing:
     """Custom missing object to define a missing arg that can also be None."""
 
@@ -290,7 +520,8 @@ def handler(expect: Any = MISSING):
     """Create an event handler that takes a windows handle and executes code.
     The wrapped method should return a bool of True == success or False == fail
     or any value with the 'expect' argument provided. With the 'expect' arugment provided
-    the returned value from the wrapped method is compared with the 'expect' value
+    the returned value from the wrapped method is compared with the 'expect' value.
+    The wrapped method can be `async def` when the window runs with `main=`.
 
     Args:
         expect (Any): The value that means the wrapped methods return is truthly
@@ -299,19 +530,45 @@ def handler(expect: Any = MISSING):
         bool: Whether the wrapped method is a success return or not
     """
 
+    def check(result: Any) -> bool:
+        if expect == MISSING:
+            if not isinstance(result, bool):
+                print_stack()
+                print(
+                    f"TypeError: Expected handler to return a bool value, found {type(result).__name__!r}"
+                )
+                win32gui.PostQuitMessage(0)
+            return result
+        return result == expect
+
     def wrapper(func: Callable[[HWND], Any]) -> Handler:
+        if iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_inner(hwnd: HWND) -> bool:
+                if not metrics.enabled:
+                    return check(await func(hwnd))
+                start = perf_counter_ns()
+                result = await func(hwnd)
+                if metrics.enabled:
+                    metrics.histogram("handler", {"name": func.__name__}).observe_ns(
+                        perf_counter_ns() - start
+                    )
+                return check(result)
+
+            return async_inner
+
         @wraps(func)
         def inner(hwnd: HWND) -> bool:
-            result = func(hwnd)
-            if expect == MISSING:
-                if not isinstance(result, bool):
-                    print_stack()
-                    print(
-                        f"TypeError: Expected handler to return a bool value, found {type(result).__name__!r}"
-                    )
-                    win32gui.PostQuitMessage(0)
-                return result
-            return result == expect
+            if metrics.enabled:
+                start = perf_counter_ns()
+                result = func(hwnd)
+                metrics.histogram("handler", {"name": func.__name__}).observe_ns(
+                    perf_counter_ns() - start
+                )
+            else:
+                result = func(hwnd)
+            return check(result)
 
         return inner
 
@@ -0,0 +1,111 @@
+"""Posting work to the UI thread.
+
+Native windows may only be touched from the thread that created them. `WorkQueue`
+lets other threads hand callables to that thread: they are appended to a deque, which
+is safe without a lock, and the UI thread is woken with a single message per burst.
+Every call queued until the drain runs in that one drain, so thousands of updates per
+second cost one wake up and one relayout per message loop iteration.
+"""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from concurrent.futures import Future
+from queue import Full
+from traceback import print_exc
+from typing import Any, Callable
+
+
+class WorkQueue:
+    """Callables queued by any thread and run on the thread owning the queue.
+
+    Args:
+        wake (Callable[[], Any]): Called from the posting thread when the queue goes
+            from idle to having work, ex: posting a message that makes the UI thread
+            call `drain`.
+        maxsize (int): Max number of queued calls. Posts beyond it are dropped.
+    """
+
+    def __init__(self, wake: Callable[[], Any], maxsize: int = 10_000):
+        self.wake = wake
+        self.maxsize = maxsize
+        self.thread = threading.get_ident()
+        self.dropped = 0
+        self.closed = False
+        self._items_: deque[tuple[Callable, tuple, Future | None]] = deque()
+        self._armed_ = False
+
+    def __len__(self) -> int:
+        return len(self._items_)
+
+    def _put_(self, item: tuple[Callable, tuple, Future | None]) -> bool:
+        if self.closed or len(self._items_) >= self.maxsize:
+            self.dropped += 1
+            return False
+        self._items_.append(item)
+        if not self._armed_:
+            # Racing posters may both wake, which only costs an empty drain
+            self._armed_ = True
+            self.wake()
+        return True
+
+    def post(self, func: Callable, *args) -> bool:
+        """Queue `func(*args)` to run on the owning thread.
+
+        Returns:
+            bool: False if the call was dropped because the queue is full or closed.
+        """
+        return self._put_((func, args, None))
+
+    def invoke(self, func: Callable, *args) -> Future:
+        """Run `func(*args)` on the owning thread and get its result as a future. Called
+        from the owning thread it runs right away.
+        """
+        future = Future()
+        if threading.get_ident() == self.thread:
+            self._run_(func, args, future)
+        elif not self._put_((func, args, future)):
+            future.set_exception(
+                Full(f"Work queue is {'closed' if self.closed else 'full'}")
+            )
+        return future
+
+    def drain(self) -> int:
+        """Run every call queued so far. Must be called from the owning thread.
+
+        Returns:
+            int: Number of calls run.
+        """
+        self._armed_ = False
+        count = len(self._items_)
+        for _ in range(count):
+            self._run_(*self._items_.popleft())
+        return count
+
+    def _run_(self, func: Callable, args: tuple, future: Future | None):
+        if future is not None and not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = func(*args)
+        except Exception as error:
+            if future is None:
+                # Keep running the rest of the burst
+                print_exc()
+            else:
+                future.set_exception(error)
+        except BaseException as error:
+            # KeyboardInterrupt and SystemExit still stop the UI thread
+            if future is not None:
+                future.set_exception(error)
+            raise
+        else:
+            if future is not None:
+                future.set_result(result)
+
+    def close(self):
+        """Stop accepting calls and cancel the queued ones."""
+        self.closed = True
+        while self._items_:
+            future = self._items_.popleft()[2]
+            if future is not None:
+                future.cancel()
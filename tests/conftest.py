@@ -0,0 +1,25 @@
+"""Tests run against the headless pywin32 stand-in so native call counts and layout are
+the same on every platform.
+"""
+import pytest
+
+from benchmarks import headless
+
+headless.install()
+
+
+@pytest.fixture
+def calls():
+    """Native calls made during the test, counted per function name."""
+    headless.reset()
+    return headless.calls
+
+
+@pytest.fixture
+def window():
+    from native_ui.kit.win import Window
+
+    window = Window(title="test", style={"width": 400, "height": 300})
+    # Native windows of children are created as they are added, like after open()
+    window.opened = True
+    return window
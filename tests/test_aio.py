@@ -0,0 +1,48 @@
+import asyncio
+
+from native_ui.kit.win import aio
+
+
+def test_messages_are_dispatched_while_the_loop_waits():
+    source = aio.SimulatedMessageSource()
+    seen = []
+    source.post(lambda: seen.append("first"), 0.01)
+    source.post(lambda: seen.append("second"), 0.02)
+
+    async def main():
+        await asyncio.sleep(0.05)
+        return seen[:]
+
+    assert aio.run(main(), source) == ["first", "second"]
+    assert source.dispatched == 2
+
+
+def test_waits_are_bounded_by_the_next_timer():
+    source = aio.SimulatedMessageSource()
+
+    async def main():
+        await asyncio.sleep(0.02)
+
+    aio.run(main(), source)
+
+    assert source.waits
+    assert all(wait is not None and wait <= 0.02 for wait in source.waits)
+
+
+def test_quit_message_cancels_main():
+    source = aio.SimulatedMessageSource()
+    source.post_quit(0.01)
+    after_quit = []
+    source.post(lambda: after_quit.append(True), 0.02)
+    cancelled = []
+
+    async def main():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    assert aio.run(main(), source) is None
+    assert cancelled == [True]
+    assert after_quit == []
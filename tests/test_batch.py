@@ -0,0 +1,80 @@
+import pytest
+
+from native_ui.kit.win.batch import batch_flow
+
+np = pytest.importorskip("numpy")
+
+
+STYLES = [
+    {},
+    {"margin": (2, 3, 4, 5)},
+    {"width": 0.5, "height": 30},
+    {"right": 10, "width": 120},
+    {"left": 0.1, "overflow": "ellipse", "width": 40},
+]
+
+
+def scalar_bounds(window):
+    window.layout_engine.batch = None
+    window.layout_engine.mark_all()
+    window.update()
+    return [tuple(child.rect) for child in window.children]
+
+
+@pytest.mark.parametrize("kind", ["Text", "Button"])
+@pytest.mark.parametrize("style", STYLES)
+def test_batch_flow_matches_the_scalar_path(window, kind, style):
+    window.style = {"width": 400, "height": 300, "padding": (6, 7, 8, 9)}
+    window.rect.update((0, 0, 400, 300))
+    for i in range(20):
+        getattr(window, kind)("x" * (i % 7 + 1), style)
+    expected = scalar_bounds(window)
+
+    rects = batch_flow(
+        window.children, (window.rect, window.style), window.layout_engine.origin
+    )
+
+    assert rects is not None
+    assert list(rects) == expected
+
+
+def test_batch_flow_falls_back_for_mixed_children(window):
+    window.rect.update((0, 0, 400, 300))
+    window.Text("a")
+    window.Button("b")
+
+    assert batch_flow(
+        window.children, (window.rect, window.style), window.layout_engine.origin
+    ) is None
+
+
+def test_batch_flow_falls_back_for_mixed_styles(window):
+    window.rect.update((0, 0, 400, 300))
+    window.Text("a")
+    window.Text("b", {"height": 40})
+
+    assert batch_flow(
+        window.children, (window.rect, window.style), window.layout_engine.origin
+    ) is None
+
+
+def test_resize_uses_the_batch_for_long_lists(window):
+    window.rect.update((0, 0, 400, 300))
+    window.layout_engine.batch_threshold = 4
+    for i in range(10):
+        window.Text(f"row {i}")
+    window.update()
+    expected = [tuple(child.rect) for child in window.children]
+
+    batches = []
+
+    def recording(*args):
+        batches.append(batch_flow(*args))
+        return batches[-1]
+
+    window.layout_engine.batch = recording
+    window.layout_engine.mark_all()
+    window.update()
+
+    assert len(batches) == 1 and batches[0] is not None
+    assert [tuple(child.rect) for child in window.children] == expected
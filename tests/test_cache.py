@@ -0,0 +1,63 @@
+import pytest
+
+from native_ui.kit.win.cache import LRUCache
+from native_ui.kit.win.data import Rect
+from native_ui.kit.win.styles import Styled, box_cache, resolve_box
+from native_ui.kit.win.styles.style import box_spec
+
+
+def test_lru_evicts_the_least_recently_used_entry():
+    cache = LRUCache(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache.get("a")
+    cache["c"] = 3
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.info() == (1, 0, 2, 2)
+
+
+def test_lru_counts_misses_and_rejects_empty_sizes():
+    cache = LRUCache(maxsize=1)
+
+    assert cache.get("missing", 5) == 5
+    assert cache.info().misses == 1
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_box_spec_expands_css_shorthands():
+    assert box_spec(4)[:4] == (4, 4, 4, 4)
+    assert box_spec((1, 2))[:4] == (1, 2, 1, 2)
+    assert box_spec((1, 2, 3))[:4] == (1, 2, 3, 2)
+    assert box_spec((1, 2, 3, 4))[:4] == (1, 2, 3, 4)
+    assert box_spec((1, 2, 3, 4, 5)) is None
+    assert box_spec(None) is None
+
+
+def test_box_spec_keeps_pixels_and_percentages_apart():
+    assert box_spec(1) != box_spec(1.0)
+    assert box_spec((1, 1.0))[4] == 0b1010
+
+
+def test_boxes_resolve_against_the_parent_size():
+    parent = Rect(0, 0, 200, 100)
+
+    assert resolve_box(box_spec((0.1, 0.5)), parent) == (10, 100, 10, 100)
+    assert resolve_box(box_spec(1), parent) == (1, 1, 1, 1)
+    assert resolve_box(box_spec(1.0), parent) == (100, 200, 100, 200)
+    assert resolve_box(None, parent) == (0, 0, 0, 0)
+
+
+def test_equal_boxes_share_one_cached_result():
+    box_cache.clear()
+    first = Styled({"padding": (5, 0.1)})
+    second = Styled({"padding": (5, 0.1)})
+
+    first.padding(Rect(0, 0, 300, 300))
+    second.padding(Rect(0, 0, 300, 300))
+
+    assert box_cache.info().misses == 1
+    assert box_cache.info().hits == 1
+    assert len(box_cache) <= box_cache.maxsize
@@ -0,0 +1,72 @@
+import pytest
+
+from native_ui.kit.win import Window
+from native_ui.kit.win.classes import WindowClasses
+
+
+def proc(h_wnd, message, wparam, lparam):
+    return 0
+
+
+def other_proc(h_wnd, message, wparam, lparam):
+    return 0
+
+
+def test_each_combination_is_registered_once(calls):
+    classes = WindowClasses(prefix="Test")
+
+    first = classes.acquire(proc)
+    assert classes.acquire(proc) == first
+    second = classes.acquire(proc, icon=5)
+    third = classes.acquire(other_proc)
+
+    assert len({first, second, third}) == 3
+    assert calls["RegisterClass"] == 3
+    assert len(classes) == 3
+    assert first in classes
+
+
+def test_explicit_names_are_reused_for_the_same_values(calls):
+    classes = WindowClasses()
+
+    assert classes.acquire(proc, name="Main") == "Main"
+    assert classes.acquire(proc, name="Main") == "Main"
+    assert calls["RegisterClass"] == 1
+
+
+def test_explicit_name_with_different_values_raises():
+    classes = WindowClasses()
+    classes.acquire(proc, name="Main")
+
+    with pytest.raises(ValueError):
+        classes.acquire(proc, style=1, name="Main")
+
+
+def test_generated_names_skip_explicit_ones():
+    classes = WindowClasses(prefix="Test")
+    classes.acquire(proc, name="Test-0")
+
+    generated = classes.acquire(other_proc)
+
+    assert generated != "Test-0"
+    assert classes.acquire(other_proc) == generated
+
+
+def test_controls_and_icons_are_initialized_once(calls):
+    classes = WindowClasses()
+
+    classes.init_controls()
+    classes.init_controls()
+    assert classes.icon("app.ico") == classes.icon("app.ico")
+
+    assert calls["InitCommonControls"] == 1
+    assert calls["LoadImage"] == 1
+
+
+def test_windows_with_different_titles_share_a_class(calls):
+    first = Window(title="one")
+    registered = calls["RegisterClass"]
+    second = Window(title="two")
+
+    assert second.klass == first.klass
+    assert calls["RegisterClass"] == registered
@@ -0,0 +1,62 @@
+import pytest
+
+from native_ui.kit.win.color import HEX, RGB, color_cache, colorrefs, parse_color
+
+
+def test_rgb_packs_channels_as_a_colorref():
+    assert RGB(0x12, 0x34, 0x56) == 0x563412
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["#123456", "123456", "#12345678", "rgb(18, 52, 86)", "rgba(18,52,86,0.5)"],
+)
+def test_formats_parse_to_the_same_colorref(value):
+    assert parse_color(value) == RGB(0x12, 0x34, 0x56)
+
+
+def test_short_hex_doubles_each_digit():
+    assert HEX("#f0a") == HEX("ff00aa") == HEX("#F0A8") == RGB(0xFF, 0x00, 0xAA)
+
+
+def test_named_colors_and_tuples():
+    assert parse_color("RebeccaPurple") == RGB(0x66, 0x33, 0x99)
+    assert parse_color((1, 2, 3)) == RGB(1, 2, 3)
+
+
+@pytest.mark.parametrize(
+    "value", ["#12345", "#ggg", "notacolor", "rgb(1, 2)", "rgb(1, 2, 300)", "hsl(1,2,3)"]
+)
+def test_invalid_colors_raise(value):
+    with pytest.raises(ValueError):
+        parse_color(value)
+
+
+def test_strings_are_parsed_once():
+    value = "#0a0b0c"
+    color_cache.pop(value, None)
+
+    parsed = parse_color(value)
+
+    assert color_cache.get(value) == parsed
+    color_cache[value] = 7
+    assert parse_color(value) == 7
+    color_cache.pop(value)
+
+
+def test_colorrefs_of_strings_channels_and_packed_ints():
+    np = pytest.importorskip("numpy")
+    expected = [RGB(0xFF, 0, 0), RGB(0, 0x80, 0xFF)]
+
+    assert colorrefs(["red", "#0080ff"]).tolist() == expected
+    assert colorrefs(np.array([[255, 0, 0], [0, 128, 255]])).tolist() == expected
+    assert colorrefs(np.array([[1.0, 0, 0, 1], [0, 128 / 255, 1, 0]])).tolist() == expected
+    assert colorrefs(np.array([0xFF0000, 0x0080FF])).tolist() == expected
+    assert colorrefs(["red", "red"]).dtype == np.uint32
+
+
+def test_colorrefs_rejects_other_shapes():
+    np = pytest.importorskip("numpy")
+
+    with pytest.raises(ValueError):
+        colorrefs(np.zeros((2, 5)))
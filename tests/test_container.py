@@ -0,0 +1,51 @@
+def test_children_are_separated_by_gap(window):
+    box = window.VBox({"gap": 10, "width": 200, "height": 300})
+    first = box.Text("a", {"height": 20})
+    second = box.Text("b", {"height": 20})
+    window.update()
+
+    assert second.rect.top - first.rect.bottom == 10
+
+
+def test_free_space_is_shared_by_grow(window):
+    box = window.HBox({"width": 400, "height": 100})
+    fixed = box.Text("a", {"width": 100})
+    one = box.Text("b", {"width": 0, "grow": 1})
+    three = box.Text("c", {"width": 0, "grow": 3})
+    window.update()
+
+    assert fixed.rect.width == 100
+    assert one.rect.width == 75
+    assert three.rect.width == 225
+    assert three.rect.right == box.rect.right
+
+
+def test_overflow_is_taken_from_shrink_by_size(window):
+    box = window.HBox({"width": 300, "height": 100})
+    rigid = box.Text("a", {"width": 200, "shrink": 0})
+    small = box.Text("b", {"width": 100, "shrink": 1})
+    large = box.Text("c", {"width": 200, "shrink": 1})
+    window.update()
+
+    # 200 px too wide, shared in proportion to shrink * size
+    assert rigid.rect.width == 200
+    assert small.rect.width == round(100 - 200 / 3)
+    assert large.rect.width == round(200 - 400 / 3)
+    assert large.rect.right == box.rect.right
+
+
+def test_justify_places_free_space_on_the_main_axis(window):
+    box = window.VBox({"justify": "end", "width": 200, "height": 300})
+    text = box.Text("a", {"height": 50})
+    window.update()
+
+    assert text.rect.bottom == box.rect.bottom
+
+
+def test_align_places_children_on_the_cross_axis(window):
+    box = window.VBox({"align": "center", "width": 200, "height": 300})
+    text = box.Text("a", {"width": 50, "height": 20})
+    window.update()
+
+    assert text.rect.left - box.rect.left == 75
+    assert box.rect.right - text.rect.right == 75
@@ -0,0 +1,79 @@
+from native_ui.kit.win.damage import Damage, intersection, union
+from native_ui.kit.win.data import Rect
+
+
+def test_union_and_intersection():
+    assert union((0, 0, 10, 10), (5, 5, 20, 15)) == (0, 0, 20, 15)
+    assert intersection((0, 0, 10, 10), (5, 5, 20, 15)) == (5, 5, 10, 10)
+    assert intersection((0, 0, 10, 10), (10, 0, 20, 10)) is None
+
+
+def test_empty_rects_are_ignored():
+    damage = Damage()
+
+    damage.add((5, 5, 5, 20))
+    damage.add(Rect(0, 0, 0, 0))
+
+    assert not damage
+    assert len(damage) == 0
+
+
+def test_adjacent_rects_merge():
+    damage = Damage()
+
+    damage.add((0, 0, 100, 20))
+    damage.add(Rect(0, 20, 100, 40))
+
+    assert list(damage) == [(0, 0, 100, 40)]
+
+
+def test_far_apart_rects_stay_separate():
+    damage = Damage()
+
+    damage.add((0, 0, 10, 10))
+    damage.add((200, 200, 210, 210))
+
+    assert list(damage) == [(0, 0, 10, 10), (200, 200, 210, 210)]
+
+
+def test_slack_bounds_the_undamaged_share_of_a_merge():
+    # A third of the union of these two is undamaged
+    a, b = (0, 0, 30, 10), (0, 10, 10, 20)
+
+    tight = Damage(slack=0.25)
+    tight.add(a)
+    tight.add(b)
+    loose = Damage(slack=0.5)
+    loose.add(a)
+    loose.add(b)
+
+    assert len(tight) == 2
+    assert list(loose) == [(0, 0, 30, 20)]
+
+
+def test_a_merge_can_cascade_into_other_rects():
+    damage = Damage(slack=0)
+    damage.add((0, 0, 10, 10))
+    damage.add((20, 0, 30, 10))
+
+    damage.add((10, 0, 20, 10))
+
+    assert list(damage) == [(0, 0, 30, 10)]
+
+
+def test_too_many_rects_collapse_into_their_bounds():
+    damage = Damage(max_rects=3)
+
+    for i in range(4):
+        damage.add((i * 100, 0, i * 100 + 10, 10))
+
+    assert list(damage) == [(0, 0, 310, 10)]
+
+
+def test_clear():
+    damage = Damage()
+    damage.add((0, 0, 10, 10))
+
+    damage.clear()
+
+    assert not damage
@@ -0,0 +1,55 @@
+import pytest
+
+from native_ui.kit.win.data import Rect, RectArray
+
+
+def test_rect_derived_values_follow_updates():
+    rect = Rect(0, 0, 10, 20)
+
+    rect.update((5, 5, 25, 45))
+
+    assert (rect.width, rect.height) == (20, 40)
+    assert rect.normalized == (0, 0, 20, 40)
+
+
+def test_rect_set_reports_changes():
+    rect = Rect(0, 0, 10, 10)
+
+    assert rect.set(0, 0, 10, 10) is False
+    assert rect.set(0, 5, 10, 15) is True
+    assert rect == Rect(0, 5, 10, 15) == (0, 5, 10, 15)
+
+
+def test_rect_has_no_instance_dict():
+    with pytest.raises(AttributeError):
+        Rect(0, 0, 1, 1).extra = 1
+
+
+def test_rect_array_stores_bounds_in_columns():
+    rects = RectArray.from_rects([(0, 0, 10, 10), Rect(0, 10, 20, 30)])
+    rects.append((5, 5, 6, 6))
+
+    assert len(rects) == 3
+    assert list(rects) == [(0, 0, 10, 10), (0, 10, 20, 30), (5, 5, 6, 6)]
+    assert list(rects.widths()) == [10, 20, 1]
+    assert list(rects.heights()) == [10, 20, 1]
+    assert rects.rect(1) == (0, 10, 20, 30)
+
+
+def test_rect_array_set_reports_changes():
+    rects = RectArray(2)
+
+    assert rects.set(0, 0, 0, 0, 0) is False
+    assert rects.set(1, 1, 2, 3, 4) is True
+    assert rects[1] == (1, 2, 3, 4)
+
+
+def test_rect_array_numpy_views_share_memory():
+    np = pytest.importorskip("numpy")
+    rects = RectArray(3)
+
+    left, top, right, bottom = rects.numpy()
+    left[:] = np.arange(3)
+    bottom[:] = 7
+
+    assert list(rects) == [(0, 0, 0, 7), (1, 0, 0, 7), (2, 0, 0, 7)]
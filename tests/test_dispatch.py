@@ -0,0 +1,163 @@
+import asyncio
+
+import pytest
+import win32con
+
+from native_ui.kit.win.dispatch import WM_NCDESTROY, Dispatcher, message_name
+from native_ui.kit.win.metrics import metrics
+
+
+class Owner:
+    """Stands in for a component, records the messages it handles."""
+
+    def __init__(self):
+        self.handled = []
+
+    def on_paint(self, h_wnd, message, wparam, lparam):
+        self.handled.append((h_wnd, message, wparam, lparam))
+        return 1
+
+    messages = {win32con.WM_PAINT: on_paint, WM_NCDESTROY: on_paint}
+
+
+@pytest.fixture
+def defaults():
+    return []
+
+
+@pytest.fixture
+def dispatcher(defaults):
+    def default(*args):
+        defaults.append(args)
+        return 0
+
+    return Dispatcher(default, timing=False)
+
+
+@pytest.fixture
+def metrics_off():
+    metrics.disable()
+    yield metrics
+    metrics.disable()
+
+
+def test_messages_are_routed_to_the_component_of_the_window(dispatcher, defaults):
+    first, second = Owner(), Owner()
+    dispatcher.register(1, first)
+    dispatcher.register(2, second)
+
+    assert dispatcher.proc(2, win32con.WM_PAINT, 3, 4) == 1
+
+    assert first.handled == []
+    assert second.handled == [(2, win32con.WM_PAINT, 3, 4)]
+    assert defaults == []
+
+
+def test_unhandled_messages_go_to_the_default_proc(dispatcher, defaults):
+    owner = Owner()
+    dispatcher.register(1, owner)
+
+    dispatcher.proc(1, win32con.WM_SIZE, 0, 0)
+    dispatcher.proc(9, win32con.WM_PAINT, 0, 0)
+
+    assert owner.handled == []
+    assert defaults == [(1, win32con.WM_SIZE, 0, 0), (9, win32con.WM_PAINT, 0, 0)]
+
+
+def test_components_are_only_referenced_weakly(dispatcher, defaults):
+    dispatcher.register(1, Owner())
+
+    dispatcher.proc(1, win32con.WM_PAINT, 0, 0)
+
+    assert len(dispatcher) == 0
+    assert dispatcher.component(1) is None
+    assert len(defaults) == 1
+
+
+def test_re_registering_a_handle_replaces_its_handlers(dispatcher, defaults):
+    owner = Owner()
+    dispatcher.register(1, owner)
+    dispatcher.register(1, owner, {})
+
+    dispatcher.proc(1, win32con.WM_PAINT, 0, 0)
+
+    assert owner.handled == []
+    assert len(defaults) == 1
+
+
+def test_window_is_unregistered_after_its_last_message(dispatcher, defaults):
+    owner = Owner()
+    dispatcher.timing = True
+    dispatcher.register(1, owner)
+    dispatcher.proc(1, win32con.WM_PAINT, 0, 0)
+
+    dispatcher.proc(1, WM_NCDESTROY, 0, 0)
+
+    # The handler still sees the message before the window is forgotten
+    assert [message for _, message, _, _ in owner.handled] == [
+        win32con.WM_PAINT,
+        WM_NCDESTROY,
+    ]
+    assert dispatcher.component(1) is None
+    assert dispatcher.window_stats(1).calls == 0
+    dispatcher.proc(1, win32con.WM_PAINT, 0, 0)
+    assert len(defaults) == 1
+
+
+def test_stats_are_recorded_per_message_and_window(dispatcher):
+    owner = Owner()
+    dispatcher.timing = True
+    dispatcher.register(1, owner)
+    dispatcher.register(2, owner)
+
+    dispatcher.proc(1, win32con.WM_PAINT, 0, 0)
+    dispatcher.proc(2, win32con.WM_PAINT, 0, 0)
+    dispatcher.proc(2, win32con.WM_SIZE, 0, 0)
+
+    assert dispatcher.stats()[win32con.WM_PAINT].calls == 2
+    assert win32con.WM_SIZE not in dispatcher.stats()
+    assert dispatcher.window_stats(1).calls == 1
+    assert dispatcher.window_stats(2).calls == 1
+
+    dispatcher.reset_stats()
+    assert dispatcher.stats() == {}
+
+
+def test_timing_follows_metrics_unless_set(metrics_off):
+    owner = Owner()
+    dispatcher = Dispatcher(lambda *args: 0)
+    dispatcher.register(1, owner)
+
+    dispatcher.proc(1, win32con.WM_PAINT, 0, 0)
+    assert dispatcher.timing is False
+    assert dispatcher.stats() == {}
+
+    metrics_off.enable()
+    dispatcher.proc(1, win32con.WM_PAINT, 0, 0)
+    assert dispatcher.stats()[win32con.WM_PAINT].calls == 1
+
+    dispatcher.timing = False
+    dispatcher.proc(1, win32con.WM_PAINT, 0, 0)
+    assert dispatcher.stats()[win32con.WM_PAINT].calls == 1
+
+
+def test_async_handlers_are_scheduled_and_return_zero(dispatcher):
+    done = []
+
+    async def on_paint(component, h_wnd, message, wparam, lparam):
+        done.append(h_wnd)
+
+    async def main():
+        owner = Owner()
+        dispatcher.register(1, owner, {win32con.WM_PAINT: on_paint})
+        assert dispatcher.proc(1, win32con.WM_PAINT, 0, 0) == 0
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+
+    assert done == [1]
+
+
+def test_message_name():
+    assert message_name(win32con.WM_PAINT) == "WM_PAINT"
+    assert message_name(0xBEEF) == "0xBEEF"
@@ -0,0 +1,89 @@
+from collections import Counter
+from itertools import count
+
+import pytest
+
+from native_ui.kit.win.gdi import GDICache, GDIUser, gdi_cache, hatch_key, solid_key
+
+
+class RecordingGDI:
+    def __init__(self):
+        self.calls = Counter()
+        self.live: set[int] = set()
+        self._handles_ = count(1)
+
+    def create(self, key) -> int:
+        self.calls["create"] += 1
+        handle = next(self._handles_)
+        self.live.add(handle)
+        return handle
+
+    def delete(self, handle: int):
+        self.calls["delete"] += 1
+        self.live.remove(handle)
+
+
+def test_equal_keys_share_one_object():
+    backend = RecordingGDI()
+    cache = GDICache(backend)
+
+    first = cache.acquire(solid_key(0xFF))
+    second = cache.acquire(solid_key(0xFF))
+    other = cache.acquire(hatch_key(0xFF, 1))
+
+    assert first == second != other
+    assert cache.refs(solid_key(0xFF)) == 2
+    assert backend.calls == {"create": 2}
+
+
+def test_object_is_deleted_with_the_last_reference():
+    backend = RecordingGDI()
+    cache = GDICache(backend)
+    key = solid_key(0)
+    cache.acquire(key)
+    cache.acquire(key)
+
+    cache.release(key)
+    assert backend.calls["delete"] == 0
+    cache.release(key)
+
+    assert backend.calls["delete"] == 1
+    assert backend.live == set()
+    assert len(cache) == 0
+    with pytest.raises(KeyError):
+        cache.release(key)
+
+
+def test_clear_deletes_everything():
+    backend = RecordingGDI()
+    cache = GDICache(backend)
+    cache.acquire(solid_key(1))
+    cache.acquire(solid_key(2))
+
+    cache.clear()
+
+    assert backend.live == set()
+    assert cache.refs(solid_key(1)) == 0
+
+
+class Holder(GDIUser):
+    def __init__(self):
+        self._gdi_ = {}
+
+
+def test_users_release_the_key_they_replace_and_everything_at_the_end():
+    first, second = Holder(), Holder()
+    red, blue = solid_key(0x123456), solid_key(0x654321)
+
+    first.gdi("background", red)
+    second.gdi("background", red)
+    first.gdi("background", red)
+    assert gdi_cache.refs(red) == 2
+
+    first.gdi("background", blue)
+    assert gdi_cache.refs(red) == 1
+    assert gdi_cache.refs(blue) == 1
+
+    first.release_gdi()
+    second.release_gdi()
+    assert gdi_cache.refs(red) == gdi_cache.refs(blue) == 0
@@ -0,0 +1,111 @@
+from types import SimpleNamespace
+
+from native_ui.kit.win.data import Rect
+from native_ui.kit.win.layout import Dirty, LayoutEngine
+
+
+class Row:
+    """Stacks below the previous row with a fixed height and counts its layouts."""
+
+    def __init__(self, height: int):
+        self.height = height
+        self.rect = Rect(0, 0, 0, 0)
+        self.style = None
+        self.layouts = 0
+
+    def calc_rect(self, previous, parent):
+        self.layouts += 1
+        top = previous[0].bottom
+        return (0, top, parent[0].width, top + self.height)
+
+    def update_rect(self, rect):
+        self.rect.update(rect)
+
+
+def make_engine(count: int = 5, batch=None):
+    rows = [Row(10) for _ in range(count)]
+    root = SimpleNamespace(rect=Rect(0, 0, 100, 100), style=None, children=rows)
+    engine = LayoutEngine(root, (Rect(0, 0, 0, 0), None), batch, batch_threshold=2)
+    engine.mark_all(Dirty.STYLE)
+    engine.flush()
+    for row in rows:
+        row.layouts = 0
+    return engine, rows
+
+
+def test_first_flush_stacks_every_child():
+    _, rows = make_engine()
+
+    assert [tuple(row.rect) for row in rows] == [
+        (0, top, 100, top + 10) for top in range(0, 50, 10)
+    ]
+
+
+def test_flush_without_changes_does_nothing():
+    engine, rows = make_engine()
+
+    assert engine.dirty is False
+    assert engine.flush() == []
+    assert sum(row.layouts for row in rows) == 0
+
+
+def test_change_that_keeps_the_size_lays_out_only_that_child():
+    engine, rows = make_engine()
+
+    engine.mark(rows[2], Dirty.TEXT)
+    moved = engine.flush()
+
+    assert moved == []
+    assert [row.layouts for row in rows] == [0, 0, 1, 0, 0]
+
+
+def test_resized_child_moves_only_the_siblings_after_it():
+    engine, rows = make_engine()
+
+    rows[2].height = 20
+    engine.mark(rows[2], Dirty.TEXT)
+    moved = engine.flush()
+
+    assert moved == rows[2:]
+    assert [row.layouts for row in rows] == [0, 0, 1, 1, 1]
+    assert rows[4].rect == (0, 50, 100, 60)
+
+
+def test_style_change_relays_the_next_sibling_even_without_moving():
+    engine, rows = make_engine()
+
+    engine.mark(rows[1], Dirty.STYLE)
+    engine.flush()
+
+    assert [row.layouts for row in rows] == [0, 1, 1, 0, 0]
+
+
+def test_discarded_components_are_not_laid_out():
+    engine, rows = make_engine()
+
+    engine.mark(rows[3])
+    engine.discard(rows[3])
+
+    assert engine.dirty is False
+
+
+def test_batch_is_only_used_when_every_child_is_dirty():
+    used = []
+
+    def batch(children, parent, origin):
+        used.append(len(children))
+        return None
+
+    engine, rows = make_engine(batch=batch)
+    used.clear()
+
+    engine.mark(rows[0])
+    engine.flush()
+    assert used == []
+    for row in rows:
+        row.layouts = 0
+
+    engine.mark_all()
+    engine.flush()
+    assert used == [5]
+    assert sum(row.layouts for row in rows) == 5
@@ -0,0 +1,31 @@
+from native_ui.kit.win.measure import FixedMeasurer, TextMeasure
+
+
+def test_fixed_metrics_wrap_on_whole_characters():
+    measurer = FixedMeasurer(char_width=7, line_height=16)
+
+    assert measurer.measure("hello", 0, 0, 0) == (35, 16)
+    assert measurer.measure("two\nlines", 0, 0, 0) == (35, 32)
+    assert measurer.measure("abcdef", 0, 0, 21) == (21, 32)
+
+
+def test_repeated_text_is_measured_once():
+    measurer = FixedMeasurer()
+    measure = TextMeasure(measurer)
+
+    for _ in range(3):
+        measure.measure("hello")
+    measure.measure("hello", width=14)
+
+    assert measurer.calls == 2
+
+
+def test_measure_many_only_measures_distinct_uncached_text():
+    measurer = FixedMeasurer()
+    measure = TextMeasure(measurer)
+    measure.measure("a")
+
+    sizes = measure.measure_many(["a", "bb", "bb", "ccc"])
+
+    assert sizes == [(7, 16), (14, 16), (14, 16), (21, 16)]
+    assert measurer.calls == 3
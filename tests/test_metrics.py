@@ -0,0 +1,94 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from native_ui.kit.win import surface
+from native_ui.kit.win.metrics import Registry, metrics
+from native_ui.kit.win.window import handler
+
+
+@pytest.fixture
+def disabled():
+    """The process wide registry, disabled and reset."""
+    metrics.disable()
+    metrics.reset()
+    yield metrics
+    metrics.disable()
+    metrics.reset()
+
+
+def test_probe_is_only_wrapped_while_enabled():
+    registry = Registry()
+    owner = SimpleNamespace(work=lambda value: value * 2)
+    original = owner.work
+
+    registry.probe(owner, "work", "work")
+    assert owner.work is original
+
+    registry.enable()
+    assert owner.work is not original
+    assert owner.work(2) == 4
+    assert registry.histogram("work").count == 1
+
+    registry.disable()
+    assert owner.work is original
+    assert owner.work(2) == 4
+    assert registry.histogram("work").count == 1
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    histogram = registry.histogram("latency", buckets=(0.001, 0.01))
+    for value in (0.0005, 0.005, 0.005, 1.0):
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [(0.001, 1), (0.01, 3), (float("inf"), 4)]
+
+
+def test_json_export_contains_counters_and_gauges():
+    registry = Registry()
+    registry.counter("paints", {"kind": "text"}).inc(3)
+    registry.gauge("objects", lambda: 7)
+
+    data = json.loads(registry.to_json())
+
+    assert data["counters"] == [{"name": "paints", "labels": {"kind": "text"}, "value": 3}]
+    assert any(gauge["value"] == 7 for gauge in data["gauges"])
+
+
+def test_prometheus_export_escapes_label_values():
+    registry = Registry(prefix="app")
+    registry.counter("handler.calls", {"name": 'say "hi"\\\n'}).inc()
+
+    text = registry.to_prometheus()
+
+    assert "# TYPE app_handler_calls_total counter" in text
+    assert 'app_handler_calls_total{name="say \\"hi\\"\\\\\\n"} 1' in text
+
+
+def test_surface_counters_stay_untouched_while_disabled(disabled):
+    target = surface.Surface()
+    target.render(0, 10, 10, "a", lambda dc: None)
+    target.render(0, 10, 10, "a", lambda dc: None)
+
+    assert surface._rendered_.value == 0
+    assert surface._reused_.value == 0
+
+    disabled.enable()
+    target.render(0, 10, 10, "a", lambda dc: None)
+    assert surface._reused_.value == 1
+
+
+def test_async_handlers_are_only_timed_while_enabled(disabled):
+    @handler()
+    async def on_close(hwnd):
+        return True
+
+    assert asyncio.run(on_close(0)) is True
+    assert disabled.histogram("handler", {"name": "on_close"}).count == 0
+
+    disabled.enable()
+    assert asyncio.run(on_close(0)) is True
+    assert disabled.histogram("handler", {"name": "on_close"}).count == 1
@@ -0,0 +1,94 @@
+import pytest
+
+from native_ui.kit.win.styles import Cascade, compile_style, parse_ncss
+from native_ui.kit.win.styles.ncss import NCSSError, parse_value
+
+
+@pytest.mark.parametrize(("value", "expected"), [("1", 1), ("0", 0), ("2.5", 2.5)])
+def test_flex_weights_are_unitless_numbers(value, expected):
+    for name in ("grow", "shrink"):
+        parsed = parse_value(name, value)
+        assert parsed == expected
+        assert type(parsed) is type(expected)
+
+
+@pytest.mark.parametrize("value", ["1px", "50%", "-1", "auto"])
+def test_flex_weights_reject_units_and_keywords(value):
+    with pytest.raises(NCSSError):
+        parse_value("grow", value)
+
+
+def test_stylesheet_with_flex_properties_compiles():
+    sheet = parse_ncss(".row { grow: 1; shrink: 0; gap: 4px; justify: center; }")
+
+    style = compile_style(sheet[".row"])
+
+    assert (style.grow, style.shrink, style.gap) == (1, 0, 4)
+
+
+def test_parse_ncss_converts_values_and_splits_selector_lists():
+    sheet = parse_ncss(
+        """
+        /* comment */
+        window { width: 800px; height: 50%; background: hatch #c3c3c3 tangent }
+        button, .boxed { padding: 5 10; color: rgb(1, 2, 3); }
+        """
+    )
+
+    assert sheet["window"] == {
+        "width": 800,
+        "height": 0.5,
+        "background": ("hatch", "c3c3c3", "tangent"),
+    }
+    assert sheet["button"] == sheet[".boxed"] == {"padding": (5, 10), "color": (1, 2, 3)}
+
+
+@pytest.mark.parametrize(
+    "source", ["button { width: 1.5px; }", "a#b#c { width: 1px; }", "{ width: 1px; }"]
+)
+def test_invalid_sheets_raise(source):
+    with pytest.raises(NCSSError):
+        parse_ncss(source)
+
+
+def test_more_specific_selectors_win():
+    cascade = Cascade(
+        """
+        #ok { color: red; }
+        button.primary { color: green; width: 10px; }
+        button { color: blue; width: 20px; height: 5px; }
+        * { gap: 1px; }
+        """
+    )
+
+    assert cascade.match("button", ["primary"], "ok") == {
+        "gap": 1,
+        "color": "red",
+        "width": 10,
+        "height": 5,
+    }
+    assert cascade.match("button") == {"gap": 1, "color": "blue", "width": 20, "height": 5}
+
+
+def test_later_rules_and_sheets_win_at_equal_specificity():
+    cascade = Cascade(".a { color: red; }", {".b": {"color": "blue"}})
+    cascade.add(".a { width: 5px; }")
+
+    assert cascade.match("text", ["a", "b"]) == {"color": "blue", "width": 5}
+    assert len(cascade) == 3
+
+
+def test_rules_only_apply_to_matching_components():
+    cascade = Cascade("button.primary { color: red; } #x { width: 1px; }")
+
+    assert cascade.match("button") == {}
+    assert cascade.match("text", ["primary"]) == {}
+    assert cascade.match("text", [], "x") == {"width": 1}
+
+
+def test_matches_are_copies():
+    cascade = Cascade("button { color: red; }")
+
+    cascade.match("button")["color"] = "blue"
+
+    assert cascade.match("button") == {"color": "red"}
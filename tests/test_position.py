@@ -0,0 +1,75 @@
+from native_ui.kit.win.position import Positions, RecordingPositioner
+
+
+def test_moves_outside_a_batch_are_applied_right_away():
+    backend = RecordingPositioner()
+    positions = Positions(backend)
+
+    positions.move(1, 10, (0, 0, 10, 10))
+    positions.move(1, 11, (0, 10, 10, 20))
+
+    assert backend.calls == {"move": 2}
+
+
+def test_batch_defers_every_move_of_a_parent_at_once():
+    backend = RecordingPositioner()
+    positions = Positions(backend)
+
+    with positions.batch():
+        for handle in range(10, 20):
+            positions.move(1, handle, (0, 0, 10, 10))
+        assert backend.calls == {}
+
+    assert backend.calls == {"begin": 1, "defer": 10, "end": 1}
+
+
+def test_nested_batches_commit_once_with_the_last_bounds():
+    backend = RecordingPositioner()
+    positions = Positions(backend)
+
+    with positions.batch():
+        positions.move(1, 10, (0, 0, 10, 10))
+        with positions.batch():
+            positions.move(1, 10, (5, 5, 15, 15))
+            positions.move(1, 11, (0, 10, 10, 20))
+        assert backend.calls == {}
+
+    assert backend.calls == {"begin": 1, "defer": 2, "end": 1}
+    assert ("defer", 1, 10, (5, 5, 15, 15)) in backend.log
+
+
+def test_batch_is_committed_per_parent_and_single_moves_skip_deferral():
+    backend = RecordingPositioner()
+    positions = Positions(backend)
+
+    with positions.batch():
+        positions.move(1, 10, (0, 0, 10, 10))
+        positions.move(1, 11, (0, 10, 10, 20))
+        positions.move(2, 20, (0, 0, 10, 10))
+
+    assert backend.calls == {"begin": 1, "defer": 2, "end": 1, "move": 1}
+
+
+def test_damage_is_repainted_once_after_the_batch():
+    backend = RecordingPositioner()
+    positions = Positions(backend)
+
+    with positions.batch():
+        positions.move(1, 10, (0, 20, 10, 30), previous=(0, 0, 10, 10))
+        positions.move(1, 10, (0, 20, 10, 30), previous=(0, 0, 10, 10))
+        assert backend.calls["invalidate"] == 0
+
+    assert backend.calls["invalidate"] >= 1
+    assert all(call[1] == 1 for call in backend.log if call[0] == "invalidate")
+
+
+def test_forget_drops_queued_moves_of_a_destroyed_window():
+    backend = RecordingPositioner()
+    positions = Positions(backend)
+
+    with positions.batch():
+        positions.move(1, 10, (0, 0, 10, 10))
+        positions.move(1, 11, (0, 10, 10, 20))
+        positions.forget(11)
+
+    assert backend.calls == {"move": 1}
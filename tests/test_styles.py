@@ -0,0 +1,82 @@
+import pytest
+
+from native_ui.kit.win.styles import Styled, compile_style, style_key
+
+
+def test_equal_styles_share_one_compiled_style():
+    assert compile_style({"width": 10, "color": "red"}) is compile_style(
+        {"color": "red", "width": 10}
+    )
+
+
+def test_int_and_float_values_compile_separately():
+    # A float is a percentage, 1.0 is 100% while 1 is one pixel
+    pixel = compile_style({"width": 1})
+    percent = compile_style({"width": 1.0})
+
+    assert percent is not pixel
+    assert type(pixel.width) is int
+    assert type(percent.width) is float
+
+
+def test_int_and_float_values_in_tuples_compile_separately():
+    assert compile_style({"padding": (1, 1)}) is not compile_style({"padding": (1, 1.0)})
+
+
+def test_style_key_tells_int_and_float_apart():
+    assert style_key({"margin": 1}) != style_key({"margin": 1.0})
+    assert style_key({"margin": 1, "width": 2}) == style_key({"width": 2, "margin": 1})
+
+
+def test_invalid_values_raise():
+    with pytest.raises(ValueError):
+        compile_style({"justify": "sideways"})
+    with pytest.raises(ValueError):
+        compile_style({"width": "wide"})
+
+
+def test_switching_between_pixels_and_percentage_is_a_change():
+    styled = Styled({"width": 1})
+    changes = []
+    styled.on_change = changes.append
+
+    styled.set({"width": 1.0})
+
+    assert changes == [frozenset({"width"})]
+    assert type(styled.computed.width) is float
+
+
+
+def test_inherited_values_reach_children_only_for_inherited_keys():
+    parent = Styled({"color": "red", "width": 100})
+    child = Styled({}, parent)
+    changes = []
+    child.on_change = changes.append
+
+    parent.set({"color": "blue", "width": 100})
+    parent.set({"color": "blue", "width": 50})
+
+    assert child["color"] == "blue"
+    assert "width" not in child
+    assert changes == [frozenset({"color"})]
+
+
+def test_inherit_keyword_takes_any_property_from_the_parent():
+    parent = Styled({"background": "red", "width": 100})
+    child = Styled({"background": "inherit"}, parent)
+
+    parent.set({"background": "blue", "width": 100})
+
+    assert child["background"] == "blue"
+
+
+def test_justify_of_a_box_does_not_leak_into_nested_boxes(window):
+    outer = window.HBox({"justify": "center", "width": 400, "height": 300})
+    inner = outer.VBox({"height": 300})
+    text = inner.Text("label")
+    outer.init()
+    window.update()
+
+    assert "justify" not in inner.style
+    assert inner.style.computed.justify == "start"
+    assert text.rect.top == inner.rect.top
@@ -0,0 +1,99 @@
+import pytest
+
+from native_ui.kit.win.surface import BYTES_PER_PIXEL, Surface, SurfaceCache
+
+
+@pytest.fixture
+def draws():
+    return []
+
+
+def render(cache, key, draws, width=10, height=10):
+    return cache.render(1, width, height, key, draws.append)
+
+
+def test_surface_only_draws_when_the_key_changes(calls, draws):
+    surface = Surface()
+
+    assert surface.render(1, 10, 10, "a", draws.append) is True
+    assert surface.render(1, 20, 20, "a", draws.append) is False
+    assert surface.render(1, 10, 10, "b", draws.append) is True
+
+    assert len(draws) == 2
+    assert surface.size == (64, 64)
+    assert calls["CreateCompatibleBitmap"] == 1
+
+
+def test_surface_redraws_after_growing(draws):
+    surface = Surface()
+    surface.render(1, 10, 10, "a", draws.append)
+
+    assert surface.render(1, 100, 10, "a", draws.append) is True
+    assert surface.size == (128, 64)
+
+
+def test_failed_draw_leaves_the_surface_stale():
+    surface = Surface()
+
+    with pytest.raises(ZeroDivisionError):
+        surface.render(1, 10, 10, "a", lambda hdc: 1 / 0)
+
+    assert surface.key is None
+
+
+def test_cache_shares_surfaces_by_key(draws):
+    cache = SurfaceCache()
+
+    first = render(cache, "a", draws)
+    assert render(cache, "a", draws) is first
+    render(cache, "b", draws)
+
+    assert len(draws) == 2
+    assert cache.info()[:3] == (1, 2, 2)
+    assert cache.info().hit_rate == pytest.approx(1 / 3)
+
+
+def test_cache_evicts_least_recently_used_over_budget(calls, draws):
+    cache = SurfaceCache(budget=2 * 10 * 10 * BYTES_PER_PIXEL)
+    render(cache, "a", draws)
+    render(cache, "b", draws)
+    render(cache, "a", draws)
+
+    render(cache, "c", draws)
+
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert cache.bytes == 2 * 10 * 10 * BYTES_PER_PIXEL
+    assert calls["DeleteDC"] == 1
+
+
+def test_cache_evicts_past_max_entries(draws):
+    cache = SurfaceCache(max_entries=2)
+
+    for key in "abc":
+        render(cache, key, draws)
+
+    assert len(cache) == 2
+    assert "a" not in cache
+
+
+def test_cache_keeps_a_surface_larger_than_the_budget(draws):
+    cache = SurfaceCache(budget=10)
+    render(cache, "a", draws)
+
+    render(cache, "b", draws, 100, 100)
+
+    assert len(cache) == 1
+    assert "b" in cache
+
+
+def test_cache_clear_releases_everything(calls, draws):
+    cache = SurfaceCache()
+    render(cache, "a", draws)
+    render(cache, "a", draws)
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.bytes == 0
+    assert cache.info().hit_rate == 0.0
+    assert calls["DeleteDC"] == 1
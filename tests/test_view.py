@@ -0,0 +1,117 @@
+import pytest
+
+from native_ui.kit.win import State
+from native_ui.kit.win.view import Text, VBox
+
+
+def texts(host) -> list[str]:
+    return [child.text for child in host.children]
+
+
+def native_windows(calls) -> int:
+    return calls["CreateWindow"] + calls["CreateWindowEx"]
+
+
+def test_first_refresh_creates_every_element(window, calls):
+    view = window.View(lambda: [Text(f"row {i}", key=i) for i in range(5)])
+
+    assert view.operations == {"create": 5}
+    assert texts(window) == [f"row {i}" for i in range(5)]
+    assert native_windows(calls) == 5
+
+
+def test_changed_text_only_updates_that_row(window, calls):
+    rows = State(["a", "b", "c"])
+    view = window.View(lambda: [Text(row, key=i) for i, row in enumerate(rows.value)])
+    calls.clear()
+
+    rows.value = ["a", "B", "c"]
+    window.work.drain()
+
+    assert view.operations == {"retext": 1}
+    assert texts(window) == ["a", "B", "c"]
+    assert native_windows(calls) == 0
+
+
+def test_swapping_keyed_rows_moves_them_without_recreating(window, calls):
+    rows = State([1, 2, 3, 4])
+    view = window.View(lambda: [Text(str(row), key=row) for row in rows.value])
+    first = window.children[0]
+    calls.clear()
+
+    rows.value = [1, 3, 2, 4]
+    window.work.drain()
+
+    assert view.operations == {"move": 3}
+    assert texts(window) == ["1", "3", "2", "4"]
+    assert window.children[0] is first
+    assert native_windows(calls) == 0
+
+
+def test_delete_destroys_the_row_and_moves_the_next_one(window, calls):
+    rows = State([1, 2, 3])
+    view = window.View(lambda: [Text(str(row), key=row) for row in rows.value])
+    calls.clear()
+
+    rows.value = [1, 3]
+    window.work.drain()
+
+    assert view.operations == {"destroy": 1, "move": 1}
+    assert texts(window) == ["1", "3"]
+    assert calls["DestroyWindow"] == 1
+
+
+def test_changing_the_kind_of_a_key_recreates_it(window):
+    button = State(False)
+    view = window.View(
+        lambda: [VBox(Text("inside"), key="x") if button.value else Text("x", key="x")]
+    )
+
+    button.value = True
+    window.work.drain()
+
+    assert view.operations == {"create": 2, "destroy": 1}
+    assert texts(window.children[0]) == ["inside"]
+
+
+def test_duplicate_keys_change_nothing(window, calls):
+    duplicate = State(False)
+
+    def render():
+        rows = [Text("a", key=1), Text("b", key=2)]
+        if duplicate.value:
+            rows.insert(0, Text("new", key="new"))
+            rows.append(Text("again", key=1))
+        return rows
+
+    view = window.View(render)
+    mounted = list(window.children)
+    calls.clear()
+
+    duplicate.value = True
+    with pytest.raises(ValueError):
+        view.refresh()
+
+    assert window.children == mounted
+    assert native_windows(calls) == 0
+
+
+def test_view_keeps_refreshing_after_render_raised(window, capsys):
+    fail = State(False)
+    label = State("a")
+
+    def render():
+        if fail.value:
+            raise RuntimeError("render failed")
+        return Text(label.value)
+
+    window.View(render)
+    fail.value = True
+    window.work.drain()
+    assert "render failed" in capsys.readouterr().err
+
+    fail.value = False
+    label.value = "b"
+    window.work.drain()
+
+    assert texts(window) == ["b"]
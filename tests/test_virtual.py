@@ -0,0 +1,85 @@
+from native_ui.kit.win import State
+from native_ui.kit.win.component import Text
+from native_ui.kit.win.virtual import visible_rows
+
+
+def test_visible_rows_include_overscan_within_bounds():
+    assert visible_rows(0, 100, 20, 1000) == range(0, 5)
+    assert visible_rows(30, 100, 20, 1000) == range(1, 7)
+    assert visible_rows(30, 100, 20, 1000, overscan=2) == range(0, 9)
+    assert visible_rows(19900, 200, 20, 1000, overscan=4) == range(991, 1000)
+    assert visible_rows(0, 100, 20, 0) == range(0)
+
+
+def labels(created):
+    def factory(lst, index, row):
+        if row is None:
+            row = Text(lst, f"row {index}", None)
+            created.append(row)
+        else:
+            row.text = f"row {index}"
+        return row
+
+    return factory
+
+
+def make_list(window, factory, count=1000):
+    lst = window.VirtualList(count, factory, {"height": 100}, row_height=20)
+    lst.init()
+    window.update()
+    return lst
+
+
+def test_only_rows_in_view_are_materialized(window):
+    created = []
+    lst = make_list(window, labels(created))
+
+    assert sorted(lst.rows) == list(range(0, 9))
+    assert len(created) == 9
+
+
+def test_scrolling_recycles_rows_instead_of_creating_them(window, calls):
+    created = []
+    lst = make_list(window, labels(created))
+    calls.clear()
+
+    lst.scroll_to(10000)
+
+    assert sorted(lst.rows) == list(range(496, 509))
+    assert len(created) == 13
+    assert calls["CreateWindow"] == 4
+    assert lst.rows[500].text == "row 500"
+
+
+def test_rebind_replaces_rows_the_factory_recreates(window, calls):
+    lst = make_list(window, labels([]))
+    old = lst.rows[0]
+    calls.clear()
+
+    lst.row_factory = lambda owner, index, row: Text(owner, f"new {index}", None)
+    lst.rebind(0)
+
+    row = lst.rows[0]
+    assert row is not old
+    assert row.parent is lst and row.handle != 0
+    assert old.handle == 0
+    assert calls["DestroyWindow"] == 1
+
+
+def test_destroy_destroys_rows_and_unbinds_them(window):
+    name = State("a")
+
+    def factory(lst, index, row):
+        if row is None:
+            row = Text(lst, name, None)
+        return row
+
+    lst = make_list(window, factory)
+    lst.scroll_to(400)
+    rows = [*lst.rows.values(), *lst._free_]
+
+    window.remove(lst)
+
+    assert all(row.handle == 0 for row in rows)
+    assert not lst.rows and not lst._free_
+    assert name._listeners_ == {}
@@ -0,0 +1,126 @@
+import threading
+from queue import Full
+
+import pytest
+
+from native_ui.kit.win.work import WorkQueue
+
+
+@pytest.fixture
+def wakes():
+    return []
+
+
+@pytest.fixture
+def queue(wakes):
+    return WorkQueue(lambda: wakes.append(1))
+
+
+def in_thread(func, *args):
+    results = []
+    thread = threading.Thread(target=lambda: results.append(func(*args)))
+    thread.start()
+    thread.join()
+    return results[0]
+
+
+def test_posts_run_in_order_with_one_wake_per_burst(queue, wakes):
+    ran = []
+    for i in range(5):
+        queue.post(ran.append, i)
+
+    assert ran == []
+    assert len(wakes) == 1
+    assert queue.drain() == 5
+    assert ran == [0, 1, 2, 3, 4]
+
+    queue.post(ran.append, 5)
+    assert len(wakes) == 2
+
+
+def test_calls_queued_while_draining_wait_for_the_next_drain(queue, wakes):
+    ran = []
+    queue.post(lambda: queue.post(ran.append, "later"))
+
+    assert queue.drain() == 1
+    assert ran == []
+    assert len(wakes) == 2
+    assert queue.drain() == 1
+    assert ran == ["later"]
+
+
+def test_invoke_on_the_owning_thread_runs_right_away(queue, wakes):
+    future = queue.invoke(lambda a, b: a + b, 1, 2)
+
+    assert future.result(0) == 3
+    assert wakes == []
+
+
+def test_invoke_from_another_thread_runs_on_drain(queue):
+    ran = []
+
+    def record():
+        ran.append("invoke")
+        return threading.get_ident()
+
+    queue.post(ran.append, "post")
+    future = in_thread(queue.invoke, record)
+
+    assert not future.done()
+    queue.drain()
+    assert ran == ["post", "invoke"]
+    assert future.result(0) == threading.get_ident()
+
+
+def test_errors_are_printed_and_the_burst_continues(queue, capsys):
+    ran = []
+    queue.post(lambda: 1 / 0)
+    queue.post(ran.append, "after")
+
+    assert queue.drain() == 2
+    assert ran == ["after"]
+    assert "ZeroDivisionError" in capsys.readouterr().err
+
+
+def test_errors_of_invoked_calls_go_to_their_future(queue):
+    future = in_thread(queue.invoke, lambda: 1 / 0)
+
+    queue.drain()
+
+    assert isinstance(future.exception(0), ZeroDivisionError)
+
+
+def test_base_exceptions_stop_the_drain(queue):
+    def interrupt():
+        raise KeyboardInterrupt
+
+    ran = []
+    future = in_thread(queue.invoke, interrupt)
+    queue.post(ran.append, "after")
+
+    with pytest.raises(KeyboardInterrupt):
+        queue.drain()
+    assert isinstance(future.exception(0), KeyboardInterrupt)
+    assert ran == []
+
+
+def test_posts_beyond_maxsize_are_dropped(wakes):
+    queue = WorkQueue(lambda: wakes.append(1), maxsize=2)
+
+    assert queue.post(print) and queue.post(print)
+    assert queue.post(print) is False
+    assert queue.dropped == 1
+    future = in_thread(queue.invoke, print)
+    assert isinstance(future.exception(0), Full)
+    assert len(queue) == 2
+
+
+def test_close_cancels_queued_calls_and_rejects_new_ones(queue):
+    future = in_thread(queue.invoke, print)
+
+    queue.close()
+
+    assert future.cancelled()
+    assert len(queue) == 0
+    assert queue.post(print) is False
+    assert isinstance(in_thread(queue.invoke, print).exception(0), Full)